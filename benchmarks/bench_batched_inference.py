@@ -0,0 +1,110 @@
+"""Compares per-sample network activation with batched inference, in decisions/sec.
+
+Run from the repository root:
+    python -m benchmarks.bench_batched_inference --games 64
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+from neat import activations, aggregations
+from neat.nn.feed_forward import FeedForwardNetwork
+
+from game_logic.config_factory import ConfigFactory
+from game_logic.game import Game
+from game_logic.game_logger import configure_logging
+from game_logic.lockstep_games import LockstepGames
+from game_logic.map_cache import get_map_data
+from game_logic.players.ai_player import AIPlayer
+from network.adapters.network_adapter import NetworkAdapter
+from network.compiled_network import CompiledNetwork
+
+
+def random_network(inputs_num: int, outputs_num: int, hidden_num: int, rng: random.Random) -> FeedForwardNetwork:
+    """A fully connected network with one sigmoid hidden layer, shaped like a grown NEAT genome."""
+    input_nodes = [-index - 1 for index in range(inputs_num)]
+    output_nodes = list(range(outputs_num))
+    hidden_nodes = list(range(outputs_num, outputs_num + hidden_num))
+    node_evals = []
+    for node in hidden_nodes:
+        links = [(source, rng.gauss(0, 1)) for source in input_nodes]
+        node_evals.append((node, activations.sigmoid_activation, aggregations.sum_aggregation, rng.gauss(0, 1),
+                           1.0, links))
+    for node in output_nodes:
+        links = [(source, rng.gauss(0, 1)) for source in hidden_nodes]
+        node_evals.append((node, activations.sigmoid_activation, aggregations.sum_aggregation, rng.gauss(0, 1),
+                           1.0, links))
+    return FeedForwardNetwork(input_nodes, output_nodes, node_evals)
+
+
+def bench_activation(network: FeedForwardNetwork, batch_size: int, repeat: int) -> None:
+    states = np.random.RandomState(0).rand(batch_size, len(network.input_nodes)).astype(np.float32)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for state in states:
+            network.activate(state.tolist())
+    per_sample = batch_size * repeat / (time.perf_counter() - start)
+
+    compiled = CompiledNetwork(network)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        compiled.activate_batch(states)
+    batched = batch_size * repeat / (time.perf_counter() - start)
+    print(f'activation, batch {batch_size:4d}: per-sample {per_sample:10,.0f}/s  batched {batched:10,.0f}/s  '
+          f'({batched / per_sample:.1f}x)')
+
+
+def bench_games(network: FeedForwardNetwork, version: str, games_num: int, seed: int) -> None:
+    player_types = ['AI', 'Random']
+    networks = [network, None]
+
+    random.seed(seed)
+    decisions = 0
+    start = time.perf_counter()
+    for _ in range(games_num):
+        game = Game(player_types, version, networks)
+        player = game.players[0]
+
+        def evaluate(net, state):
+            nonlocal decisions
+            decisions += 1
+            return np.asarray(net.activate(state.tolist()))
+
+        player.evaluator = evaluate
+        game.play(max_moves=5000)
+    per_sample = decisions / (time.perf_counter() - start)
+
+    random.seed(seed)
+    lockstep = LockstepGames(player_types, version, networks, games_num)
+    start = time.perf_counter()
+    lockstep.play(max_moves=5000)
+    batched = lockstep.batcher.decisions_num / (time.perf_counter() - start)
+    print(f'{games_num} games {version}: per-sample {per_sample:,.0f} decisions/s  '
+          f'lockstep batched {batched:,.0f} decisions/s ({batched / per_sample:.1f}x, '
+          f'mean batch {lockstep.batcher.decisions_num / max(1, lockstep.batcher.batches_num):.1f})')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--version', default='USA')
+    parser.add_argument('--games', type=int, default=64)
+    parser.add_argument('--hidden', type=int, default=32)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    configure_logging(quiet=True)
+    config = ConfigFactory.get_config(args.version)
+    map_data = get_map_data(args.version)
+    inputs_num = NetworkAdapter.get_features_num(config, map_data.links_num, len(map_data.tickets or ()))
+    outputs_num = AIPlayer.get_outputs_num(config, map_data.links_num)
+    network = random_network(inputs_num, outputs_num, args.hidden, random.Random(args.seed))
+
+    for batch_size in (1, 16, 64, 256):
+        bench_activation(network, batch_size, args.repeat)
+    bench_games(network, args.version, args.games, args.seed)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""Compares the indexed GameBoard link table against the old linear edge scans.
+
+Run from the repository root:
+    python -m benchmarks.bench_game_board --games 20
+"""
+import argparse
+import random
+import time
+from types import SimpleNamespace
+from typing import Dict
+
+from game_logic.boards.game_board import GameBoard
+from game_logic.config_factory import ConfigFactory
+from game_logic.game_logger import configure_logging
+
+VERSIONS = ['USA', 'Europe']
+
+
+class LinearScanGameBoard(GameBoard):
+    """GameBoard with the lookups implemented as scans over the networkx view, as they used to be."""
+
+    def claim_route(self, link_id, player_color):
+        for u, v, data in self.G.edges(data=True):
+            if data['link_id'] == link_id:
+                data['claimed_by'] = player_color
+                self.link_owners[link_id] = player_color
+                return True
+
+    def get_route_owners(self, route_id):
+        return [data['claimed_by'] for u, v, data in self.G.edges(data=True) if data['route_id'] == route_id]
+
+    def get_link_owner(self, link_id):
+        for u, v, data in self.G.edges(data=True):
+            if data['link_id'] == link_id:
+                return data['claimed_by']
+
+    def get_route_data(self, link_id):
+        for u, v, data in self.G.edges(data=True):
+            if data['link_id'] == link_id:
+                return u, v, data
+
+
+def bench_lookups(version: str, repeat: int) -> Dict[str, float]:
+    config = ConfigFactory.get_config(version)
+    game_stub = SimpleNamespace(version=version, config=config, players_num=2)
+    results = {}
+    for name, board_class in (('linear', LinearScanGameBoard), ('indexed', GameBoard)):
+        board = board_class(game_stub)
+        links_num = board.get_route_links_num()
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for link_id in range(links_num):
+                _, _, data = board.get_route_data(link_id)
+                board.get_route_owners(data['route_id'])
+                board.get_link_owner(link_id)
+        elapsed = time.perf_counter() - start
+        results[name] = repeat * links_num / elapsed
+    return results
+
+
+def bench_turns(version: str, games: int, seed: int) -> Dict[str, float]:
+    from game_logic.game import Game
+
+    results = {}
+    for name, board_class in (('linear', LinearScanGameBoard), ('indexed', GameBoard)):
+        random.seed(seed)
+        turns = 0
+        elapsed = 0.0
+        for _ in range(games):
+            game = Game(['Random', 'Random'], version)
+            game.board = board_class(game)
+            start = time.perf_counter()
+            game.play(max_moves=5000)
+            elapsed += time.perf_counter() - start
+            turns += game.total_moves
+        results[name] = turns / elapsed
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--games', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    configure_logging(quiet=True)
+
+    for version in VERSIONS:
+        lookups = bench_lookups(version, args.repeat)
+        print(f'{version} lookups/sec: linear {lookups["linear"]:,.0f}  indexed {lookups["indexed"]:,.0f}  '
+              f'({lookups["indexed"] / lookups["linear"]:.1f}x)')
+        try:
+            turns = bench_turns(version, args.games, args.seed)
+        except FileNotFoundError as exc:
+            print(f'{version} turns/sec: skipped ({exc.filename} is missing)')
+            continue
+        print(f'{version} turns/sec: linear {turns["linear"]:,.0f}  indexed {turns["indexed"]:,.0f}  '
+              f'({turns["indexed"] / turns["linear"]:.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""Times LongestTrailEngine on random 45-train saturated player boards.
+
+Run from the repository root:
+    python -m benchmarks.bench_longest_trail --boards 500
+"""
+import argparse
+import random
+import time
+from typing import List, Tuple
+
+from game_logic.boards.longest_trail import LongestTrailEngine
+from game_logic.game_config import BaseGameConfig
+from game_logic.utils import load_routes
+
+VERSIONS = ['USA', 'Europe']
+
+
+def saturated_board(routes: List[Tuple[str, str, int]], trains: int, rng: random.Random) -> List[Tuple[str, str, int]]:
+    """Grows a connected network of routes from a random city until no route fits in the remaining trains."""
+    free = list(routes)
+    rng.shuffle(free)
+    edges = []
+    cities = set()
+    while True:
+        fitting = [route for route in free if route[2] <= trains]
+        if not fitting:
+            return edges
+        adjacent = [route for route in fitting if route[0] in cities or route[1] in cities]
+        route = rng.choice(adjacent or fitting)
+        free.remove(route)
+        edges.append(route)
+        cities.update(route[:2])
+        trains -= route[2]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--boards', type=int, default=500)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    for version in VERSIONS:
+        routes = [(route[0], route[1], int(route[2])) for route in load_routes(version)]
+        rng = random.Random(args.seed)
+        boards = [saturated_board(routes, BaseGameConfig.TRAIN_FIGURES_NUM, rng) for _ in range(args.boards)]
+
+        timings = []
+        for edges in boards:
+            engine = LongestTrailEngine()
+            start = time.perf_counter()
+            engine.calculate(edges)
+            timings.append(time.perf_counter() - start)
+
+        edges_num = [len(edges) for edges in boards]
+        print(f'{version}: {len(boards) / sum(timings):,.0f} boards/sec  '
+              f'mean {1000 * sum(timings) / len(timings):.3f} ms  max {1000 * max(timings):.3f} ms  '
+              f'edges mean {sum(edges_num) / len(edges_num):.1f} max {max(edges_num)}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""Measures MCTS rollouts/sec and decision latency for a given budget and number of workers.
+
+Run from the repository root:
+    python -m benchmarks.bench_mcts --games 4 --iterations 200 --workers 1 2 4
+"""
+import argparse
+import random
+import time
+
+from game_logic.game import Game
+from game_logic.game_logger import configure_logging
+
+
+def bench_mcts(version: str, games_num: int, iterations: int, time_limit: float, workers_num: int, seed: int) -> None:
+    decisions = rollouts = wins = 0
+    search_time = 0.0
+    start = time.perf_counter()
+    for index in range(games_num):
+        random.seed(seed + index)
+        game = Game(['MCTS', 'Random'], version)
+        player = game.players[0]
+        player.iterations = iterations
+        player.time_limit = time_limit
+        player.workers_num = workers_num
+        scores = game.play(max_moves=5000)
+
+        decisions += player.decisions_num
+        rollouts += player.rollouts_num
+        search_time += player.search_time
+        wins += scores[0] == max(scores)
+    elapsed = time.perf_counter() - start
+    print(f'{workers_num:2d} workers: {rollouts / search_time:8,.0f} rollouts/s  '
+          f'{search_time / max(1, decisions) * 1000:7.1f} ms/decision  '
+          f'won {wins}/{games_num} against Random  ({elapsed:.1f}s)')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--version', default='USA')
+    parser.add_argument('--games', type=int, default=4)
+    parser.add_argument('--iterations', type=int, default=200, help='rollouts per decision, 0 for no limit')
+    parser.add_argument('--time-limit', type=float, default=0.0, help='seconds per decision, 0 for no limit')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1])
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    configure_logging(quiet=True)
+    try:
+        Game(['Random', 'Random'], args.version)
+    except FileNotFoundError as error:
+        print(f'{args.version}: skipped ({error.filename} is missing)')
+        return
+    for workers_num in args.workers:
+        bench_mcts(args.version, args.games, args.iterations, args.time_limit, workers_num, args.seed)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""Compares ways of moving the NetworkAdapter states of a worker's games to a learner process, in states/sec.
+
+Run from the repository root:
+    python -m benchmarks.bench_shared_state --games 64 --players 2 --steps 2000
+"""
+import argparse
+import multiprocessing
+import time
+
+import numpy as np
+
+from game_logic.game_logger import configure_logging
+from network.adapters.shared_state import SharedStateBuffer, SlotRing
+from network.envs.vector_env import VectorEnv
+
+
+def send_lists(connection, states: np.ndarray, steps_num: int) -> None:
+    for _ in range(steps_num):
+        connection.send(states.tolist())
+    connection.close()
+
+
+def send_arrays(connection, states: np.ndarray, steps_num: int) -> None:
+    for _ in range(steps_num):
+        connection.send(states)
+    connection.close()
+
+
+def fill_ring(ring: SlotRing, buffer: SharedStateBuffer, steps_num: int) -> None:
+    for step in range(steps_num):
+        slot = ring.acquire_write()
+        ring.states[slot] = buffer.states
+        ring.steps[slot] = step
+        ring.publish(slot)
+    buffer.close()
+    ring.close()
+
+
+def bench_pipe(target, states: np.ndarray, steps_num: int) -> float:
+    connection, worker_connection = multiprocessing.Pipe(duplex=False)
+    process = multiprocessing.Process(target=target, args=(worker_connection, states, steps_num))
+    start = time.perf_counter()
+    process.start()
+    checksum = 0.0
+    for _ in range(steps_num):
+        checksum += np.asarray(connection.recv(), dtype=np.float32)[:, 0, 0].sum()
+    elapsed = time.perf_counter() - start
+    process.join()
+    return steps_num * len(states) / elapsed
+
+
+def bench_ring(buffer: SharedStateBuffer, slots_num: int, steps_num: int) -> float:
+    ring = SlotRing(slots_num, buffer.games_num, buffer.players_num, buffer.features_num)
+    process = multiprocessing.Process(target=fill_ring, args=(ring, buffer, steps_num))
+    start = time.perf_counter()
+    process.start()
+    checksum = 0.0
+    for _ in range(steps_num):
+        slot = ring.acquire_read()
+        checksum += ring.states[slot, :, 0, 0].sum()
+        ring.release(slot)
+    elapsed = time.perf_counter() - start
+    process.join()
+    ring.close()
+    return steps_num * buffer.games_num / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--games', type=int, default=64)
+    parser.add_argument('--players', type=int, default=2)
+    parser.add_argument('--steps', type=int, default=1000, help='transfers of the states of every game')
+    parser.add_argument('--slots', type=int, default=8, help='slots of the ring')
+    parser.add_argument('--version', default='USA')
+    args = parser.parse_args()
+
+    configure_logging(quiet=True)
+    features_num, _ = VectorEnv.get_sizes(args.version, args.players)
+    with SharedStateBuffer(args.games, args.players, features_num) as buffer:
+        buffer.states[:] = np.random.default_rng(0).random(buffer.states.shape)
+        print(f'{args.games} games x {args.players} players x {features_num} features, {args.steps} steps')
+        print(f'pipe, Python lists   {bench_pipe(send_lists, buffer.states, args.steps):12,.0f} states/s')
+        print(f'pipe, NumPy arrays   {bench_pipe(send_arrays, buffer.states, args.steps):12,.0f} states/s')
+        print(f'shared slot ring     {bench_ring(buffer, args.slots, args.steps):12,.0f} states/s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+"""Measures environment steps/sec of VectorEnv and SubprocVectorEnv under a random legal policy.
+
+Run from the repository root:
+    python -m benchmarks.bench_vector_env --envs 64 --steps 2000 --shards 1 2 4
+"""
+import argparse
+import time
+
+import numpy as np
+
+from game_logic.game_logger import configure_logging
+from network.envs.vector_env import SubprocVectorEnv, VectorEnv
+
+
+def bench_env(env, steps_num: int, seed: int) -> float:
+    rng = np.random.default_rng(seed)
+    env.reset()
+    start = time.perf_counter()
+    for _ in range(steps_num):
+        masks = env.action_masks()
+        env.step(np.argmax(rng.random(masks.shape) * masks, axis=1))
+    return steps_num * env.envs_num / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--envs', type=int, default=64)
+    parser.add_argument('--steps', type=int, default=500, help='steps of the whole vector, every env answers one')
+    parser.add_argument('--opponents', nargs='+', default=['Random'])
+    parser.add_argument('--version', default='USA')
+    parser.add_argument('--shards', type=int, nargs='*', default=[2], help='worker counts of the subprocess mode')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    configure_logging(quiet=True)
+    env = VectorEnv(args.envs, args.version, args.opponents, seed=args.seed)
+    print(f'in process          {bench_env(env, args.steps, args.seed):12,.0f} steps/s')
+    env.close()
+    for shards_num in args.shards:
+        with SubprocVectorEnv(args.envs, shards_num, args.version, args.opponents, seed=args.seed) as env:
+            print(f'{shards_num:2d} worker processes {bench_env(env, args.steps, args.seed):12,.0f} steps/s')
+
+
+if __name__ == '__main__':
+    main()
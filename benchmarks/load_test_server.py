@@ -0,0 +1,169 @@
+"""Load-tests the GameServer with bot clients and reports sessions per core and move latency.
+
+Every client plays random legal moves for the Remote seats of its sessions, after --think-time, and starts a
+new session whenever one finishes, so --sessions games are always in progress. The latency of a move is the time from sending an
+answer to receiving the next decision of that session, it includes the turns of the server's bots.
+
+Run from the repository root, a server is started unless --port points to a running one:
+    python -m benchmarks.load_test_server --sessions 1000 --games 3000
+"""
+import argparse
+import asyncio
+import json
+import random
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+
+class LoadClient:
+    def __init__(self, args: argparse.Namespace, sessions_num: int, seed: int) -> None:
+        self.args = args
+        self.sessions_num = sessions_num
+        self.rng = random.Random(seed)
+        self.latencies: List[float] = []
+        self.sent_at: Dict[int, float] = {}
+        self.finished_num = 0
+        self.errors: List[str] = []
+
+    async def send(self, writer: asyncio.StreamWriter, message: dict) -> None:
+        writer.write(json.dumps(message).encode() + b'\n')
+        await writer.drain()
+
+    async def answer_later(self, writer: asyncio.StreamWriter, answer: dict) -> None:
+        await asyncio.sleep(self.rng.uniform(0, 2 * self.args.think_time))
+        self.sent_at[answer['session']] = time.perf_counter()
+        await self.send(writer, answer)
+
+    async def create_session(self, writer: asyncio.StreamWriter) -> None:
+        await self.send(writer, {'type': 'create', 'version': self.args.version, 'players': self.args.players,
+                                 'seed': self.rng.getrandbits(32), 'max_moves': self.args.max_moves})
+
+    async def run(self, games: 'GameCounter') -> None:
+        reader, writer = await asyncio.open_connection(self.args.host, self.args.port, limit=2 ** 20)
+        for _ in range(self.sessions_num):
+            if games.take():
+                await self.create_session(writer)
+        active = self.sessions_num
+        while active:
+            message = json.loads(await reader.readline())
+            message_type = message['type']
+            if message_type == 'created':
+                self.sent_at[message['session']] = time.perf_counter()
+            elif message_type == 'decision':
+                session_id = message['session']
+                now = time.perf_counter()
+                self.latencies.append(now - self.sent_at[session_id])
+                options = message['options']
+                answer = {'type': 'decision', 'session': session_id,
+                          'value': self.rng.choice(options) if options else 0}
+                if self.args.think_time:
+                    asyncio.get_running_loop().create_task(self.answer_later(writer, answer))
+                else:
+                    self.sent_at[session_id] = time.perf_counter()
+                    await self.send(writer, answer)
+            elif message_type in ('finished', 'error'):
+                if message_type == 'error':
+                    self.errors.append(message['message'])
+                    if 'session' not in message:
+                        continue
+                self.finished_num += message_type == 'finished'
+                self.sent_at.pop(message['session'], None)
+                if games.take():
+                    await self.create_session(writer)
+                else:
+                    active -= 1
+        writer.close()
+
+
+class GameCounter:
+    def __init__(self, games_num: int) -> None:
+        self.left = games_num
+
+    def take(self) -> bool:
+        if self.left <= 0:
+            return False
+        self.left -= 1
+        return True
+
+
+async def get_server_stats(host: str, port: int) -> dict:
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(b'{"type": "stats"}\n')
+    await writer.drain()
+    stats = json.loads(await reader.readline())
+    writer.close()
+    return stats
+
+
+async def load_test(args: argparse.Namespace) -> None:
+    games = GameCounter(args.games)
+    clients_num = min(args.clients, args.sessions)
+    clients = [LoadClient(args, args.sessions // clients_num + (index < args.sessions % clients_num), index)
+               for index in range(clients_num)]
+    stats_before = await get_server_stats(args.host, args.port)
+    start = time.perf_counter()
+    await asyncio.gather(*(client.run(games) for client in clients))
+    elapsed = time.perf_counter() - start
+    stats_after = await get_server_stats(args.host, args.port)
+
+    latencies = sorted(latency for client in clients for latency in client.latencies)
+    finished = sum(client.finished_num for client in clients)
+    errors = [error for client in clients for error in client.errors]
+    server_cpu = stats_after['cpu_time'] - stats_before['cpu_time']
+    utilization = server_cpu / elapsed
+    moves = stats_after['moves'] - stats_before['moves']
+    print(f'{finished} games in {elapsed:.1f}s with {args.sessions} concurrent sessions, {len(errors)} errors')
+    print(f'server: {moves / elapsed:,.0f} moves/s, {server_cpu:.1f}s CPU ({utilization:.0%} of a core), '
+          f'{args.sessions / utilization if utilization else float("inf"):,.0f} sessions per core')
+    if latencies:
+        print(f'move latency: p50 {latencies[len(latencies) // 2] * 1000:.2f} ms  '
+              f'p99 {latencies[int(len(latencies) * 0.99)] * 1000:.2f} ms  '
+              f'max {latencies[-1] * 1000:.2f} ms over {len(latencies):,} moves')
+    for error in sorted(set(errors))[:5]:
+        print(f'error: {error}')
+
+
+async def wait_for_server(host: str, port: int, timeout: float = 30.0) -> None:
+    deadline = time.perf_counter() + timeout
+    while True:
+        try:
+            await get_server_stats(host, port)
+            return
+        except OSError:
+            if time.perf_counter() > deadline:
+                raise
+            await asyncio.sleep(0.1)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=None, help='port of a running server, else one is started')
+    parser.add_argument('--players', nargs='+', default=['Remote', 'Random'])
+    parser.add_argument('--version', default='USA')
+    parser.add_argument('--sessions', type=int, default=200, help='games in progress at any time')
+    parser.add_argument('--games', type=int, default=600, help='games to play in total')
+    parser.add_argument('--clients', type=int, default=10, help='connections the sessions are spread over')
+    parser.add_argument('--max-moves', type=int, default=5000)
+    parser.add_argument('--think-time', type=float, default=0.0,
+                        help='mean seconds a client waits before answering, to mimic human players')
+    args = parser.parse_args()
+
+    server = None
+    if args.port is None:
+        args.port = 8765
+        server = subprocess.Popen([sys.executable, '-m', 'scripts.run_server', '--host', args.host,
+                                   '--port', str(args.port)])
+    try:
+        asyncio.run(wait_for_server(args.host, args.port))
+        asyncio.run(load_test(args))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,208 @@
+"""Runs the engine benchmark suite with fixed seeds and compares it against a saved baseline.
+
+Every case reports a rate, higher is better, and keeps the best of --repeat runs to damp the noise.
+
+Run from the repository root:
+    python -m benchmarks.suite --output benchmarks/baseline.json
+    python -m benchmarks.suite --baseline benchmarks/baseline.json --output /tmp/bench.json
+"""
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+from types import SimpleNamespace
+from typing import Callable, Dict, List, Tuple
+
+from benchmarks.bench_longest_trail import saturated_board
+from game_logic.boards.game_board import GameBoard
+from game_logic.boards.player_board import PlayerBoard
+from game_logic.config_factory import ConfigFactory
+from game_logic.game import Game
+from game_logic.game_config import BaseGameConfig
+from game_logic.game_logger import configure_logging
+from game_logic.map_cache import get_map_data
+from game_logic.train_card_manager import TrainCardManager
+from network.adapters.base_adapter import BaseAdapter
+
+VERSIONS = ['USA', 'Europe']
+PLAYERS_NUMS = [2, 5]
+FORMAT_VERSION = 1
+
+
+def get_game_stub(version: str, seed: int) -> SimpleNamespace:
+    """The parts of a Game the boards and the card manager read, so microbenchmarks don't need tickets."""
+    return SimpleNamespace(version=version, config=ConfigFactory.get_config(version), players_num=2,
+                           rng=random.Random(seed), adapter=BaseAdapter())
+
+
+def get_player_boards(version: str, seed: int, boards_num: int = 50) -> List[PlayerBoard]:
+    map_data = get_map_data(version)
+    routes = [(city1, city2, length) for (city1, city2), length in zip(map_data.link_cities, map_data.link_lengths)]
+    rng = random.Random(seed)
+    boards = []
+    for _ in range(boards_num):
+        board = PlayerBoard(None)
+        for city1, city2, length in saturated_board(routes, BaseGameConfig.TRAIN_FIGURES_NUM, rng):
+            board.add_edge(city1, city2, length, 'grey')
+        boards.append(board)
+    return boards
+
+
+def bench_games(version: str, players_num: int, seed: int, scale: int) -> float:
+    games_num = max(1, scale // players_num)
+    start = time.perf_counter()
+    for index in range(games_num):
+        Game(['Random'] * players_num, version, seed=seed + index).play(max_moves=5000)
+    return games_num / (time.perf_counter() - start)
+
+
+def bench_construction(version: str, players_num: int, seed: int, scale: int) -> float:
+    games_num = scale * 10
+    start = time.perf_counter()
+    for index in range(games_num):
+        Game(['Random'] * players_num, version, seed=seed + index)
+    return games_num / (time.perf_counter() - start)
+
+
+def bench_is_ticket_completed(version: str, seed: int, scale: int) -> float:
+    boards = get_player_boards(version, seed)
+    cities = sorted(get_map_data(version).cities)
+    rng = random.Random(seed)
+    tickets = [(*rng.sample(cities, 2), 0) for _ in range(scale * 10)]
+    start = time.perf_counter()
+    for board in boards:
+        for ticket in tickets:
+            board.is_ticket_completed(ticket)
+    return len(boards) * len(tickets) / (time.perf_counter() - start)
+
+
+def bench_calculate_longest_path(version: str, seed: int, scale: int) -> float:
+    boards = get_player_boards(version, seed)
+    repeat = max(1, scale // 10)
+    elapsed = 0.0
+    for _ in range(repeat):
+        for board in boards:
+            # Drop the cached length and the per-component trail cache, so the trail is searched every time
+            board.invalidate()
+            start = time.perf_counter()
+            board.calculate_longest_path()
+            elapsed += time.perf_counter() - start
+    return repeat * len(boards) / elapsed
+
+
+def bench_get_route_data(version: str, seed: int, scale: int) -> float:
+    board = GameBoard(get_game_stub(version, seed))
+    links_num = board.get_route_links_num()
+    repeat = scale * 10
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for link_id in range(links_num):
+            board.get_route_data(link_id)
+    return repeat * links_num / (time.perf_counter() - start)
+
+
+def bench_fill_face_up(version: str, seed: int, scale: int) -> float:
+    manager = TrainCardManager(get_game_stub(version, seed))
+    fills_num = scale * 100
+    elapsed = 0.0
+    for _ in range(fills_num):
+        face_up_cards = manager.get_face_up_cards()
+        for card_id, card in enumerate(face_up_cards):
+            manager.add_to_discard_pile(card, 1)
+            face_up_cards[card_id] = manager.empty_card
+        start = time.perf_counter()
+        manager.fill_face_up()
+        elapsed += time.perf_counter() - start
+    return fills_num / elapsed
+
+
+def get_cases() -> List[Tuple[str, str, Callable[[int, int], float]]]:
+    """(name, unit, bench(seed, scale)) for every case of the suite."""
+    cases = []
+    for version in VERSIONS:
+        for players_num in PLAYERS_NUMS:
+            cases.append((f'games/{version}/{players_num}p', 'games/s',
+                          lambda seed, scale, v=version, n=players_num: bench_games(v, n, seed, scale)))
+        for players_num in PLAYERS_NUMS:
+            cases.append((f'construction/{version}/{players_num}p', 'games/s',
+                          lambda seed, scale, v=version, n=players_num: bench_construction(v, n, seed, scale)))
+        for name, bench in (('is_ticket_completed', bench_is_ticket_completed),
+                            ('calculate_longest_path', bench_calculate_longest_path),
+                            ('get_route_data', bench_get_route_data),
+                            ('fill_face_up', bench_fill_face_up)):
+            cases.append((f'{name}/{version}', 'calls/s', lambda seed, scale, v=version, b=bench: b(v, seed, scale)))
+    return cases
+
+
+def run_suite(seed: int, scale: int, repeat: int, name_filter: str = '') -> Dict[str, dict]:
+    results = {}
+    for name, unit, bench in get_cases():
+        if name_filter not in name:
+            continue
+        try:
+            runs = [bench(seed, scale) for _ in range(repeat)]
+        except FileNotFoundError as exc:
+            print(f'{name:<36} skipped ({exc.filename} is missing)')
+            continue
+        results[name] = {'value': max(runs), 'unit': unit, 'runs': runs}
+        print(f'{name:<36} {max(runs):>14,.1f} {unit}')
+    return results
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], tolerance: float) -> List[str]:
+    """Prints the change of every case against the baseline and returns the names of the regressions."""
+    regressions = []
+    print(f'\n{"case":<36} {"baseline":>14} {"current":>14} {"change":>8}')
+    for name, result in results.items():
+        if name not in baseline:
+            print(f'{name:<36} {"-":>14} {result["value"]:>14,.1f}      new')
+            continue
+        base_value = baseline[name]['value']
+        change = result['value'] / base_value - 1
+        regressed = change < -tolerance
+        if regressed:
+            regressions.append(name)
+        print(f'{name:<36} {base_value:>14,.1f} {result["value"]:>14,.1f} {change:>+7.1%}'
+              f'{"  REGRESSION" if regressed else ""}')
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--scale', type=int, default=20, help='work per run, the cases scale it to their cost')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per case, the best one is kept')
+    parser.add_argument('--filter', default='', help='only run the cases whose name contains this')
+    parser.add_argument('--output', default=None, help='write the results there as JSON')
+    parser.add_argument('--baseline', default=None, help='JSON results of an earlier run to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.1, help='slowdown reported as a regression')
+    args = parser.parse_args()
+
+    configure_logging(quiet=True)
+    results = run_suite(args.seed, args.scale, args.repeat, args.filter)
+
+    if args.output:
+        report = {'format_version': FORMAT_VERSION,
+                  'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                  'python': platform.python_version(),
+                  'platform': platform.platform(),
+                  'seed': args.seed, 'scale': args.scale, 'repeat': args.repeat,
+                  'results': results}
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as file:
+            baseline = json.load(file)
+        if (baseline['seed'], baseline['scale']) != (args.seed, args.scale):
+            print(f'warning: the baseline ran with seed {baseline["seed"]} and scale {baseline["scale"]}')
+        regressions = compare(results, baseline['results'], args.tolerance)
+        if regressions:
+            print(f'{len(regressions)} regressions beyond {args.tolerance:.0%}')
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
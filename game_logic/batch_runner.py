@@ -0,0 +1,103 @@
+import json
+import multiprocessing
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from game_logic.game import Game
+from game_logic.game_logger import configure_logging
+from game_logic.map_cache import get_map_data
+from game_logic.move_log import MoveLog
+from game_logic.profiling import Profiler
+from game_logic.telemetry import TelemetryWriter, get_game_rows
+
+
+@dataclass
+class BatchSummary:
+    games_num: int
+    total_moves: int
+    elapsed: float
+    # Timers of all games added up, when the batch was profiled
+    profiler: Optional[Profiler] = None
+
+    @property
+    def games_per_sec(self) -> float:
+        return self.games_num / self.elapsed if self.elapsed else 0.0
+
+
+def _init_worker(version: str) -> None:
+    configure_logging(quiet=True)
+    get_map_data(version)
+
+
+def _play_game(task: Tuple[int, int, List[str], str, int, str, bool, bool]) -> Dict[str, Any]:
+    index, seed, player_types, version, max_moves, record_dir, profile, telemetry = task
+    start = time.perf_counter()
+    game = Game(player_types, version, seed=seed)
+    if profile:
+        profiler = Profiler()
+        profiler.attach(game)
+    if record_dir:
+        move_log = MoveLog.record(game)
+    scores = game.play(max_moves)
+    if record_dir:
+        move_log.save(os.path.join(record_dir, f'game-{index}.ttrlog'))
+    return {'game': index,
+            'seed': seed,
+            'scores': scores,
+            'winner': game.winner.player_id,
+            'total_moves': game.total_moves,
+            'completed_moves': game.completed_moves,
+            'duration': time.perf_counter() - start,
+            'telemetry': get_game_rows(game, index) if telemetry else None,
+            'profile': profiler.timers if profile else None}
+
+
+class BatchRunner:
+    """Plays many headless games across a process pool and streams one JSON line per game to disk."""
+
+    def __init__(self, player_types: List[str], version: str, games_num: int, workers_num: int = 0,
+                 base_seed: int = 0, max_moves: int = 0, record_dir: str = None,
+                 telemetry_path: str = None, profile: bool = False) -> None:
+        self.player_types = player_types
+        self.version = version
+        self.games_num = games_num
+        self.workers_num = workers_num or multiprocessing.cpu_count()
+        self.base_seed = base_seed
+        self.max_moves = max_moves
+        # Move logs of every game are saved there, to replay any game of the batch with game_logic.replay
+        self.record_dir = record_dir
+        # Per player stats of every game are appended there, see game_logic.telemetry
+        self.telemetry_path = telemetry_path
+        self.profile = profile
+
+    def tasks(self):
+        for index in range(self.games_num):
+            yield (index, self.base_seed + index, self.player_types, self.version, self.max_moves, self.record_dir,
+                   self.profile, self.telemetry_path is not None)
+
+    def run(self, output_path: str) -> BatchSummary:
+        chunksize = max(1, min(64, self.games_num // (self.workers_num * 8)))
+        total_moves = 0
+        start = time.perf_counter()
+        if self.record_dir:
+            os.makedirs(self.record_dir, exist_ok=True)
+        telemetry = TelemetryWriter(self.telemetry_path) if self.telemetry_path else None
+        profiler = Profiler() if self.profile else None
+        with multiprocessing.Pool(self.workers_num, initializer=_init_worker, initargs=(self.version,)) as pool, \
+                open(output_path, 'w', encoding='utf-8') as file:
+            try:
+                for result in pool.imap_unordered(_play_game, self.tasks(), chunksize=chunksize):
+                    rows = result.pop('telemetry')
+                    timers = result.pop('profile')
+                    if profiler is not None:
+                        profiler.merge(timers)
+                    if telemetry is not None:
+                        telemetry.write_rows(rows)
+                    file.write(json.dumps(result) + '\n')
+                    total_moves += result['total_moves']
+            finally:
+                if telemetry is not None:
+                    telemetry.close()
+        return BatchSummary(self.games_num, total_moves, time.perf_counter() - start, profiler)
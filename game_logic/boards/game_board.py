@@ -2,60 +2,97 @@ import matplotlib.pyplot as plt
 import networkx as nx
 
 from collections import defaultdict
-from typing import Dict, Union, Tuple, TYPE_CHECKING
+from typing import Dict, List, Optional, Union, Tuple, TYPE_CHECKING
 
 from game_logic.game_logger import logger
-from game_logic.utils import load_routes, load_cities
+from game_logic.map_cache import get_map_data
 
 if TYPE_CHECKING:
+    from game_logic.enums.player_colors import PlayerColor
     from game_logic.game import Game
 
 
 class GameBoard:
     def __init__(self, game_instance: 'Game'):
         self.game_instance = game_instance
-        self.routes = load_routes(self.game_instance.version)
-        self.cities = load_cities(self.game_instance.version)
-        self.G = nx.MultiGraph()
-        self._fill_graph()
+        self.map_data = get_map_data(self.game_instance.version)
+        self.routes = self.map_data.routes
+        self.cities = self.map_data.cities
+
+        # Link table shared with every game of this version, indexed by link_id
+        self.link_cities = self.map_data.link_cities
+        self.link_route_ids = self.map_data.link_route_ids
+        self.link_lengths = self.map_data.link_lengths
+        self.link_colors = self.map_data.link_colors
+        self.link_color_ids = self.map_data.link_color_ids
+        # route_id -> link ids of that route
+        self.route_links = self.map_data.route_links
+        # Shortest path lengths between map_data.city_index nodes, ignoring who owns the links
+        self.distances = self.map_data.distances
+
+        # Per-game ownership overlay
+        self.link_owners: List[Optional['PlayerColor']] = [None] * self.map_data.links_num
+        # Link ids in the order they were claimed since the last restore, so derived data such as TicketHints
+        # can update for the claims it has not seen yet
+        self.claim_log: List[int] = []
+        # Incremented by restore, which rewrites link_owners at once
+        self.restores = 0
+
+        self._graph = None
+
+    @property
+    def G(self) -> nx.MultiGraph:
+        if self._graph is None:
+            self._graph = self.build_graph()
+        return self._graph
 
     def get_route_links_num(self) -> int:
-        return self.G.number_of_edges()
-
-    def _fill_graph(self) -> None:
-        self.G.add_nodes_from(self.cities)
-
-        link_id = 0
-        for route_id, route in enumerate(self.routes):
-            colors = route[3:]
-            for color in colors:
-                self.G.add_edge(route[0], route[1],
-                                route_id=route_id,
-                                link_id=link_id,
-                                weight=int(route[2]),
-                                edge_color=color,
-                                claimed_by=None)
-                link_id += 1
-
-    def claim_route(self, link_id: int, player_color: str) -> bool:
-        for u, v, data in self.G.edges(data=True):
-            if data['link_id'] == link_id:
-                data['claimed_by'] = player_color
-                return True
-
-    def get_route_owners(self, route_id):
-        claimed_by = []
-        for u, v, data in self.G.edges(data=True):
-            if data['route_id'] == route_id:
-                claimed_by.append(data['claimed_by'])
-        return claimed_by
-
-    def get_link_owner(self, link_id):
-        for u, v, data in self.G.edges(data=True):
-            if data['link_id'] == link_id:
-                return data['claimed_by']
+        return self.map_data.links_num
+
+    def build_graph(self) -> nx.MultiGraph:
+        graph = self.map_data.topology.copy()
+        for link_id, owner in enumerate(self.link_owners):
+            if owner is not None:
+                city1, city2 = self.link_cities[link_id]
+                graph.edges[city1, city2, self.map_data.topology_edge_keys[link_id]]['claimed_by'] = owner
+        return graph
+
+    def _get_link_data(self, link_id: int) -> Dict[str, Union[str, int, None]]:
+        return {'route_id': self.link_route_ids[link_id],
+                'link_id': link_id,
+                'weight': self.link_lengths[link_id],
+                'edge_color': self.link_colors[link_id],
+                'claimed_by': self.link_owners[link_id]}
+
+    def claim_route(self, link_id: int, player_color: 'PlayerColor') -> bool:
+        self.link_owners[link_id] = player_color
+        self.claim_log.append(link_id)
+        if self._graph is not None:
+            city1, city2 = self.link_cities[link_id]
+            self._graph.edges[city1, city2, self.map_data.topology_edge_keys[link_id]]['claimed_by'] = player_color
+        return True
+
+    def restore(self, link_owners: List[Optional['PlayerColor']]) -> None:
+        self.link_owners = list(link_owners)
+        self.claim_log = []
+        self.restores += 1
+        self._graph = None
+
+    def get_route_owners(self, route_id: int) -> List[Optional['PlayerColor']]:
+        return [self.link_owners[link_id] for link_id in self.route_links[route_id]]
+
+    def get_distance(self, city1: str, city2: str) -> float:
+        city_index = self.map_data.city_index
+        return float(self.distances[city_index[city1], city_index[city2]])
+
+    def get_link_owner(self, link_id: int) -> Optional['PlayerColor']:
+        return self.link_owners[link_id]
 
     def validate_route(self, player, data):
+        if data['claimed_by'] is not None:
+            logger.info('This link is already claimed!')
+            return
+
         owners = self.get_route_owners(data['route_id'])
 
         if not any(owners):
@@ -75,9 +112,8 @@ class GameBoard:
         logger.info('You can only claim one link for each route in this game configuration!')
 
     def get_route_data(self, link_id: int) -> Tuple[str, str, Dict[str, Union[bool, str, int]]]:
-        for u, v, data in self.G.edges(data=True):
-            if data['link_id'] == link_id:
-                return u, v, data
+        city1, city2 = self.link_cities[link_id]
+        return city1, city2, self._get_link_data(link_id)
 
     def draw_possession_graph(self, pause_time: int = 30) -> None:
         plt.figure(figsize=(18, 8))
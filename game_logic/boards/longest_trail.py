@@ -0,0 +1,93 @@
+from collections import defaultdict
+from typing import Dict, Hashable, List, Sequence, Tuple
+
+Edge = Tuple[Hashable, Hashable, int]
+
+
+class LongestTrailEngine:
+    """Exact longest trail (no edge used twice, nodes may repeat) weighted by route length.
+
+    Each connected component is solved on its own and its result is memoized by the component's
+    edge set, so after a claim only the component that changed is recomputed.
+    """
+
+    def __init__(self) -> None:
+        self._cache: Dict[Tuple[Edge, ...], int] = {}
+
+    def calculate(self, edges: Sequence[Edge]) -> int:
+        longest = 0
+        for component in self._split_components(edges):
+            key = tuple(sorted(component))
+            value = self._cache.get(key)
+            if value is None:
+                value = self.component_longest_trail(component)
+                self._cache[key] = value
+            if value > longest:
+                longest = value
+        return longest
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    @staticmethod
+    def _split_components(edges: Sequence[Edge]) -> List[List[Edge]]:
+        parent = {}
+
+        def find(node):
+            parent.setdefault(node, node)
+            while parent[node] != node:
+                parent[node] = parent[parent[node]]
+                node = parent[node]
+            return node
+
+        for city1, city2, _ in edges:
+            parent[find(city1)] = find(city2)
+
+        components = defaultdict(list)
+        for edge in edges:
+            components[find(edge[0])].append(edge)
+        return list(components.values())
+
+    @staticmethod
+    def component_longest_trail(edges: List[Edge]) -> int:
+        adjacency = defaultdict(list)
+        total = 0
+        for index, (city1, city2, length) in enumerate(edges):
+            bit = 1 << index
+            adjacency[city1].append((bit, city2, length))
+            adjacency[city2].append((bit, city1, length))
+            total += length
+
+        # A longest trail that is not closed can always be extended at a start node with an unused
+        # edge, so it must start at an odd-degree node. With no odd-degree nodes the component has an
+        # Euler circuit, which uses every edge.
+        starts = [node for node, links in adjacency.items() if len(links) % 2]
+        if not starts:
+            return total
+
+        memo = {}
+
+        def extend(node, used, remaining):
+            key = (node, used)
+            if key in memo:
+                return memo[key]
+            best = 0
+            for bit, neighbor, length in adjacency[node]:
+                if used & bit:
+                    continue
+                value = length + extend(neighbor, used | bit, remaining - length)
+                if value > best:
+                    best = value
+                    if best == remaining:
+                        break
+            memo[key] = best
+            return best
+
+        longest = 0
+        for node in starts:
+            value = extend(node, 0, total)
+            if value > longest:
+                longest = value
+                if longest == total:
+                    break
+        return longest
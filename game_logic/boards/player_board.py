@@ -1,62 +1,102 @@
 import matplotlib.pyplot as plt
 import networkx as nx
 
-from typing import Tuple
+from typing import Dict, List, Tuple
+
+from game_logic.boards.longest_trail import LongestTrailEngine
 
 
 class PlayerBoard:
     def __init__(self, player):
         self.player = player
-        self.G = nx.Graph()
-
-    def add_edge(self, city1: str, city2: str, route_dist: int, color: str) -> None:
-        if city1 not in self.G:
-            self.G.add_node(city1)
-        if city2 not in self.G:
-            self.G.add_node(city2)
-        self.G.add_edge(city1, city2, weight=route_dist, edge_color=color)
+        self._graph = None
+
+        # Union-find over cities, maintained in add_edge
+        self._parent: Dict[str, str] = {}
+        self._size: Dict[str, int] = {}
+        # component root -> open tickets with an endpoint in that component
+        self._open_tickets: Dict[str, List[Tuple[str, str, int]]] = {}
+
+        self._edges: List[Tuple[str, str, int]] = []
+        self._edge_colors: List[str] = []
+        self._longest_trail = LongestTrailEngine()
+        self._longest_path = None
+
+    @property
+    def G(self) -> nx.Graph:
+        if self._graph is None:
+            self._graph = nx.Graph()
+            for (city1, city2, route_dist), color in zip(self._edges, self._edge_colors):
+                self._graph.add_edge(city1, city2, weight=route_dist, edge_color=color)
+        return self._graph
+
+    def _find(self, city: str) -> str:
+        parent = self._parent
+        if city not in parent:
+            parent[city] = city
+            self._size[city] = 1
+            return city
+        while parent[city] != city:
+            parent[city] = parent[parent[city]]
+            city = parent[city]
+        return city
+
+    def _union(self, city1: str, city2: str) -> List[Tuple[str, str, int]]:
+        root1, root2 = self._find(city1), self._find(city2)
+        if root1 == root2:
+            return []
+        if self._size[root1] < self._size[root2]:
+            root1, root2 = root2, root1
+        self._parent[root2] = root1
+        self._size[root1] += self._size[root2]
+
+        tickets = self._open_tickets.pop(root1, []) + self._open_tickets.pop(root2, [])
+        completed = []
+        still_open = []
+        for ticket in dict.fromkeys(tickets):
+            if self._find(ticket[0]) == self._find(ticket[1]):
+                completed.append(ticket)
+            else:
+                still_open.append(ticket)
+        if still_open:
+            self._open_tickets[root1] = still_open
+        return completed
+
+    def add_edge(self, city1: str, city2: str, route_dist: int, color: str) -> List[Tuple[str, str, int]]:
+        """Adds a claimed route and returns the tickets it completed."""
+        if self._graph is not None:
+            self._graph.add_edge(city1, city2, weight=route_dist, edge_color=color)
+        self._edges.append((city1, city2, route_dist))
+        self._edge_colors.append(color)
+        self._longest_path = None
+        return self._union(city1, city2)
+
+    def add_ticket(self, ticket: Tuple[str, str, int]) -> bool:
+        """Starts tracking a ticket. Returns True if it is already completed."""
+        if self.is_ticket_completed(ticket):
+            return True
+        start, end, _ = ticket
+        for root in {self._find(start), self._find(end)}:
+            self._open_tickets.setdefault(root, []).append(ticket)
+        return False
 
     def is_ticket_completed(self, ticket: Tuple[str, str, int]) -> bool:
         start, end, _ = ticket
 
-        if start not in self.G or end not in self.G:
+        if start not in self._parent or end not in self._parent:
             return False
 
-        if not list(self.G.neighbors(start)):
-            return False
-
-        def dfs(node, visited):
-            if node == end:
-                return True
-            visited.add(node)
-            for neighbor in self.G.neighbors(node):
-                if neighbor not in visited:
-                    if dfs(neighbor, visited.copy()):
-                        return True
-            return False
+        return self._find(start) == self._find(end)
 
-        return dfs(start, set())
+    def invalidate(self) -> None:
+        """Drops the cached longest path and trail searches, the next calculate_longest_path searches again."""
+        self._longest_path = None
+        self._longest_trail.clear()
 
     def calculate_longest_path(self) -> int:
-        def dfs(node_, visited):
-            visited.add(node_)
-            max_length = 0
-            for neighbor in self.G.neighbors(node_):
-                if neighbor not in visited:
-                    length_ = 1 + dfs(neighbor, visited.copy())
-                    if length_ > max_length:
-                        max_length = length_
-            return max_length
-
-        longest = 0
-        for node in self.G.nodes:
-            if not list(self.G.neighbors(node)):
-                continue
-            length = dfs(node, set())
-            if length > longest:
-                longest = length
-
-        return longest
+        if self._longest_path is None:
+            self._longest_path = self._longest_trail.calculate(self._edges)
+        return self._longest_path
 
     def draw_graph(self, pause_time: int = 30) -> None:
         plt.figure(figsize=(12, 6))
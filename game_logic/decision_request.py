@@ -0,0 +1,18 @@
+from dataclasses import dataclass
+from typing import Tuple
+
+from game_logic.enums.decisions.decision_types import DecisionType
+
+
+@dataclass(frozen=True)
+class DecisionRequest:
+    """A decision a player has to make, yielded by the turn generators of Game and BasePlayer.
+
+    The answer sent back is an int: an ActionDecision or TrainCardDecision value, a link id, a card color id,
+    a number of wild cards, or for TICKETS the bitmask of the dealt tickets to keep.
+    """
+    player_id: int
+    decision_type: DecisionType
+    # Dealt tickets and how many of them must be kept, for TICKETS
+    tickets: Tuple[Tuple[str, str, int], ...] = ()
+    min_keep: int = 0
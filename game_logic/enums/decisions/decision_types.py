@@ -0,0 +1,10 @@
+from enum import Enum
+
+
+class DecisionType(Enum):
+    ACTION = 'action'
+    ROUTE = 'route'
+    CARDS_COLOR = 'cards_color'
+    WILD_CARDS = 'wild_cards'
+    TRAIN_CARD = 'train_card'
+    TICKETS = 'tickets'
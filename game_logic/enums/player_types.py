@@ -5,3 +5,5 @@ class PlayerType(Enum):
     HUMAN = 'Human'
     AI = 'AI'
     RANDOM = 'Random'
+    MCTS = 'MCTS'
+    REMOTE = 'Remote'
@@ -1,13 +1,23 @@
+import logging
 import random
-from typing import List
+import time
+from typing import Any, Generator, List, Optional
 from neat.nn.feed_forward import FeedForwardNetwork
 
+from game_logic.decision_request import DecisionRequest
 from game_logic.game_logger import logger
+from game_logic.legal_moves import LegalMoveGenerator
+from game_logic.enums.decisions.decision_types import DecisionType
 from game_logic.enums.game_states import GameState
+from game_logic.game_snapshot import GameSnapshot
+from game_logic.game_stats import GameStats
+from game_logic.move_log import MoveLog
 from game_logic.player_factory import PlayerFactory
+from game_logic.scoring import FinalScores, get_scoring_tables, score_game
 from game_logic.players.base_player import BasePlayer
 from game_logic.boards.game_board import GameBoard
 from game_logic.ticket_deck import TicketDeck
+from game_logic.ticket_hints import TicketHints
 from game_logic.train_card_manager import TrainCardManager
 from game_logic.config_factory import ConfigFactory
 
@@ -16,8 +26,10 @@ class Game:
     MIN_PLAYERS = 2
     MAX_PLAYERS = 5
 
-    def __init__(self, player_types: List[str], version: str, networks: List[FeedForwardNetwork] = None) -> None:
+    def __init__(self, player_types: List[str], version: str, networks: List[FeedForwardNetwork] = None,
+                 player_factory: PlayerFactory = None, seed: int = None) -> None:
         self.players_num = len(player_types)
+        self.player_types = list(player_types)
 
         self.config_factory = ConfigFactory()
         self.config = self.config_factory.get_config(version)
@@ -26,23 +38,45 @@ class Game:
         if not self.MIN_PLAYERS <= self.players_num <= self.MAX_PLAYERS:
             raise ValueError(f'This game is designed for {self.MIN_PLAYERS}-{self.MAX_PLAYERS} players.')
 
+        self.networks = networks
+        self.player_factory = player_factory or PlayerFactory()
+
+        # State of the step API, see reset
+        self.steps: Optional[Generator[DecisionRequest, int, List[int]]] = None
+        self.pending_request: Optional[DecisionRequest] = None
+        self.final_scores: Optional[List[int]] = None
+
+        self.new_game(seed)
+
+    def new_game(self, seed: int = None) -> None:
+        """Creates the board, the decks and the players of a game that has not started yet."""
+        # Every chance event of the game draws from rng, players get their own generators derived from seed.
+        # Without a seed one is drawn from the global generator, so seeding that still reproduces the game.
+        self.seed = random.getrandbits(63) if seed is None else seed
+        self.rng = random.Random(self.seed)
+        # Set to a MoveLog to record the decisions of the game
+        self.move_log: Optional[MoveLog] = None
+
         self.game_state = GameState.INIT
         logger.info(self.game_state)
 
         self.board = GameBoard(self)
         self.ticket_deck = TicketDeck(self)
 
-        self.player_factory = PlayerFactory()
-        self.players, self.adapter = self.player_factory.create_players(player_types, self, networks)
+        self.players, self.adapter = self.player_factory.create_players(self.player_types, self, self.networks)
 
         self.train_card_manager = TrainCardManager(self)
+        self.legal_moves = LegalMoveGenerator(self)
+        self.ticket_hints = TicketHints(self)
 
-        self.current_player_id = random.randrange(0, self.players_num)
+        self.current_player_id = self.rng.randrange(0, self.players_num)
         self.total_moves = 0
         self.completed_moves = 0
+        self.stats = GameStats(self.players_num)
 
         self.last_player = None
         self.winner = None
+        self.final_results: Optional[FinalScores] = None
 
     def move_to_next_player(self) -> None:
         self.current_player_id = (self.current_player_id + 1) % self.players_num
@@ -54,109 +88,248 @@ class Game:
         return player.get_trains_num() <= self.config.MIN_TRAIN_FIGURES_NUM
 
     def play(self, max_moves: int = 0) -> List[int]:
+        if self.game_state == GameState.INIT:
+            self.setup()
+        return self.run(max_moves)
+
+    def play_steps(self, max_moves: int = 0) -> Generator[DecisionRequest, int, List[int]]:
+        """Game.play as a generator: yields every decision a player has to make and expects its answer by send,
+        so the driver can take the answers from anywhere, e.g. await a remote player. Returns the final scores."""
+        if self.game_state == GameState.INIT:
+            yield from self.setup_steps()
+        if self.move_log is not None:
+            self.move_log.max_moves = max_moves
+        start = time.perf_counter()
+        while self.game_state != GameState.FINISHED:
+            if max_moves and self.total_moves > max_moves:
+                break
+            yield from self.play_move_steps()
+        self.stats.add_time('turns', time.perf_counter() - start)
+        return self.finish()
+
+    def reset(self, seed: int = None, max_moves: int = 0) -> DecisionRequest:
+        """Starts a new game driven by step and returns its first decision.
+
+        The step API is a state machine over play_steps: pending_request is the decision the game waits for,
+        including the ones inside a turn (the color and wild cards of a claim, the second card), and step
+        answers it. Nothing blocks, so one loop can drive any number of games.
+        """
+        self.new_game(seed)
+        return self.resume(max_moves)
+
+    def resume(self, max_moves: int = 0) -> Optional[DecisionRequest]:
+        """Continues the current game, e.g. after restore, with the step API and returns its next decision."""
+        if self.steps is not None:
+            self.steps.close()
+        self.steps = self.play_steps(max_moves)
+        self.final_scores = None
+        return self.step(None)
+
+    def legal_actions(self) -> List[int]:
+        """Legal answers to pending_request. When no answer is legal the move fails anyway, and every answer
+        in range is returned."""
+        request = self.pending_request
+        if request is None:
+            return []
+        return self.legal_moves.legal_decisions(request) or list(range(self.legal_moves.decisions_num(request)))
+
+    def step(self, action: Optional[int]) -> Optional[DecisionRequest]:
+        """Answers pending_request with action and plays on to the next decision, which is returned. Returns None
+        and sets final_scores when the game is over."""
+        request, legal_moves = self.pending_request, self.legal_moves
+        if request is not None:
+            if not isinstance(action, int) or not 0 <= action < legal_moves.decisions_num(request):
+                raise ValueError(f'Invalid {request.decision_type.value} decision: {action}')
+            # The players keep min_keep tickets themselves, a driver of the step API has to be held to it
+            if request.decision_type is DecisionType.TICKETS and action not in legal_moves.legal_decisions(request):
+                raise ValueError(f'Keep at least {request.min_keep} of the dealt tickets, not mask {action}')
+        elif self.steps is None or self.final_scores is not None:
+            raise RuntimeError('No game in progress, call reset first')
+        try:
+            self.pending_request = self.steps.send(action)
+        except StopIteration as stop:
+            self.pending_request = None
+            self.steps = None
+            self.final_scores = stop.value
+        return self.pending_request
+
+    def is_terminal(self) -> bool:
+        return self.final_scores is not None
+
+    def answer_requests(self, steps: Generator[DecisionRequest, int, Any]) -> Any:
+        """Runs a generator of decisions to the end, answering each with the decide callbacks of its player."""
+        players = self.players
+        answer = None
+        try:
+            while True:
+                request = steps.send(answer)
+                answer = players[request.player_id].make_decision(request)
+        except StopIteration as stop:
+            return stop.value
+
+    def setup(self) -> None:
+        """Deals the starting hands and tickets."""
+        self.answer_requests(self.setup_steps())
+
+    def setup_steps(self) -> Generator[DecisionRequest, int, None]:
+        start = time.perf_counter()
         self.ticket_deck.set_ticket_pile_num_adapter()
         self.game_state = GameState.RUNNING
         logger.info(self.game_state)
 
         for player in self.players:
             player.draw_initial_train_cards(self.config.STARTING_HAND_SIZE)
-            player.draw_tickets(num_tickets=self.config.INITIAL_TICKETS_DEALT_NUM,
-                                min_keep=self.config.INITIAL_TICKETS_TO_KEEP_NUM)
-
-        while self.game_state != GameState.LAST_ROUND:
-            if max_moves and self.total_moves > max_moves:
-                break
-            self.total_moves += 1
-            current_player = self.players[self.current_player_id]
-            move_completed = current_player.play_turn()
-            if move_completed:
-                self.completed_moves += 1
-            else:
-                self.player_stats[current_player.player_id]['invalid_actions'] += 1
-            self.log_game_state()
-            if self.last_round_condition(current_player):
-                self.last_player = current_player
-                self.game_state = GameState.LAST_ROUND
-            self.move_to_next_player()
-
+            yield from player.draw_tickets_steps(num_tickets=self.config.INITIAL_TICKETS_DEALT_NUM,
+                                                 min_keep=self.config.INITIAL_TICKETS_TO_KEEP_NUM)
+        self.stats.add_time('setup', time.perf_counter() - start)
+
+    def run(self, max_moves: int = 0) -> List[int]:
+        """Plays from the current state to the end of the game and returns the final scores."""
+        if self.move_log is not None:
+            self.move_log.max_moves = max_moves
+        start = time.perf_counter()
         while self.game_state != GameState.FINISHED:
             if max_moves and self.total_moves > max_moves:
                 break
-            self.total_moves += 1
-            current_player = self.players[self.current_player_id]
-            move_completed = current_player.play_turn()
-            if move_completed:
-                self.completed_moves += 1
-            else:
-                self.player_stats[current_player.player_id]['invalid_actions'] += 1
-            self.log_game_state()
+            self.play_move()
+        self.stats.add_time('turns', time.perf_counter() - start)
+        return self.finish()
+
+    def play_move(self) -> None:
+        """Plays the turn of the current player and passes the turn on."""
+        self.total_moves += 1
+        current_player = self.players[self.current_player_id]
+        self.end_move(current_player, current_player.play_turn())
+
+    def play_move_steps(self) -> Generator[DecisionRequest, int, None]:
+        self.total_moves += 1
+        current_player = self.players[self.current_player_id]
+        move_completed = yield from current_player.turn_steps()
+        self.end_move(current_player, move_completed)
+
+    def end_move(self, current_player: BasePlayer, move_completed: bool) -> None:
+        if move_completed:
+            self.completed_moves += 1
+        self.log_game_state()
+
+        if self.game_state == GameState.LAST_ROUND:
             if current_player is self.last_player:
                 self.game_state = GameState.FINISHED
-            else:
-                self.move_to_next_player()
-
-        self.score_player_tickets()
-        self.score_longest_path()
-
-        self.determine_winner()
-        logger.info(f'{self.winner} {self.winner.tickets} won!')
-        logger.info(f'completed moves: {self.completed_moves}')
-        logger.info(f'total moves: {self.total_moves}')
+                return
+        elif self.last_round_condition(current_player):
+            self.last_player = current_player
+            self.game_state = GameState.LAST_ROUND
+        self.move_to_next_player()
+
+    def finish(self) -> List[int]:
+        """Scores the tickets and the longest path and returns the final scores."""
+        start = time.perf_counter()
+        final_scores = self.score_game()
+        for player in self.players:
+            player.score = final_scores.scores[player.player_id]
+        for player_id in final_scores.longest_path_players:
+            self.players[player_id].set_longest_path()
+        self.winner = self.players[final_scores.winner]
+        self.final_results = final_scores
+        self.stats.add_time('scoring', time.perf_counter() - start)
+        logger.info('%s %s won!', self.winner, self.winner.tickets)
+        logger.info('completed moves: %s', self.completed_moves)
+        logger.info('total moves: %s', self.total_moves)
 
         self.game_summary()
 
         return [player.score for player in self.players]
 
-    def score_player_tickets(self) -> None:
+    def reseed(self, seed: int) -> None:
+        """Restarts the game and player generators from a new seed."""
+        self.seed = seed
+        self.rng.seed(seed)
         for player in self.players:
-            player.score_tickets()
-
-    def score_longest_path(self) -> None:
-        if not hasattr(self.config, 'LONGEST_ROUTE_BONUS'):
-            return
-
-        max_value = float('-inf')
-        best_players = []
-
+            player.rng.seed(player.get_seed(seed))
+
+    def snapshot(self) -> GameSnapshot:
+        player_ids = {player.color: player.player_id for player in self.players}
+        train_card_manager = self.train_card_manager
+        return GameSnapshot(
+            version=self.version,
+            game_state=self.game_state,
+            current_player_id=self.current_player_id,
+            last_player_id=self.last_player.player_id if self.last_player is not None else None,
+            total_moves=self.total_moves,
+            completed_moves=self.completed_moves,
+            draw_pile=tuple(train_card_manager.get_draw_pile()),
+            discard_pile=tuple(train_card_manager.get_discard_pile()),
+            face_up_cards=tuple(train_card_manager.get_face_up_cards()),
+            ticket_deck=self.ticket_deck.get_ticket_ids(),
+            link_owners=tuple(-1 if owner is None else player_ids[owner] for owner in self.board.link_owners),
+            hands=tuple(tuple(player.hand) for player in self.players),
+            trains=tuple(player.trains_remaining for player in self.players),
+            scores=tuple(player.score for player in self.players),
+            tickets=tuple(tuple((self.ticket_deck.get_ticket_id(ticket), completed)
+                                for ticket, completed in player.tickets.items()) for player in self.players),
+            longest_paths=tuple(player.longest_path for player in self.players))
+
+    def restore(self, snapshot: GameSnapshot) -> None:
+        """Puts this game in the state of the snapshot. The players keep their types and networks, the game and
+        players keep their random generators, see reseed."""
+        if snapshot.version != self.version or snapshot.players_num != self.players_num:
+            raise ValueError(f'Cannot restore a {snapshot.players_num} players {snapshot.version} snapshot into a '
+                             f'{self.players_num} players {self.version} game')
+
+        self.adapter.reset()
+        self.board.restore([None if owner == -1 else self.players[owner].color for owner in snapshot.link_owners])
+        self.train_card_manager.restore(snapshot.draw_pile, snapshot.discard_pile, snapshot.face_up_cards)
+        self.ticket_deck.restore(snapshot.ticket_deck)
+        tickets = self.ticket_deck.tickets
         for player in self.players:
-            value = player.player_board.calculate_longest_path()
-
-            if value > max_value:
-                max_value = value
-                best_players = [player]
-            elif value == max_value:
-                best_players.append(player)
-
-        for player in best_players:
-            player.set_longest_path()
-            player.add_points(self.config.LONGEST_ROUTE_BONUS)
-
-    def determine_winner(self) -> None:
-        sorted_players = sorted(self.players,
-                                key=lambda player: (player.get_score(), sum(player.get_ticket_values()),
-                                                    player.longest_path),
-                                reverse=True)
-        self.winner = sorted_players[0]
-        logger.info(f'{self.winner} wins!')
-        # self.winner.player_board.draw_graph()
-        logger.info('winner tickets:', self.winner.tickets)
-        # self.game_manager.board.draw_possession_graph()
+            player_id = player.player_id
+            player.restore(snapshot.hands[player_id], snapshot.trains[player_id], snapshot.scores[player_id],
+                           [(tickets[ticket_id], completed) for ticket_id, completed in snapshot.tickets[player_id]],
+                           snapshot.longest_paths[player_id])
+        self.legal_moves.reset()
+
+        self.game_state = snapshot.game_state
+        self.current_player_id = snapshot.current_player_id
+        self.last_player = self.players[snapshot.last_player_id] if snapshot.last_player_id is not None else None
+        self.total_moves = snapshot.total_moves
+        self.completed_moves = snapshot.completed_moves
+        self.winner = None
+        self.final_results = None
+        if self.steps is not None:
+            self.steps.close()
+        self.steps = None
+        self.pending_request = None
+        self.final_scores = None
+
+    def score_game(self) -> FinalScores:
+        """Scores the tickets, the longest path and the tiebreakers of all players, without changing the game."""
+        player_ids = {player.color: player.player_id for player in self.players}
+        ticket_index = self.board.map_data.ticket_index
+        return score_game(get_scoring_tables(self.version),
+                          [-1 if owner is None else player_ids[owner] for owner in self.board.link_owners],
+                          [[ticket_index[ticket] for ticket in player.tickets] for player in self.players],
+                          [player.score for player in self.players],
+                          getattr(self.config, 'LONGEST_ROUTE_BONUS', None))
 
     def log_game_state(self):
+        if not logger.isEnabledFor(logging.INFO):
+            return
         # logger.debug(f'face up pile: {self.game_manager.train_card_manager.get_face_up_cards()}')
         # logger.debug(f'draw pile: {len(self.game_manager.train_card_manager.get_draw_pile())}')
         # logger.debug(f'discard pile: {len(self.game_manager.train_card_manager.get_discard_pile())}')
-        logger.info(f'ticket deck: {self.ticket_deck.tickets_left}')
+        logger.info('ticket deck: %s', self.ticket_deck.tickets_left)
         for player in self.players:
-            logger.info(f'{player} trains: {player.trains_remaining}')
+            logger.info('%s trains: %s', player, player.trains_remaining)
 
     def game_summary(self):
+        if not logger.isEnabledFor(logging.INFO):
+            return
         for player in self.players:
             logger.info(player)
-            logger.info(f'score: {player.score}')
-            logger.info(f'tickets: {player.tickets}')
-            logger.info(f'trains remaining: {player.trains_remaining}')
-            logger.info(f'longest path: {player.longest_path}')
+            logger.info('score: %s', player.score)
+            logger.info('tickets: %s', player.tickets)
+            logger.info('trains remaining: %s', player.trains_remaining)
+            logger.info('longest path: %s', player.longest_path)
 
     def deal_face_up_card(self, card_id):
         return self.train_card_manager.pick_face_up_card(card_id)
@@ -7,6 +7,12 @@ class BaseGameConfig:
     WILD_CARDS_NUM = 14
     TRAIN_CARDS_NUM = 12  # per color
     TRAIN_COLORS = ["red", "blue", "green", "yellow", "black", "white", "pink", "orange"]
+    GREY_COLOR = 'grey'  # routes that can be claimed with cards of any single color
+    # Train cards are encoded as ints: each color by its TRAIN_COLORS index, then the wild card
+    WILD_CARD_ID = len(TRAIN_COLORS)
+    CARD_TYPES_NUM = WILD_CARD_ID + 1
+    EMPTY_CARD_ID = CARD_TYPES_NUM  # empty face up slot
+    GREY_COLOR_ID = -1
     TRAIN_CARDS_DEALT_NUM = 2
     MAX_WILD_CARDS = 3
     FACE_UP_CARDS_NUM = 5
@@ -21,6 +27,7 @@ class GameConfigUSA(BaseGameConfig):
 
 
 class GameConfigEurope(BaseGameConfig):
+    TRAIN_COLORS = ["red", "blue", "green", "yellow", "black", "white", "purple", "orange"]
     WILD_CARD_RESTRICTION = True
     LONGEST_ROUTE_BONUS = 10
     STATIONS_NUM = 15
@@ -1,27 +1,73 @@
 import logging
 import os
+import warnings
+from typing import Optional, Union
 
 parent_directory = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+LOG_FILE_PATH = os.path.join(parent_directory, 'game.log')
 
-# Create a logger object
+# Level above CRITICAL: every logger call returns at the level check, before any formatting
+QUIET = logging.CRITICAL + 1
+logging.addLevelName(QUIET, 'QUIET')
+
+# Create a logger object. Handlers are only attached on the first record that gets through,
+# so importing the package does not touch game.log
 logger = logging.getLogger('logger')
 
-# Set the logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
-logger.setLevel(logging.DEBUG)
 
-# Create a file handler and set its level
-file_handler = logging.FileHandler(os.path.join(parent_directory, 'game.log'))
-file_handler.setLevel(logging.ERROR)
+class _DeferredSetupHandler(logging.Handler):
+    def emit(self, record: logging.LogRecord) -> None:
+        handlers = _create_handlers(_settings['log_file'], _settings['console'])
+        # Assign a new list: Logger.callHandlers is still iterating over the old one
+        logger.handlers = handlers
+        for handler in handlers:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+
+def _create_handlers(log_file: Optional[str], console: bool) -> list:
+    formatter = logging.Formatter('[%(levelname)s] %(message)s')
+    handlers = []
+
+    if log_file:
+        file_handler = logging.FileHandler(log_file, delay=True)
+        file_handler.setLevel(logging.ERROR)
+        file_handler.setFormatter(formatter)
+        handlers.append(file_handler)
+
+    if console:
+        console_handler = logging.StreamHandler()
+        console_handler.setLevel(logging.DEBUG)
+        console_handler.setFormatter(formatter)
+        handlers.append(console_handler)
+
+    return handlers
+
+
+_settings = {'log_file': LOG_FILE_PATH, 'console': True}
+
+
+def configure_logging(level: Union[int, str] = logging.DEBUG, quiet: bool = False,
+                      log_file: Optional[str] = LOG_FILE_PATH, console: bool = True) -> None:
+    """Sets the engine's log level and outputs.
+
+    quiet=True is the headless mode used for self-play: nothing is formatted or written.
+    """
+    for handler in logger.handlers:
+        handler.close()
+    _settings['log_file'] = log_file
+    _settings['console'] = console
+    logger.handlers = [_DeferredSetupHandler()]
+    logger.setLevel(QUIET if quiet else level)
+
 
-# Create a console handler and set its level
-console_handler = logging.StreamHandler()
-console_handler.setLevel(logging.DEBUG)
+def _get_env_level(default: str = 'DEBUG') -> str:
+    level = os.environ.get('TTR_LOG_LEVEL', default).upper()
+    # getLevelName maps the names of known levels to their numbers and anything else to a string
+    if not isinstance(logging.getLevelName(level), int):
+        warnings.warn(f'Unknown TTR_LOG_LEVEL {level!r}, logging at {default}')
+        return default
+    return level
 
-# Create a formatter and set its format
-formatter = logging.Formatter('[%(levelname)s] %(message)s')
-file_handler.setFormatter(formatter)
-console_handler.setFormatter(formatter)
 
-# Add the handlers to the logger
-logger.addHandler(file_handler)
-logger.addHandler(console_handler)
+configure_logging(_get_env_level())
@@ -0,0 +1,233 @@
+import asyncio
+import itertools
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Set
+
+from game_logic.decision_request import DecisionRequest
+from game_logic.enums.decisions.decision_types import DecisionType
+from game_logic.enums.player_types import PlayerType
+from game_logic.game import Game
+from game_logic.game_logger import logger
+
+# Players whose decisions take long enough to stall every other session, they decide in the executor
+CPU_HEAVY_PLAYER_TYPES = (PlayerType.AI.value, PlayerType.MCTS.value)
+
+
+class Connection:
+    """A client of the server: newline separated JSON messages over a stream."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.reader = reader
+        self.writer = writer
+        # session_id -> player_id of the seats this client plays
+        self.seats: Dict[int, int] = {}
+        # Sessions the client created or plays in, they end when it disconnects
+        self.session_ids: Set[int] = set()
+
+    def send(self, message: Dict[str, Any]) -> None:
+        if not self.writer.is_closing():
+            self.writer.write(json.dumps(message, separators=(',', ':')).encode() + b'\n')
+
+
+class GameSession:
+    """One game of the server. Drives it with Game.step: bots answer in place, or in the executor when they are
+    CPU heavy, and Remote seats answer through their client."""
+
+    def __init__(self, session_id: int, game: Game, max_moves: int, owner: Connection) -> None:
+        self.session_id = session_id
+        self.game = game
+        self.max_moves = max_moves
+        # The client that created the session, it is told the result even without a seat
+        self.owner = owner
+        self.task: Optional[asyncio.Task] = None
+        self.remote_seats: Dict[int, Optional[Connection]] = {
+            player_id: None for player_id, player_type in enumerate(game.player_types)
+            if player_type == PlayerType.REMOTE.value}
+        self.seated = asyncio.Event()
+        if not self.remote_seats:
+            self.seated.set()
+        self.pending_request: Optional[DecisionRequest] = None
+        self.pending_answer: Optional[asyncio.Future] = None
+
+    def take_seat(self, connection: Connection) -> Optional[int]:
+        for player_id, seat_connection in self.remote_seats.items():
+            if seat_connection is None:
+                self.remote_seats[player_id] = connection
+                connection.seats[self.session_id] = player_id
+                connection.session_ids.add(self.session_id)
+                if all(self.remote_seats.values()):
+                    self.seated.set()
+                return player_id
+        return None
+
+    def answer(self, player_id: int, value: Any) -> Optional[str]:
+        """Passes a client's answer to the waiting game, returns an error message when it is not acceptable."""
+        request = self.pending_request
+        if request is None or request.player_id != player_id:
+            return 'it is not your decision'
+        if isinstance(value, list) and request.decision_type is DecisionType.TICKETS:
+            value = sum(1 << index for index in set(value) if isinstance(index, int) and 0 <= index < 32)
+        if not isinstance(value, int) or isinstance(value, bool):
+            return 'the value must be an integer'
+        legal_decisions = self.game.legal_moves.legal_decisions(request)
+        if legal_decisions and value not in legal_decisions:
+            return f'illegal {request.decision_type.value}, choose one of {legal_decisions}'
+        if not 0 <= value < self.game.legal_moves.decisions_num(request):
+            return f'{request.decision_type.value} out of range'
+        self.pending_request = None
+        self.pending_answer.set_result(value)
+        return None
+
+    def get_request_message(self, request: DecisionRequest) -> Dict[str, Any]:
+        game = self.game
+        player = game.players[request.player_id]
+        message = {'type': 'decision', 'session': self.session_id, 'player_id': request.player_id,
+                   'decision': request.decision_type.value,
+                   'options': game.legal_moves.legal_decisions(request),
+                   'hand': player.hand,
+                   'trains': player.trains_remaining,
+                   'score': player.score,
+                   'face_up_cards': game.train_card_manager.get_face_up_cards(),
+                   'tickets': [[*ticket, completed] for ticket, completed in player.tickets.items()]}
+        if request.decision_type is DecisionType.TICKETS:
+            message['dealt_tickets'] = request.tickets
+            message['min_keep'] = request.min_keep
+        return message
+
+    async def ask_remote(self, request: DecisionRequest) -> int:
+        self.pending_request = request
+        self.pending_answer = asyncio.get_running_loop().create_future()
+        self.remote_seats[request.player_id].send(self.get_request_message(request))
+        return await self.pending_answer
+
+    async def play(self, executor: ThreadPoolExecutor) -> List[int]:
+        await self.seated.wait()
+        loop = asyncio.get_running_loop()
+        game = self.game
+        cpu_heavy = [player_type in CPU_HEAVY_PLAYER_TYPES for player_type in game.player_types]
+        request = game.resume(self.max_moves)
+        while not game.is_terminal():
+            player_id = request.player_id
+            if player_id in self.remote_seats:
+                answer = await self.ask_remote(request)
+            elif cpu_heavy[player_id]:
+                answer = await loop.run_in_executor(executor, game.players[player_id].make_decision, request)
+            else:
+                if request.decision_type is DecisionType.ACTION:
+                    # Let the other sessions run between the turns of bots
+                    await asyncio.sleep(0)
+                answer = game.players[player_id].make_decision(request)
+            request = game.step(answer)
+        return game.final_scores
+
+
+class GameServer:
+    """Hosts many concurrent games in one event loop for clients connected over TCP or a Unix socket.
+
+    Clients send and receive one JSON object per line:
+        {"type": "create", "version": "USA", "players": ["Remote", "Random"], "seed": 1, "max_moves": 0}
+            -> {"type": "created", "session": 0, "player_id": 0}, the client takes the first Remote seat
+        {"type": "join", "session": 0} -> {"type": "joined", "session": 0, "player_id": 1}, one seat per client
+        {"type": "decision", "session": 0, "value": 2} answers the last "decision" message of the session
+        {"type": "stats"} -> {"type": "stats", ...} load of the server
+    The game starts when every Remote seat is taken. Each decision of a client's seat arrives as a "decision"
+    message with its legal "options", the session ends with {"type": "finished", "scores": [...], ...}.
+    Errors are reported as {"type": "error", "message": ...}. Games cannot have Human seats, whose players
+    read the console, clients play Remote seats instead. A client that disconnects aborts its sessions.
+    """
+
+    def __init__(self, executor_workers: int = None) -> None:
+        self.sessions: Dict[int, GameSession] = {}
+        self.session_ids = itertools.count()
+        self.executor = ThreadPoolExecutor(executor_workers, thread_name_prefix='decide')
+        self.finished_num = 0
+        self.moves_num = 0
+        self.started = time.perf_counter()
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        connection = Connection(reader, writer)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    message = json.loads(line)
+                    error = self.handle_message(connection, message)
+                except FileNotFoundError as exc:
+                    error = f'{exc.filename} is missing'
+                except (ValueError, TypeError, KeyError) as exc:
+                    error = f'bad message: {exc!r}'
+                if error:
+                    connection.send({'type': 'error', 'message': error})
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            for session_id in connection.session_ids:
+                session = self.sessions.get(session_id)
+                if session is not None:
+                    session.task.cancel()
+            writer.close()
+
+    def handle_message(self, connection: Connection, message: Dict[str, Any]) -> Optional[str]:
+        message_type = message.get('type')
+        if message_type == 'decision':
+            session = self.sessions.get(message['session'])
+            if session is None or message['session'] not in connection.seats:
+                return f'not seated in session {message["session"]}'
+            return session.answer(connection.seats[message['session']], message['value'])
+        elif message_type == 'create':
+            if PlayerType.HUMAN.value in message['players']:
+                return 'Human seats would block the server on the console, use Remote seats'
+            game = Game(message['players'], message.get('version', 'USA'), seed=message.get('seed'))
+            session = GameSession(next(self.session_ids), game, message.get('max_moves', 0), connection)
+            self.sessions[session.session_id] = session
+            connection.session_ids.add(session.session_id)
+            player_id = session.take_seat(connection)
+            connection.send({'type': 'created', 'session': session.session_id, 'player_id': player_id})
+            session.task = asyncio.get_running_loop().create_task(self.run_session(session))
+        elif message_type == 'join':
+            if message['session'] in connection.seats:
+                # Decisions name only the session, so a client plays one seat of it
+                return f'already seated in session {message["session"]}'
+            session = self.sessions.get(message['session'])
+            player_id = session.take_seat(connection) if session is not None else None
+            if player_id is None:
+                return f'no free seat in session {message["session"]}'
+            connection.send({'type': 'joined', 'session': session.session_id, 'player_id': player_id})
+        elif message_type == 'stats':
+            connection.send({'type': 'stats', 'sessions': len(self.sessions), 'finished': self.finished_num,
+                             'moves': self.moves_num, 'cpu_time': time.process_time(),
+                             'uptime': time.perf_counter() - self.started})
+        else:
+            return f'unknown message type {message_type!r}'
+        return None
+
+    async def run_session(self, session: GameSession) -> None:
+        try:
+            scores = await session.play(self.executor)
+            self.finished_num += 1
+            message = {'type': 'finished', 'session': session.session_id, 'scores': scores,
+                       'winner': session.game.winner.player_id, 'total_moves': session.game.total_moves}
+        except asyncio.CancelledError:
+            logger.info('session %s aborted', session.session_id)
+            message = {'type': 'error', 'session': session.session_id, 'message': 'a player disconnected'}
+        except Exception as exc:
+            logger.exception('session %s failed', session.session_id)
+            message = {'type': 'error', 'session': session.session_id, 'message': f'the game failed: {exc!r}'}
+        del self.sessions[session.session_id]
+        self.moves_num += session.game.total_moves
+        for connection in {session.owner, *session.remote_seats.values()} - {None}:
+            connection.session_ids.discard(session.session_id)
+            connection.send(message)
+
+    async def serve(self, host: str = '127.0.0.1', port: int = 8765, unix_path: str = None) -> None:
+        if unix_path:
+            server = await asyncio.start_unix_server(self.handle_connection, unix_path)
+        else:
+            server = await asyncio.start_server(self.handle_connection, host, port)
+        async with server:
+            await server.serve_forever()
@@ -0,0 +1,74 @@
+import dataclasses
+import random
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from game_logic.enums.game_states import GameState
+
+
+@dataclass(frozen=True)
+class GameSnapshot:
+    """Flat, immutable copy of everything that changes during a game, taken by Game.snapshot.
+
+    Cards are card ids, tickets are ticket ids, links are owned by player ids (-1 when free). Every field is
+    a tuple, so a snapshot can be shared or copied freely and restored into any Game of the same version and
+    number of players with Game.restore.
+    """
+    version: str
+    game_state: GameState
+    current_player_id: int
+    last_player_id: Optional[int]
+    total_moves: int
+    completed_moves: int
+
+    draw_pile: Tuple[int, ...]
+    # Count per card id
+    discard_pile: Tuple[int, ...]
+    face_up_cards: Tuple[int, ...]
+    # Ticket ids, top of the deck first
+    ticket_deck: Tuple[int, ...]
+    link_owners: Tuple[int, ...]
+
+    # Per player
+    hands: Tuple[Tuple[int, ...], ...]
+    trains: Tuple[int, ...]
+    scores: Tuple[int, ...]
+    # (ticket_id, completed) pairs, in the order the tickets were kept
+    tickets: Tuple[Tuple[Tuple[int, bool], ...], ...]
+    longest_paths: Tuple[bool, ...]
+
+    @property
+    def players_num(self) -> int:
+        return len(self.hands)
+
+    def determinize(self, seed, player_id: Optional[int] = None) -> 'GameSnapshot':
+        """Returns a copy with what is hidden from player_id dealt anew from seed.
+
+        The draw pile and the ticket deck are reshuffled. The opponents' hands are pooled with the draw pile and
+        their tickets with the ticket deck, and each opponent is dealt as many cards and tickets as it holds,
+        while the hand and tickets of player_id stay as they are. Without player_id only the two piles are
+        reshuffled. Dealt tickets are not marked completed, Game.restore reads that from the board.
+        """
+        rng = random.Random(seed)
+        opponent_ids = [] if player_id is None else [index for index in range(self.players_num) if index != player_id]
+        draw_pile = list(self.draw_pile)
+        ticket_deck = list(self.ticket_deck)
+        for opponent_id in opponent_ids:
+            for card, cards_num in enumerate(self.hands[opponent_id]):
+                draw_pile.extend([card] * cards_num)
+            ticket_deck.extend(ticket_id for ticket_id, _ in self.tickets[opponent_id])
+        rng.shuffle(draw_pile)
+        rng.shuffle(ticket_deck)
+
+        hands = list(self.hands)
+        tickets = list(self.tickets)
+        for opponent_id in opponent_ids:
+            hand = [0] * len(hands[opponent_id])
+            for _ in range(sum(hands[opponent_id])):
+                hand[draw_pile.pop()] += 1
+            hands[opponent_id] = tuple(hand)
+            tickets_num = len(tickets[opponent_id])
+            tickets[opponent_id] = tuple((ticket_id, False) for ticket_id in ticket_deck[:tickets_num])
+            del ticket_deck[:tickets_num]
+        return dataclasses.replace(self, draw_pile=tuple(draw_pile), ticket_deck=tuple(ticket_deck),
+                                   hands=tuple(hands), tickets=tuple(tickets))
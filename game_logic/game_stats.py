@@ -0,0 +1,36 @@
+from typing import Dict, List
+
+from game_logic.enums.decisions.actions import ActionDecision
+
+
+class GameStats:
+    """Per player counters of one game and the time spent in each phase, filled in as the game is played."""
+    COUNTERS = ('moves', 'completed_moves',
+                'invalid_claim_route', 'invalid_draw_tickets', 'invalid_draw_cards', 'invalid_skip',
+                'cards_from_face_up', 'cards_from_draw_pile', 'routes_claimed', 'trains_played',
+                'tickets_kept', 'tickets_completed')
+    PHASES = ('setup', 'turns', 'scoring')
+
+    def __init__(self, players_num: int) -> None:
+        self.counters: Dict[str, List[int]] = {name: [0] * players_num for name in self.COUNTERS}
+        self.timings: Dict[str, float] = dict.fromkeys(self.PHASES, 0.0)
+        self._invalid_counters = {action: f'invalid_{action.name.lower()}' for action in ActionDecision}
+
+    def count(self, name: str, player_id: int, num: int = 1) -> None:
+        self.counters[name][player_id] += num
+
+    def record_turn(self, player_id: int, action: ActionDecision, move_completed: bool) -> None:
+        self.counters['moves'][player_id] += 1
+        if move_completed:
+            self.counters['completed_moves'][player_id] += 1
+        else:
+            self.counters[self._invalid_counters[action]][player_id] += 1
+
+    def add_time(self, phase: str, seconds: float) -> None:
+        self.timings[phase] += seconds
+
+    def get_invalid_actions(self, player_id: int) -> int:
+        return sum(self.counters[name][player_id] for name in self._invalid_counters.values())
+
+    def get_player_stats(self, player_id: int) -> Dict[str, int]:
+        return {name: values[player_id] for name, values in self.counters.items()}
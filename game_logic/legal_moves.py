@@ -0,0 +1,174 @@
+from typing import List, Tuple, TYPE_CHECKING
+
+from game_logic.decision_request import DecisionRequest
+from game_logic.enums.decisions.actions import ActionDecision
+from game_logic.enums.decisions.decision_types import DecisionType
+from game_logic.enums.decisions.train_cards import TrainCardDecision
+
+if TYPE_CHECKING:
+    from game_logic.game import Game
+
+
+class LegalMoveGenerator:
+    """Keeps, for every player, a mask of the links they can claim right now.
+
+    A link is claimable when the GameBoard.validate_route rules allow it, the player has enough trains and
+    the hand can pay for it. The availability part only changes when a link of the route is claimed and the
+    payment part only when the player's hand or trains change, so both are kept per player and updated
+    incrementally: a hand change only revisits the links of that color (and the grey ones), a claim only
+    revisits the links of that route.
+    """
+
+    def __init__(self, game_instance: 'Game') -> None:
+        self.game_instance = game_instance
+        self.config = game_instance.config
+        self.board = game_instance.board
+        self.players = game_instance.players
+        self.links_num = self.board.get_route_links_num()
+        self.wild_card = self.config.WILD_CARD_ID
+        self.one_link_per_route = self.config.WILD_CARD_RESTRICTION and game_instance.players_num <= 3
+
+        # Index into the per color budgets computed in _update_links, grey links use the last entry
+        self.grey_budget_id = len(self.config.TRAIN_COLORS)
+        self.link_budget_ids: List[int] = []
+        self.color_links: List[List[int]] = [[] for _ in self.config.TRAIN_COLORS]
+        self.grey_links: List[int] = []
+        for link_id, color_id in enumerate(self.board.link_color_ids):
+            if color_id == self.config.GREY_COLOR_ID:
+                self.grey_links.append(link_id)
+                self.link_budget_ids.append(self.grey_budget_id)
+            else:
+                self.color_links[color_id].append(link_id)
+                self.link_budget_ids.append(color_id)
+
+        self.available_masks = [bytearray(self.links_num) for _ in self.players]
+        self.route_masks = [bytearray(self.links_num) for _ in self.players]
+        self.reset()
+
+    def reset(self) -> None:
+        """Recomputes every mask from the current board and hands."""
+        for link_ids in self.board.route_links:
+            self._update_available(link_ids)
+        for player in self.players:
+            self.update_trains(player.player_id)
+
+    def _update_available(self, link_ids) -> None:
+        """Recomputes, for every player, which links of one route the GameBoard.validate_route rules allow."""
+        owners = [self.board.link_owners[link_id] for link_id in link_ids]
+        claimed = any(owners)
+        for player, available_mask in zip(self.players, self.available_masks):
+            route_open = not claimed or (player.color not in owners and not self.one_link_per_route)
+            for link_id, owner in zip(link_ids, owners):
+                available_mask[link_id] = route_open and owner is None
+
+    def _get_budgets(self, player_id: int) -> List[int]:
+        """Longest link the player can pay for, per color and for grey links."""
+        player = self.players[player_id]
+        hand = player.hand
+        wild_cards = hand[self.wild_card]
+        budgets = [min(player.trains_remaining, color_cards + wild_cards) for color_cards in hand[:self.wild_card]]
+        budgets.append(max(budgets))
+        return budgets
+
+    def _update_links(self, player_id: int, link_ids) -> None:
+        budgets = self._get_budgets(player_id)
+        available_mask = self.available_masks[player_id]
+        mask = self.route_masks[player_id]
+        link_lengths = self.board.link_lengths
+        link_budget_ids = self.link_budget_ids
+        for link_id in link_ids:
+            mask[link_id] = available_mask[link_id] and link_lengths[link_id] <= budgets[link_budget_ids[link_id]]
+
+    def update_hand(self, player_id: int, card: int) -> None:
+        if card == self.wild_card:
+            self._update_links(player_id, range(self.links_num))
+        else:
+            self._update_links(player_id, self.color_links[card])
+            self._update_links(player_id, self.grey_links)
+
+    def update_trains(self, player_id: int) -> None:
+        self._update_links(player_id, range(self.links_num))
+
+    def update_route(self, route_id: int) -> None:
+        link_ids = self.board.route_links[route_id]
+        self._update_available(link_ids)
+        for player in self.players:
+            self._update_links(player.player_id, link_ids)
+
+    def route_mask(self, player_id: int) -> bytearray:
+        return self.route_masks[player_id]
+
+    def legal_links(self, player_id: int) -> List[int]:
+        return [link_id for link_id, legal in enumerate(self.route_masks[player_id]) if legal]
+
+    def action_mask(self, player_id: int) -> List[bool]:
+        train_card_manager = self.game_instance.train_card_manager
+        can_draw_cards = train_card_manager.get_face_up_cards_num() > 0 or train_card_manager.has_cards_to_draw()
+        mask = [False] * len(ActionDecision)
+        mask[ActionDecision.CLAIM_ROUTE.value] = 1 in self.route_masks[player_id]
+        mask[ActionDecision.DRAW_TICKETS.value] = not self.game_instance.ticket_deck.is_empty()
+        mask[ActionDecision.DRAW_CARDS.value] = can_draw_cards
+        mask[ActionDecision.SKIP.value] = True
+        return mask
+
+    def legal_actions(self, player_id: int) -> List[int]:
+        return [action for action, legal in enumerate(self.action_mask(player_id)) if legal]
+
+    def train_card_mask(self, first_card: bool) -> List[bool]:
+        train_card_manager = self.game_instance.train_card_manager
+        wild_restricted = self.config.WILD_CARD_RESTRICTION and not first_card
+
+        mask = [False] * len(TrainCardDecision)
+        for card_pos, card in enumerate(train_card_manager.get_face_up_cards()):
+            mask[card_pos] = card != self.config.EMPTY_CARD_ID and not (wild_restricted and card == self.wild_card)
+        mask[TrainCardDecision.DRAW_PILE.value] = train_card_manager.has_cards_to_draw()
+        return mask
+
+    def color_options(self, player_id: int, link_id: int) -> List[int]:
+        """Card colors the player can pay the link with."""
+        hand = self.players[player_id].hand
+        length = self.board.link_lengths[link_id]
+        color_id = self.board.link_color_ids[link_id]
+        colors = range(self.wild_card) if color_id == self.config.GREY_COLOR_ID else [color_id]
+        return [color for color in colors if hand[color] + hand[self.wild_card] >= length]
+
+    def wild_cards_range(self, player_id: int, link_id: int, color_id: int) -> Tuple[int, int]:
+        """Smallest and largest number of wild cards that pay the link together with cards of color_id."""
+        hand = self.players[player_id].hand
+        length = self.board.link_lengths[link_id]
+        return max(0, length - hand[color_id]), min(hand[self.wild_card], length)
+
+    def legal_decisions(self, request: DecisionRequest) -> List[int]:
+        """Legal answers to a request of the turn generators, empty when no answer can complete the move."""
+        player_id = request.player_id
+        player = self.players[player_id]
+        decision_type = request.decision_type
+        if decision_type is DecisionType.ACTION:
+            return self.legal_actions(player_id)
+        elif decision_type is DecisionType.ROUTE:
+            return self.legal_links(player_id)
+        elif decision_type is DecisionType.CARDS_COLOR:
+            return self.color_options(player_id, player.chosen_link_id)
+        elif decision_type is DecisionType.WILD_CARDS:
+            min_wild, max_wild = self.wild_cards_range(player_id, player.chosen_link_id, player.chosen_cards_color)
+            return list(range(min_wild, max_wild + 1))
+        elif decision_type is DecisionType.TRAIN_CARD:
+            mask = self.train_card_mask(first_card=player.drawn_cards_num == 0)
+            return [train_card for train_card, legal in enumerate(mask) if legal]
+        min_keep = min(request.min_keep, len(request.tickets))
+        return [kept_mask for kept_mask in range(1 << len(request.tickets)) if bin(kept_mask).count('1') >= min_keep]
+
+    def decisions_num(self, request: DecisionRequest) -> int:
+        """Answers to a request are the ints in range(decisions_num), legal or not."""
+        decision_type = request.decision_type
+        if decision_type is DecisionType.ACTION:
+            return len(ActionDecision)
+        elif decision_type is DecisionType.ROUTE:
+            return self.links_num
+        elif decision_type is DecisionType.CARDS_COLOR:
+            return len(self.config.TRAIN_COLORS)
+        elif decision_type is DecisionType.WILD_CARDS:
+            return self.config.WILD_CARDS_NUM + 1
+        elif decision_type is DecisionType.TRAIN_CARD:
+            return len(TrainCardDecision)
+        return 1 << len(request.tickets)
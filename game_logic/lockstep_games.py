@@ -0,0 +1,41 @@
+import threading
+from typing import List
+
+from neat.nn.feed_forward import FeedForwardNetwork
+
+from game_logic.game import Game
+from game_logic.players.ai_player import AIPlayer
+from network.batched_inference import InferenceBatcher
+
+
+class LockstepGames:
+    """Plays several games side by side, batching the network evaluations of all their AI players.
+
+    Each game runs in its own thread, but only one batch of decisions is evaluated at a time, so the games
+    advance one AI decision at a time, together.
+    """
+
+    def __init__(self, player_types: List[str], version: str, networks: List[FeedForwardNetwork],
+                 games_num: int) -> None:
+        self.games = [Game(player_types, version, networks) for _ in range(games_num)]
+        self.batcher = InferenceBatcher(games_num)
+        for game in self.games:
+            for player in game.players:
+                if isinstance(player, AIPlayer):
+                    player.evaluator = self.batcher.evaluate
+        self.scores: List[List[int]] = [[] for _ in self.games]
+
+    def _play(self, index: int, max_moves: int) -> None:
+        try:
+            self.scores[index] = self.games[index].play(max_moves)
+        finally:
+            self.batcher.game_finished()
+
+    def play(self, max_moves: int = 0) -> List[List[int]]:
+        threads = [threading.Thread(target=self._play, args=(index, max_moves), daemon=True)
+                   for index in range(len(self.games))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return self.scores
@@ -0,0 +1,135 @@
+import functools
+import os
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Mapping, Optional, Tuple
+
+import networkx as nx
+import numpy as np
+
+from game_logic.config_factory import ConfigFactory
+from game_logic.game_config import BaseGameConfig
+from game_logic.map_compiler import get_node_names, load_compiled_map, load_text_map
+from game_logic.utils import current_dir
+
+Route = Tuple[str, str, int, Tuple[str, ...]]
+Ticket = Tuple[str, str, int]
+
+
+@dataclass(frozen=True)
+class MapData:
+    """Parsed, immutable data of one game version. Shared by every game in the process."""
+    version: str
+    cities: Tuple[str, ...]
+    # Every city on the map, including any that only appear in routes or tickets
+    nodes: Tuple[str, ...]
+    city_index: Mapping[str, int]
+    routes: Tuple[Route, ...]
+    # None when the version has no tickets.txt
+    tickets: Optional[Tuple[Ticket, ...]]
+    ticket_index: Mapping[Ticket, int]
+
+    # Link table, indexed by link_id
+    link_cities: Tuple[Tuple[str, str], ...]
+    link_route_ids: Tuple[int, ...]
+    link_lengths: Tuple[int, ...]
+    link_colors: Tuple[str, ...]
+    # Card id needed for each link, GREY_COLOR_ID for grey links
+    link_color_ids: Tuple[int, ...]
+    # route_id -> link ids of that route
+    route_links: Tuple[Tuple[int, ...], ...]
+    # node index -> (neighbor node index, link_id, length) of every link at that node
+    node_links: Tuple[Tuple[Tuple[int, int, int], ...], ...]
+    # Read-only nodes x nodes matrix of shortest path lengths over all links, inf between disconnected nodes
+    distances: np.ndarray
+
+    # Frozen MultiGraph of all links with claimed_by=None and the edge key of every link
+    topology: nx.MultiGraph
+    topology_edge_keys: Tuple[int, ...]
+
+    @property
+    def links_num(self) -> int:
+        return len(self.link_route_ids)
+
+    @property
+    def tickets_path(self) -> str:
+        return os.path.join(current_dir, 'data', self.version, 'tickets.txt')
+
+
+def _get_color_id(config: BaseGameConfig, color: str) -> int:
+    if color == config.GREY_COLOR:
+        return config.GREY_COLOR_ID
+    try:
+        return config.TRAIN_COLORS.index(color)
+    except ValueError:
+        raise ValueError(f'Route color {color} is not one of the train colors: {config.TRAIN_COLORS}')
+
+
+def _get_distances(nodes_num: int, node_links: Tuple[Tuple[Tuple[int, int, int], ...], ...]) -> np.ndarray:
+    """All-pairs shortest paths by Floyd-Warshall, one vectorized relaxation per intermediate node."""
+    distances = np.full((nodes_num, nodes_num), np.inf)
+    np.fill_diagonal(distances, 0)
+    for node, links in enumerate(node_links):
+        for neighbor, _, length in links:
+            distances[node, neighbor] = min(distances[node, neighbor], length)
+    for node in range(nodes_num):
+        np.minimum(distances, distances[:, node, None] + distances[None, node, :], out=distances)
+    distances.setflags(write=False)
+    return distances
+
+
+@functools.lru_cache(maxsize=None)
+def get_map_data(version: str) -> MapData:
+    config = ConfigFactory.get_config(version)
+    cities, routes, tickets = load_compiled_map(version) or load_text_map(version)
+    nodes = get_node_names(cities, routes, tickets)
+
+    link_cities, link_route_ids, link_lengths, link_colors, route_links = [], [], [], [], []
+    link_id = 0
+    for route_id, (city1, city2, length, colors) in enumerate(routes):
+        route_link_ids = []
+        for color in colors:
+            link_cities.append((city1, city2))
+            link_route_ids.append(route_id)
+            link_lengths.append(length)
+            link_colors.append(color)
+            route_link_ids.append(link_id)
+            link_id += 1
+        route_links.append(tuple(route_link_ids))
+
+    topology = nx.MultiGraph()
+    topology.add_nodes_from(cities)
+    edge_keys = []
+    for link_id, (city1, city2) in enumerate(link_cities):
+        edge_keys.append(topology.add_edge(city1, city2,
+                                           route_id=link_route_ids[link_id],
+                                           link_id=link_id,
+                                           weight=link_lengths[link_id],
+                                           edge_color=link_colors[link_id],
+                                           claimed_by=None))
+    nx.freeze(topology)
+
+    city_index = {city: index for index, city in enumerate(nodes)}
+    node_links = [[] for _ in nodes]
+    for link_id, (city1, city2) in enumerate(link_cities):
+        node_links[city_index[city1]].append((city_index[city2], link_id, link_lengths[link_id]))
+        node_links[city_index[city2]].append((city_index[city1], link_id, link_lengths[link_id]))
+    node_links = tuple(tuple(links) for links in node_links)
+
+    return MapData(version=version,
+                   cities=cities,
+                   nodes=nodes,
+                   city_index=MappingProxyType(city_index),
+                   routes=routes,
+                   tickets=tickets,
+                   ticket_index=MappingProxyType({ticket: index for index, ticket in enumerate(tickets or ())}),
+                   link_cities=tuple(link_cities),
+                   link_route_ids=tuple(link_route_ids),
+                   link_lengths=tuple(link_lengths),
+                   link_colors=tuple(link_colors),
+                   link_color_ids=tuple(_get_color_id(config, color) for color in link_colors),
+                   route_links=tuple(route_links),
+                   node_links=node_links,
+                   distances=_get_distances(len(nodes), node_links),
+                   topology=topology,
+                   topology_edge_keys=tuple(edge_keys))
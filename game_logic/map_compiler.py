@@ -0,0 +1,183 @@
+import hashlib
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import List, Optional, Tuple
+
+from game_logic.utils import current_dir, load_cities, load_routes, load_tickets
+
+MAGIC = b'TTRMAP'
+FORMAT_VERSION = 1
+COMPILED_FILE_NAME = 'map.bin'
+SOURCE_FILE_NAMES = ('cities.txt', 'routes.txt', 'tickets.txt')
+
+# magic, format version, (size, mtime_ns) of each source file, source checksum, cities,
+# cities missing from cities.txt, routes, links, tickets (-1: no tickets.txt), colors, strings size
+_HEADER = struct.Struct('<6sH' + 'qq' * len(SOURCE_FILE_NAMES) + '32siiiiiii')
+
+Route = Tuple[str, str, int, Tuple[str, ...]]
+Ticket = Tuple[str, str, int]
+SourceMap = Tuple[Tuple[str, ...], Tuple[Route, ...], Optional[Tuple[Ticket, ...]]]
+
+
+def get_data_dir(version: str) -> str:
+    return os.path.join(current_dir, 'data', version)
+
+
+def get_compiled_path(version: str) -> str:
+    return os.path.join(get_data_dir(version), COMPILED_FILE_NAME)
+
+
+def source_stats(version: str) -> Tuple[int, ...]:
+    stats = []
+    for file_name in SOURCE_FILE_NAMES:
+        try:
+            stat = os.stat(os.path.join(get_data_dir(version), file_name))
+            stats.extend((stat.st_size, stat.st_mtime_ns))
+        except FileNotFoundError:
+            stats.extend((-1, -1))
+    return tuple(stats)
+
+
+def source_checksum(version: str) -> bytes:
+    digest = hashlib.blake2b(digest_size=32)
+    for file_name in SOURCE_FILE_NAMES:
+        file_path = os.path.join(get_data_dir(version), file_name)
+        digest.update(file_name.encode())
+        if os.path.exists(file_path):
+            with open(file_path, 'rb') as file:
+                content = file.read()
+            digest.update(struct.pack('<q', len(content)))
+            digest.update(content)
+        else:
+            digest.update(struct.pack('<q', -1))
+    return digest.digest()
+
+
+def load_text_map(version: str) -> SourceMap:
+    cities = load_cities(version)
+    routes = tuple((route[0], route[1], int(route[2]), tuple(route[3:])) for route in load_routes(version))
+    try:
+        tickets = tuple(load_tickets(version))
+    except FileNotFoundError:
+        tickets = None
+    return cities, routes, tickets
+
+
+def get_node_names(cities: Tuple[str, ...], routes: Tuple[Route, ...],
+                   tickets: Optional[Tuple[Ticket, ...]]) -> Tuple[str, ...]:
+    """Cities of cities.txt followed by any other city named by a route or ticket, in order of appearance."""
+    names = dict.fromkeys(cities)
+    for route in routes:
+        names.update(dict.fromkeys(route[:2]))
+    for ticket in tickets or ():
+        names.update(dict.fromkeys(ticket[:2]))
+    return tuple(names)
+
+
+def compile_map(version: str) -> str:
+    """Writes the text data of a version to a compact binary file next to it and returns its path."""
+    cities, routes, tickets = load_text_map(version)
+    # Routes and tickets may name cities that cities.txt does not list
+    names = list(get_node_names(cities, routes, tickets))
+    extra_cities = names[len(cities):]
+    city_ids = {city: index for index, city in enumerate(names)}
+    colors = sorted({color for route in routes for color in route[3]})
+    color_ids = {color: index for index, color in enumerate(colors)}
+    strings = '\n'.join(names + colors).encode('utf-8')
+
+    routes_array = array('i')
+    links_array = array('i')
+    for city1, city2, length, route_colors in routes:
+        routes_array.extend((city_ids[city1], city_ids[city2], length, len(route_colors)))
+        links_array.extend(color_ids[color] for color in route_colors)
+
+    tickets_array = array('i')
+    for city1, city2, value in tickets or ():
+        tickets_array.extend((city_ids[city1], city_ids[city2], value))
+
+    header = _HEADER.pack(MAGIC, FORMAT_VERSION, *source_stats(version), source_checksum(version),
+                          len(cities), len(extra_cities),
+                          len(routes), len(links_array), -1 if tickets is None else len(tickets), len(colors), len(strings))
+
+    file_path = get_compiled_path(version)
+    temp_path = file_path + '.tmp'
+    with open(temp_path, 'wb') as file:
+        file.write(header)
+        file.write(strings)
+        # Pad so the int32 arrays are aligned
+        file.write(b'\0' * (-(len(header) + len(strings)) % 4))
+        for int_array in (routes_array, links_array, tickets_array):
+            if sys.byteorder == 'big':
+                int_array.byteswap()
+            file.write(int_array.tobytes())
+    os.replace(temp_path, file_path)
+    return file_path
+
+
+def load_compiled_map(version: str) -> Optional[SourceMap]:
+    """Memory-maps the compiled file of a version.
+
+    Returns None when there is no compiled file, it is broken or it was built from different text files. The
+    text files are only hashed when their sizes or modification times differ from the ones recorded at compile
+    time.
+    """
+    file_path = get_compiled_path(version)
+    # The int arrays are read in place as native little-endian int32, and an empty file cannot be mapped
+    if sys.byteorder == 'big' or not os.path.exists(file_path) or os.path.getsize(file_path) == 0:
+        return None
+    try:
+        return _read_compiled_map(version, file_path)
+    except (ValueError, IndexError):
+        # A corrupted file, UnicodeDecodeError included
+        return None
+
+
+def _read_compiled_map(version: str, file_path: str) -> Optional[SourceMap]:
+    with open(file_path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+        if len(buffer) < _HEADER.size:
+            return None
+        magic, format_version, *header = _HEADER.unpack_from(buffer)
+        if magic != MAGIC or format_version != FORMAT_VERSION:
+            return None
+        stats, header = tuple(header[:2 * len(SOURCE_FILE_NAMES)]), header[2 * len(SOURCE_FILE_NAMES):]
+        checksum, cities_num, extra_cities_num, routes_num, links_num, tickets_num, colors_num, strings_size = header
+        if stats != source_stats(version) and checksum != source_checksum(version):
+            return None
+
+        offset = _HEADER.size
+        ints_offset = offset + strings_size + (-(_HEADER.size + strings_size) % 4)
+        ints_num = 4 * routes_num + links_num + 3 * max(tickets_num, 0)
+        if min(header[1:]) < -1 or len(buffer) < ints_offset + 4 * ints_num:
+            # Cut off after the header
+            return None
+        names = buffer[offset:offset + strings_size].decode('utf-8').split('\n')
+        cities = tuple(names[:cities_num])
+        colors = names[cities_num + extra_cities_num:cities_num + extra_cities_num + colors_num]
+
+        with memoryview(buffer) as view:
+            ints = view[ints_offset:ints_offset + 4 * ints_num].cast('i')
+            try:
+                routes_data = ints[:4 * routes_num].tolist()
+                links_data = ints[4 * routes_num:4 * routes_num + links_num].tolist()
+                tickets_start = 4 * routes_num + links_num
+                tickets_data = ints[tickets_start:tickets_start + 3 * max(tickets_num, 0)].tolist()
+            finally:
+                ints.release()
+
+    routes: List[Route] = []
+    link_id = 0
+    for route_id in range(routes_num):
+        city1, city2, length, route_links_num = routes_data[4 * route_id:4 * route_id + 4]
+        route_colors = tuple(colors[color_id] for color_id in links_data[link_id:link_id + route_links_num])
+        routes.append((names[city1], names[city2], length, route_colors))
+        link_id += route_links_num
+
+    tickets = None
+    if tickets_num >= 0:
+        tickets = tuple((names[tickets_data[i]], names[tickets_data[i + 1]], tickets_data[i + 2])
+                        for i in range(0, 3 * tickets_num, 3))
+
+    return cities, tuple(routes), tickets
@@ -0,0 +1,249 @@
+import atexit
+import collections
+import itertools
+import math
+import multiprocessing
+import random
+import threading
+import time
+from multiprocessing.connection import Connection
+from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING
+
+from game_logic.enums.decisions.actions import ActionDecision
+from game_logic.enums.game_states import GameState
+from game_logic.game_logger import configure_logging
+from game_logic.game_snapshot import GameSnapshot
+from game_logic.players.planned_player import PlannedPlayer
+from network.adapters.base_adapter import BaseAdapter
+
+if TYPE_CHECKING:
+    from game_logic.game import Game
+
+# A whole turn: ('claim', link_id, cards_color), ('cards', first TrainCardDecision id), ('tickets',) or ('skip',)
+Move = Tuple
+CLAIM = 'claim'
+CARDS = 'cards'
+TICKETS = 'tickets'
+SKIP = 'skip'
+
+# Per worker process, least recently used trees are dropped beyond this
+MAX_TREES = 64
+
+
+def get_legal_moves(game: 'Game', player_id: int) -> List[Move]:
+    legal_moves = game.legal_moves
+    moves: List[Move] = [(CLAIM, link_id, cards_color) for link_id in legal_moves.legal_links(player_id)
+                         for cards_color in legal_moves.color_options(player_id, link_id)]
+    if not game.ticket_deck.is_empty():
+        moves.append((TICKETS,))
+    train_card_mask = legal_moves.train_card_mask(first_card=True)
+    moves.extend((CARDS, train_card) for train_card, legal in enumerate(train_card_mask) if legal)
+    return moves or [(SKIP,)]
+
+
+def get_move_plan(game: 'Game', player_id: int, move: Move) -> Dict[str, Any]:
+    """The PlannedPlayer plan that plays the move. Claims use as few wild cards as possible."""
+    kind = move[0]
+    if kind == CLAIM:
+        _, link_id, cards_color = move
+        min_wild_cards, _ = game.legal_moves.wild_cards_range(player_id, link_id, cards_color)
+        return {'action': ActionDecision.CLAIM_ROUTE.value, 'route': link_id, 'cards_color': cards_color,
+                'wild_cards': min_wild_cards}
+    if kind == CARDS:
+        return {'action': ActionDecision.DRAW_CARDS.value, 'train_cards': [move[1]]}
+    if kind == TICKETS:
+        return {'action': ActionDecision.DRAW_TICKETS.value}
+    return {'action': ActionDecision.SKIP.value}
+
+
+class RolloutPlayerFactory:
+    """Creates the PlannedPlayers of the games that searches play out."""
+
+    def create_players(self, player_types: List[str], game_instance: 'Game',
+                       networks) -> Tuple[List[PlannedPlayer], BaseAdapter]:
+        adapter = BaseAdapter()
+        return [PlannedPlayer(index, game_instance, adapter) for index in range(len(player_types))], adapter
+
+
+class MCTSNode:
+    __slots__ = ('visits', 'wins', 'children')
+
+    def __init__(self) -> None:
+        self.visits = 0
+        self.wins = 0.0
+        self.children: Dict[Move, 'MCTSNode'] = {}
+
+
+class MCTSSearch:
+    """Open loop Monte Carlo tree search over the turns of one player.
+
+    Each iteration restores a snapshot determinized for the player into a private game, so the opponents' hands
+    and tickets are dealt anew from the cards and tickets it has not seen, walks down the tree choosing moves by
+    UCB1 among those legal in that determinization, while the opponents play random turns, expands one move
+    and plays the game out randomly. The reward is 1 for a win (ties included) and 0 otherwise.
+    """
+
+    def __init__(self, version: str, players_num: int, exploration: float = math.sqrt(2),
+                 max_rollout_moves: int = 1000) -> None:
+        # Imported here because the game imports the players, which import this module
+        from game_logic.game import Game
+        from game_logic.enums.player_types import PlayerType
+
+        self.game = Game([PlayerType.RANDOM.value] * players_num, version, player_factory=RolloutPlayerFactory())
+        self.exploration = exploration
+        self.max_rollout_moves = max_rollout_moves
+        self.root = MCTSNode()
+
+    def advance(self, move: Optional[Move]) -> None:
+        """Keeps the subtree of the move that was played, for the next search."""
+        self.root = self.root.children.get(move) or MCTSNode()
+
+    def run(self, snapshot: GameSnapshot, player_id: int, iterations: int = 0,
+            time_limit: float = 0.0, seed: int = 0) -> Tuple[Dict[Move, Tuple[int, float]], int]:
+        """Searches until iterations rollouts are done or time_limit seconds have passed, whichever is first.
+
+        Returns the visits and wins of every root move, and the number of rollouts.
+        """
+        if not iterations and not time_limit:
+            raise ValueError('A search needs a number of iterations or a time limit')
+        rng = random.Random(seed)
+        deadline = time.perf_counter() + time_limit
+        rollouts = 0
+        while True:
+            self.iterate(snapshot, player_id, rng)
+            rollouts += 1
+            if iterations and rollouts >= iterations:
+                break
+            if time_limit and time.perf_counter() >= deadline:
+                break
+        return {move: (child.visits, child.wins) for move, child in self.root.children.items()}, rollouts
+
+    def select(self, node: MCTSNode, moves: List[Move]) -> Move:
+        log_visits = math.log(node.visits or 1)
+
+        def ucb(move: Move) -> float:
+            child = node.children[move]
+            return child.wins / child.visits + self.exploration * math.sqrt(log_visits / child.visits)
+
+        return max(moves, key=ucb)
+
+    def play_move(self, player_id: int, move: Move) -> None:
+        game = self.game
+        game.players[player_id].plan = get_move_plan(game, player_id, move)
+        game.play_move()
+
+    def iterate(self, snapshot: GameSnapshot, player_id: int, rng: random.Random) -> None:
+        game = self.game
+        game.restore(snapshot.determinize(rng.getrandbits(32), player_id))
+        game.reseed(rng.getrandbits(63))
+        max_moves = snapshot.total_moves + self.max_rollout_moves
+
+        node = self.root
+        path = [node]
+        while game.game_state != GameState.FINISHED and game.total_moves <= max_moves:
+            if game.current_player_id != player_id:
+                game.play_move()
+                continue
+            moves = get_legal_moves(game, player_id)
+            untried = [move for move in moves if move not in node.children]
+            if untried:
+                move = rng.choice(untried)
+                node.children[move] = MCTSNode()
+            else:
+                move = self.select(node, moves)
+            node = node.children[move]
+            path.append(node)
+            self.play_move(player_id, move)
+            if untried:
+                break
+
+        scores = game.run(max_moves)
+        reward = 1.0 if scores[player_id] == max(scores) else 0.0
+        for node in path:
+            node.visits += 1
+            node.wins += reward
+
+
+def _search_worker(connection: Connection) -> None:
+    configure_logging(quiet=True)
+    searches: 'collections.OrderedDict[int, MCTSSearch]' = collections.OrderedDict()
+    while True:
+        request = connection.recv()
+        if request is None:
+            return
+        key, snapshot, player_id, last_move, iterations, time_limit, seed = request
+        search = searches.pop(key, None)
+        if search is None:
+            search = MCTSSearch(snapshot.version, snapshot.players_num)
+        else:
+            search.advance(last_move)
+        searches[key] = search
+        if len(searches) > MAX_TREES:
+            searches.popitem(last=False)
+        connection.send(search.run(snapshot, player_id, iterations, time_limit, seed))
+
+
+class SearchWorkers:
+    """Worker processes that each grow their own tree for a search and merge the root statistics.
+
+    Every worker keeps the trees of the players it searched for, by key, so trees are reused between turns.
+    """
+
+    def __init__(self, workers_num: int) -> None:
+        self.workers_num = workers_num
+        # One search at a time, players searching from several threads take turns
+        self.lock = threading.Lock()
+        self.connections: List[Connection] = []
+        self.processes: List[multiprocessing.Process] = []
+        for _ in range(workers_num):
+            connection, worker_connection = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=_search_worker, args=(worker_connection,), daemon=True)
+            process.start()
+            self.connections.append(connection)
+            self.processes.append(process)
+
+    def search(self, key: int, snapshot: GameSnapshot, player_id: int, last_move: Optional[Move],
+               iterations: int, time_limit: float, seed: int) -> Tuple[Dict[Move, Tuple[int, float]], int]:
+        with self.lock:
+            return self._search(key, snapshot, player_id, last_move, iterations, time_limit, seed)
+
+    def _search(self, key: int, snapshot: GameSnapshot, player_id: int, last_move: Optional[Move],
+                iterations: int, time_limit: float, seed: int) -> Tuple[Dict[Move, Tuple[int, float]], int]:
+        worker_iterations = -(-iterations // self.workers_num) if iterations else 0
+        for index, connection in enumerate(self.connections):
+            connection.send((key, snapshot, player_id, last_move, worker_iterations, time_limit, seed + index))
+
+        stats: Dict[Move, Tuple[int, float]] = {}
+        rollouts = 0
+        for connection in self.connections:
+            worker_stats, worker_rollouts = connection.recv()
+            for move, (visits, wins) in worker_stats.items():
+                total_visits, total_wins = stats.get(move, (0, 0.0))
+                stats[move] = (total_visits + visits, total_wins + wins)
+            rollouts += worker_rollouts
+        return stats, rollouts
+
+    def close(self) -> None:
+        for connection in self.connections:
+            connection.send(None)
+        for process in self.processes:
+            process.join()
+
+
+_search_keys = itertools.count()
+_search_workers: Dict[int, SearchWorkers] = {}
+_search_workers_lock = threading.Lock()
+
+
+def new_search_key() -> int:
+    return next(_search_keys)
+
+
+def get_search_workers(workers_num: int) -> SearchWorkers:
+    """Worker processes shared by every search of this process, started on first use."""
+    with _search_workers_lock:
+        workers = _search_workers.get(workers_num)
+        if workers is None:
+            workers = _search_workers[workers_num] = SearchWorkers(workers_num)
+            atexit.register(workers.close)
+        return workers
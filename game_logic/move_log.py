@@ -0,0 +1,110 @@
+import struct
+from array import array
+from typing import Iterable, List, Tuple
+
+MAGIC = b'TTRLOG'
+FORMAT_VERSION = 1
+_HEADER = struct.Struct('<6sH')
+
+
+def _write_varint(buffer: bytearray, value: int) -> None:
+    """LEB128, after zigzag mapping so that the occasional negative decision stays short."""
+    value = value << 1 if value >= 0 else (-value << 1) - 1
+    while value > 0x7f:
+        buffer.append(value & 0x7f | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def _read_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return (value >> 1) ^ -(value & 1), pos
+        shift += 7
+
+
+def _write_string(buffer: bytearray, value: str) -> None:
+    encoded = value.encode('utf-8')
+    _write_varint(buffer, len(encoded))
+    buffer += encoded
+
+
+def _read_string(data: bytes, pos: int) -> Tuple[str, int]:
+    size, pos = _read_varint(data, pos)
+    return data[pos:pos + size].decode('utf-8'), pos + size
+
+
+class MoveLog:
+    """The seed and every decision of one game, enough to replay it with game_logic.replay.
+
+    Decisions are recorded in the order the players make them: action, route, cards color, wild cards and
+    train card ids as they are, kept tickets as a bitmask of the dealt ticket positions.
+
+    Binary layout: MAGIC, format version (uint16), then varints: seed, version, players number, player types,
+    max_moves, and the decisions up to the end of the data. Strings are a varint length and UTF-8 bytes.
+    """
+
+    def __init__(self, seed: int, version: str, player_types: List[str], max_moves: int = 0,
+                 decisions: Iterable[int] = ()) -> None:
+        self.seed = seed
+        self.version = version
+        self.player_types = list(player_types)
+        self.max_moves = max_moves
+        self.decisions = array('q', decisions)
+
+    @classmethod
+    def record(cls, game) -> 'MoveLog':
+        """Starts recording the decisions of a game that has not started yet."""
+        move_log = cls(game.seed, game.version, game.player_types)
+        game.move_log = move_log
+        return move_log
+
+    def append(self, decision: int) -> None:
+        self.decisions.append(decision)
+
+    def to_bytes(self) -> bytes:
+        buffer = bytearray(_HEADER.pack(MAGIC, FORMAT_VERSION))
+        _write_varint(buffer, self.seed)
+        _write_string(buffer, self.version)
+        _write_varint(buffer, len(self.player_types))
+        for player_type in self.player_types:
+            _write_string(buffer, player_type)
+        _write_varint(buffer, self.max_moves)
+        for decision in self.decisions:
+            _write_varint(buffer, decision)
+        return bytes(buffer)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'MoveLog':
+        magic, format_version = _HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError('Not a move log')
+        if format_version != FORMAT_VERSION:
+            raise ValueError(f'Unsupported move log format version {format_version}')
+        pos = _HEADER.size
+        seed, pos = _read_varint(data, pos)
+        version, pos = _read_string(data, pos)
+        players_num, pos = _read_varint(data, pos)
+        player_types = []
+        for _ in range(players_num):
+            player_type, pos = _read_string(data, pos)
+            player_types.append(player_type)
+        max_moves, pos = _read_varint(data, pos)
+        decisions = array('q')
+        while pos < len(data):
+            decision, pos = _read_varint(data, pos)
+            decisions.append(decision)
+        return cls(seed, version, player_types, max_moves, decisions)
+
+    def save(self, file_path: str) -> None:
+        with open(file_path, 'wb') as file:
+            file.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, file_path: str) -> 'MoveLog':
+        with open(file_path, 'rb') as file:
+            return cls.from_bytes(file.read())
@@ -6,7 +6,9 @@ from game_logic.enums.player_types import PlayerType
 from game_logic.players.base_player import BasePlayer
 from game_logic.players.ai_player import AIPlayer
 from game_logic.players.human_player import HumanPlayer
+from game_logic.players.mcts_player import MCTSPlayer
 from game_logic.players.random_player import RandomPlayer
+from game_logic.players.remote_player import RemotePlayer
 
 from network.manager import load_network
 from network.adapters.base_adapter import BaseAdapter
@@ -38,12 +40,14 @@ class PlayerFactory:
         try:
             player_type = PlayerType(type_)
         except ValueError:
-            raise ValueError(f"Invalid player type {type_}. Choose from: Human, AI, Random")
+            raise ValueError(f"Invalid player type {type_}. Choose from: Human, AI, Random, MCTS, Remote")
 
         player_types = {
             PlayerType.AI: AIPlayer,
             PlayerType.HUMAN: HumanPlayer,
-            PlayerType.RANDOM: RandomPlayer
+            PlayerType.RANDOM: RandomPlayer,
+            PlayerType.MCTS: MCTSPlayer,
+            PlayerType.REMOTE: RemotePlayer
             }
 
         player_class = player_types.get(player_type)
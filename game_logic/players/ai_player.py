@@ -0,0 +1,89 @@
+from typing import Callable, Dict, List, Optional, Tuple, TYPE_CHECKING
+
+import numpy as np
+from neat.nn import FeedForwardNetwork
+
+from game_logic.enums.decisions.actions import ActionDecision
+from game_logic.enums.decisions.train_cards import TrainCardDecision
+from game_logic.players.base_player import BasePlayer
+from network.adapters.base_adapter import BaseAdapter
+
+if TYPE_CHECKING:
+    from game_logic.game import Game
+
+Evaluator = Callable[[FeedForwardNetwork, np.ndarray], np.ndarray]
+
+
+class AIPlayer(BasePlayer):
+    """Makes every decision from one evaluation of its network on the adapter state.
+
+    By default the network is activated on its own. Setting evaluator lets a caller route the
+    evaluation elsewhere, e.g. to an InferenceBatcher that evaluates many games at once.
+    """
+
+    def __init__(self, color_index: int, game_instance: 'Game', adapter: BaseAdapter,
+                 network: FeedForwardNetwork = None) -> None:
+        super().__init__(color_index, game_instance, adapter, network)
+        self.evaluator: Optional[Evaluator] = None
+        self.output_slices = self.get_output_slices(self.game_instance.config,
+                                                    self.game_instance.board.get_route_links_num())
+
+    @staticmethod
+    def get_output_slices(config, links_num: int) -> Dict[str, slice]:
+        sizes = (('action', len(ActionDecision)),
+                 ('train_card', len(TrainCardDecision)),
+                 ('route', links_num),
+                 ('cards_color', len(config.TRAIN_COLORS)),
+                 ('wild_cards', config.WILD_CARDS_NUM + 1),
+                 ('tickets', max(config.TICKETS_DEALT_NUM, config.INITIAL_TICKETS_DEALT_NUM)))
+        slices = {}
+        start = 0
+        for name, size in sizes:
+            slices[name] = slice(start, start + size)
+            start += size
+        return slices
+
+    @classmethod
+    def get_outputs_num(cls, config, links_num: int) -> int:
+        return max(output.stop for output in cls.get_output_slices(config, links_num).values())
+
+    def activate(self) -> np.ndarray:
+        state = self.adapter.get_state_array(self.player_id)
+        if self.evaluator is not None:
+            return self.evaluator(self.network, state)
+        return np.asarray(self.network.activate(state.tolist()))
+
+    def decide(self, output_name: str, mask=None) -> int:
+        """Argmax over the named outputs, restricted to the legal ones when a mask is given."""
+        values = self.activate()[self.output_slices[output_name]]
+        if mask is not None:
+            legal = np.asarray(mask, dtype=bool)
+            if legal.any():
+                values = np.where(legal, values, -np.inf)
+        return int(np.argmax(values))
+
+    def choose_tickets(self, min_keep: int, tickets: List[tuple]) -> Tuple[List[int], List[int]]:
+        values = self.activate()[self.output_slices['tickets']][:len(tickets)]
+        ranked = [int(index) for index in np.argsort(-values, kind='stable')]
+        keep_num = max(min(min_keep, len(tickets)), int(np.count_nonzero(values > 0.5)))
+        return ranked[:keep_num], ranked[keep_num:]
+
+    def decide_action(self) -> int:
+        return self.decide('action', self.game_instance.legal_moves.action_mask(self.player_id))
+
+    def decide_wild_cards(self) -> int:
+        min_wild, max_wild = self.game_instance.legal_moves.wild_cards_range(self.player_id, self.chosen_link_id,
+                                                                             self.chosen_cards_color)
+        mask = [min_wild <= wild_cards <= max_wild for wild_cards in range(self.game_instance.config.WILD_CARDS_NUM + 1)]
+        return self.decide('wild_cards', mask)
+
+    def decide_cards_color(self) -> int:
+        colors = self.game_instance.legal_moves.color_options(self.player_id, self.chosen_link_id)
+        mask = [color in colors for color in range(len(self.game_instance.config.TRAIN_COLORS))]
+        return self.decide('cards_color', mask)
+
+    def decide_train_card(self) -> int:
+        return self.decide('train_card', self.game_instance.legal_moves.train_card_mask(self.drawn_cards_num == 0))
+
+    def decide_route(self) -> int:
+        return self.decide('route', self.game_instance.legal_moves.route_mask(self.player_id))
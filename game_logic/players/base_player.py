@@ -1,10 +1,12 @@
-import collections
-from typing import List, Tuple, Dict, TYPE_CHECKING
+import random
+from typing import Generator, List, Optional, Tuple, TYPE_CHECKING
 
 from neat.nn import FeedForwardNetwork
 
 from game_logic.boards.player_board import PlayerBoard
+from game_logic.decision_request import DecisionRequest
 from game_logic.enums.decisions.actions import ActionDecision
+from game_logic.enums.decisions.decision_types import DecisionType
 from game_logic.enums.decisions.train_cards import TrainCardDecision
 from game_logic.enums.player_colors import PlayerColor
 from game_logic.game_logger import logger
@@ -13,6 +15,8 @@ from network.adapters.base_adapter import BaseAdapter
 if TYPE_CHECKING:
     from game_logic.game import Game
 
+Steps = Generator[DecisionRequest, int, bool]
+
 
 class BasePlayer:
     PLAYER_COLORS = list(PlayerColor)
@@ -21,9 +25,10 @@ class BasePlayer:
                  network: FeedForwardNetwork = None) -> None:
         self.player_id = color_index
         self.game_instance = game_instance
+        self.rng = random.Random(self.get_seed(game_instance.seed))
         self.color = self.PLAYER_COLORS[color_index]
         self.tickets = {}
-        self.hand = collections.defaultdict(int)
+        self.hand = [0] * self.game_instance.config.CARD_TYPES_NUM
         self.score = 0
         self.trains_remaining = self.game_instance.config.TRAIN_FIGURES_NUM
         self.longest_path = False
@@ -31,74 +36,111 @@ class BasePlayer:
         self.network = network
         self.adapter = adapter
 
+        # Context of the decision being made, for players that sample from the legal moves
+        self.chosen_link_id = None
+        self.chosen_cards_color = None
+        self.drawn_cards_num = 0
+        # The requests without arguments are the same for every turn
+        self.requests = {decision_type: DecisionRequest(self.player_id, decision_type)
+                         for decision_type in DecisionType}
+
         self.set_trains_num_adapter()
 
+    def get_seed(self, game_seed: int) -> str:
+        return f'{game_seed}:{self.player_id}'
+
+    def record_decision(self, decision: int) -> None:
+        if self.game_instance.move_log is not None:
+            self.game_instance.move_log.append(decision)
+
     def __str__(self) -> str:
         return str(self.color)
 
+    def make_decision(self, request: DecisionRequest) -> int:
+        """Answers a request of the turn generators with the decide_* callbacks."""
+        decision_type = request.decision_type
+        if decision_type is DecisionType.ACTION:
+            return self.decide_action()
+        elif decision_type is DecisionType.ROUTE:
+            return self.decide_route()
+        elif decision_type is DecisionType.CARDS_COLOR:
+            return self.decide_cards_color()
+        elif decision_type is DecisionType.WILD_CARDS:
+            return self.decide_wild_cards()
+        elif decision_type is DecisionType.TRAIN_CARD:
+            return self.decide_train_card()
+        kept, _ = self.choose_tickets(request.min_keep, list(request.tickets))
+        return sum(1 << index for index in set(kept) if 0 <= index < len(request.tickets))
+
     def play_turn(self) -> bool:
-        action_id = self.decide_action()
+        return self.game_instance.answer_requests(self.turn_steps())
+
+    def turn_steps(self) -> Steps:
+        """The turn as a generator of the decisions to make, returns whether the move was completed."""
+        action_id = yield self.requests[DecisionType.ACTION]
+        self.record_decision(action_id)
         action = ActionDecision(action_id)
-        logger.info(f'play_turn: {action}')
+        logger.info('play_turn: %s', action)
         if action == ActionDecision.CLAIM_ROUTE:
-            move_completed = self.claim_route()
+            move_completed = yield from self.claim_route_steps()
         elif action == ActionDecision.DRAW_TICKETS:
-            move_completed = self.draw_tickets(self.game_instance.config.TICKETS_DEALT_NUM,
-                                               self.game_instance.config.TICKETS_TO_KEEP_NUM)
+            move_completed = yield from self.draw_tickets_steps(self.game_instance.config.TICKETS_DEALT_NUM,
+                                                                self.game_instance.config.TICKETS_TO_KEEP_NUM)
         elif action == ActionDecision.DRAW_CARDS:
-            move_completed = self.draw_train_cards(self.game_instance.config.TRAIN_CARDS_DEALT_NUM)
+            move_completed = yield from self.draw_train_cards_steps(self.game_instance.config.TRAIN_CARDS_DEALT_NUM)
         elif action == ActionDecision.SKIP:
             move_completed = True
         else:
             raise Exception("Invalid action")
         if move_completed:
-            logger.warning(f'move_completed')
+            logger.warning('move_completed')
+        self.game_instance.stats.record_turn(self.player_id, action, move_completed)
         return move_completed
 
     def add_ticket(self, ticket: tuple) -> None:
         self.tickets[ticket] = False
         self.adapter.set_ticket_owner(self.player_id, ticket)
+        if self.player_board.add_ticket(ticket):
+            self.check_completed_tickets([ticket])
 
     def complete_ticket(self, ticket: tuple) -> None:
         if ticket not in self.tickets:
             raise ValueError(f'Ticket: {ticket} not found')
         self.tickets[ticket] = True
         self.adapter.set_ticket_completed(self.player_id, ticket)
-
-    def score_tickets(self) -> None:
-        for ticket, completed in self.tickets.items():
-            ticket_value = self.get_ticket_value(ticket)
-            if completed:
-                self.add_points(ticket_value)
-            else:
-                self.subtract_points(ticket_value)
+        self.game_instance.stats.count('tickets_completed', self.player_id)
 
     @staticmethod
     def get_ticket_value(ticket: tuple) -> int:
         return ticket[2]
 
-    def add_cards_to_hand(self, cards: str | List[str]) -> None:
-        logger.debug(f'add_cards_to_hand: {cards}')
-        if not cards:
+    def add_cards_to_hand(self, cards: Optional[int] | List[Optional[int]]) -> None:
+        logger.debug('add_cards_to_hand: %s', cards)
+        if cards is None:
             return
         if not isinstance(cards, list):
             cards = [cards]
         for card in cards:
+            if card is None:
+                continue
             self.hand[card] += 1
             self.set_cards_num_adapter(card)
+            self.game_instance.legal_moves.update_hand(self.player_id, card)
 
-    def remove_cards_from_hand(self, color: str, num_color: int) -> None:
-        if self.hand[color] < num_color:
+    def remove_cards_from_hand(self, card: int, num_cards: int) -> None:
+        if self.hand[card] < num_cards:
             raise ValueError('Not enough cards of the specified color')
-        self.hand[color] -= num_color
+        self.hand[card] -= num_cards
 
-        self.set_cards_num_adapter(color)
+        self.set_cards_num_adapter(card)
+        self.game_instance.legal_moves.update_hand(self.player_id, card)
 
     def play_num_trains(self, num_trains: int) -> None:
         if num_trains > self.trains_remaining:
             raise ValueError('Not enough train figures')
         self.trains_remaining -= num_trains
         self.set_trains_num_adapter()
+        self.game_instance.legal_moves.update_trains(self.player_id)
 
     def add_points(self, points_num: int) -> None:
         self.score += points_num
@@ -115,7 +157,7 @@ class BasePlayer:
     def get_score(self) -> int:
         return self.score
 
-    def get_hand(self) -> Dict[str, int]:
+    def get_hand(self) -> List[int]:
         return self.hand
 
     def get_color(self) -> str:
@@ -125,53 +167,66 @@ class BasePlayer:
         self.longest_path = True
 
     def draw_tickets(self, num_tickets: int, min_keep: int) -> bool:
+        return self.game_instance.answer_requests(self.draw_tickets_steps(num_tickets, min_keep))
+
+    def draw_tickets_steps(self, num_tickets: int, min_keep: int) -> Steps:
         tickets = self.game_instance.deal_tickets(num_tickets)
 
         if not tickets:
             logger.debug('no tickets')
             return False
 
-        kept, discarded = self.choose_tickets(min_keep, tickets)
+        kept_mask = yield DecisionRequest(self.player_id, DecisionType.TICKETS, tuple(tickets), min_keep)
+        self.record_decision(kept_mask)
 
         for index in range(len(tickets)):
-            if index in kept:
-                logger.info(f'{self} picks ticket {tickets[index]}')
+            if kept_mask >> index & 1:
+                logger.info('%s picks ticket %s', self, tickets[index])
                 self.add_ticket(tickets[index])
+                self.game_instance.stats.count('tickets_kept', self.player_id)
             else:
-                logger.info(f'{self} discards ticket {tickets[index]}')
+                logger.info('%s discards ticket %s', self, tickets[index])
                 self.game_instance.ticket_deck.insert(tickets[index])
 
         return True
 
     def draw_initial_train_cards(self, num_cards: int) -> bool:
-        logger.info(f'draw_initial_train_cards')
+        logger.info('draw_initial_train_cards')
         cards = [self.game_instance.deal_draw_pile_card() for _ in range(num_cards)]
         self.add_cards_to_hand(cards)
         return True
 
     def draw_train_cards(self, num_cards: int) -> bool:
-        logger.info(f'draw_train_cards {num_cards}')
+        return self.game_instance.answer_requests(self.draw_train_cards_steps(num_cards))
+
+    def draw_train_cards_steps(self, num_cards: int) -> Steps:
+        logger.info('draw_train_cards %s', num_cards)
         for i in range(num_cards):
-            train_card_decision_id = self.decide_train_card()
+            self.drawn_cards_num = i
+            train_card_decision_id = yield self.requests[DecisionType.TRAIN_CARD]
+            self.record_decision(train_card_decision_id)
             train_card_decision = TrainCardDecision(train_card_decision_id)
-            logger.info(f'train_card_decision: {train_card_decision}')
+            logger.info('train_card_decision: %s', train_card_decision)
 
             if train_card_decision == TrainCardDecision.DRAW_PILE:
                 train_card = self.game_instance.deal_draw_pile_card()
+                stats_counter = 'cards_from_draw_pile'
             elif train_card_decision in list(TrainCardDecision):
+                face_up_cards = self.game_instance.train_card_manager.get_face_up_cards()
+                wild_restricted = (self.game_instance.config.WILD_CARD_RESTRICTION and
+                                   face_up_cards[train_card_decision_id] == self.game_instance.config.WILD_CARD_ID)
+                if wild_restricted and i != 0:
+                    logger.info('a face up wild card can only be taken as the first card')
+                    return False
                 train_card = self.game_instance.deal_face_up_card(train_card_decision_id)
                 if train_card is None:
                     logger.info('no card in this position')
                     return False
-                elif train_card == 'wild':
-                    if self.game_instance.config.WILD_CARD_RESTRICTION:
-                        if i != 0:
-                            return False
-                        else:
-                            self.add_cards_to_hand(train_card)
-                            return True
-                    else:
-                        self.add_cards_to_hand(train_card)
+                elif wild_restricted:
+                    self.add_cards_to_hand(train_card)
+                    self.game_instance.stats.count('cards_from_face_up', self.player_id)
+                    return True
+                stats_counter = 'cards_from_face_up'
             else:
                 raise Exception('Invalid train card decision')
 
@@ -179,63 +234,103 @@ class BasePlayer:
                 return False
             else:
                 self.add_cards_to_hand(train_card)
+                self.game_instance.stats.count(stats_counter, self.player_id)
         return True
 
     def claim_route(self) -> bool:
-        route_link_id = self.decide_route()
+        return self.game_instance.answer_requests(self.claim_route_steps())
+
+    def claim_route_steps(self) -> Steps:
+        route_link_id = yield self.requests[DecisionType.ROUTE]
+        self.record_decision(route_link_id)
+        self.chosen_link_id = route_link_id
         city1, city2, route_data = self.game_instance.board.get_route_data(route_link_id)
-        logger.info(f'chosen route: {city1, city2, route_data}')
+        logger.info('chosen route: %s', (city1, city2, route_data))
 
         if not self.game_instance.board.validate_route(self.color, route_data):
             return False
 
-        cards_color = route_data['edge_color']
-        if cards_color == 'grey':
-            cards_color_id = self.decide_cards_color()
-            cards_color = self.game_instance.config.TRAIN_COLORS[cards_color_id]
+        config = self.game_instance.config
+        cards_color = self.game_instance.board.link_color_ids[route_link_id]
+        if cards_color == config.GREY_COLOR_ID:
+            cards_color = yield self.requests[DecisionType.CARDS_COLOR]
+            self.record_decision(cards_color)
+        self.chosen_cards_color = cards_color
 
         route_dist = route_data['weight']
         if route_dist > self.trains_remaining:
             logger.info('too few train figures!')
             return False
 
-        wild_cards_num_decision = self.decide_wild_cards()
-        wild_cards_used_num = min(wild_cards_num_decision, self.hand['wild'])
+        wild_cards_num_decision = yield self.requests[DecisionType.WILD_CARDS]
+        self.record_decision(wild_cards_num_decision)
+        wild_cards_used_num = min(wild_cards_num_decision, self.hand[config.WILD_CARD_ID], route_dist)
         color_cards_used_num = route_dist - wild_cards_used_num
 
-        logger.info(f'wild cards num: {wild_cards_used_num}')
+        logger.info('wild cards num: %s', wild_cards_used_num)
 
         if self.hand[cards_color] + wild_cards_used_num < route_dist:
             return False
 
         self.game_instance.board.claim_route(route_link_id, self.color)
+        self.game_instance.legal_moves.update_route(route_data['route_id'])
         self.remove_cards_from_hand(cards_color, color_cards_used_num)
-        self.remove_cards_from_hand('wild', wild_cards_used_num)
-        logger.debug(f'color_cards_used {color_cards_used_num}')
-        logger.debug(f'cards_color {cards_color}')
-        self.game_instance.train_card_manager.add_to_discard_pile([cards_color for _ in range(color_cards_used_num)])
-        self.game_instance.train_card_manager.add_to_discard_pile(['wild' for _ in range(wild_cards_used_num)])
+        self.remove_cards_from_hand(config.WILD_CARD_ID, wild_cards_used_num)
+        logger.debug('color_cards_used %s', color_cards_used_num)
+        logger.debug('cards_color %s', cards_color)
+        self.game_instance.train_card_manager.add_to_discard_pile(cards_color, color_cards_used_num)
+        self.game_instance.train_card_manager.add_to_discard_pile(config.WILD_CARD_ID, wild_cards_used_num)
         self.play_num_trains(route_dist)
         self.add_points(self.game_instance.get_route_value(route_dist))
-        self.player_board.add_edge(city1, city2, route_dist, cards_color)
-        self.check_completed_tickets()
+        self.game_instance.stats.count('routes_claimed', self.player_id)
+        self.game_instance.stats.count('trains_played', self.player_id, route_dist)
+        completed_tickets = self.player_board.add_edge(city1, city2, route_dist, config.TRAIN_COLORS[cards_color])
+        self.check_completed_tickets(completed_tickets)
 
         self.adapter.set_trains_num(self.player_id, self.trains_remaining)
         self.adapter.set_route_owner(self.player_id, route_link_id)
 
         return True
 
-    def check_completed_tickets(self) -> None:
-        for ticket, completed in self.tickets.items():
-            if not completed and self.player_board.is_ticket_completed(ticket):
-                logger.info('TICKET_COMPLETED!')
-                self.complete_ticket(ticket)
+    def restore(self, hand: List[int], trains_remaining: int, score: int, tickets: List[Tuple[tuple, bool]],
+                longest_path: bool) -> None:
+        """Resets the player to a snapshot. The board must already be restored, the routes and the completed tickets
+        are read from it."""
+        board = self.game_instance.board
+        self.hand = list(hand)
+        self.trains_remaining = trains_remaining
+        self.score = score
+        self.longest_path = longest_path
+
+        self.player_board = PlayerBoard(self)
+        for link_id, owner in enumerate(board.link_owners):
+            if owner is self.color:
+                city1, city2 = board.link_cities[link_id]
+                self.player_board.add_edge(city1, city2, board.link_lengths[link_id], board.link_colors[link_id])
+                self.adapter.set_route_owner(self.player_id, link_id)
+
+        self.tickets = {}
+        for ticket, _ in tickets:
+            completed = self.player_board.add_ticket(ticket)
+            self.tickets[ticket] = completed
+            self.adapter.set_ticket_owner(self.player_id, ticket)
+            if completed:
+                self.adapter.set_ticket_completed(self.player_id, ticket)
+
+        self.set_trains_num_adapter()
+        for card in range(len(self.hand)):
+            self.set_cards_num_adapter(card)
+
+    def check_completed_tickets(self, tickets: List[tuple]) -> None:
+        for ticket in tickets:
+            logger.info('TICKET_COMPLETED!')
+            self.complete_ticket(ticket)
 
     def set_trains_num_adapter(self):
         self.adapter.set_trains_num(self.player_id, self.trains_remaining)
 
-    def set_cards_num_adapter(self, card):
-        if card == 'wild':
+    def set_cards_num_adapter(self, card: int):
+        if card == self.game_instance.config.WILD_CARD_ID:
             self.adapter.set_wild_cards_num(self.player_id, self.hand[card])
         else:
             self.adapter.set_color_cards_num(self.player_id, card, self.hand[card])
@@ -44,7 +44,7 @@ class HumanPlayer(BasePlayer):
 
     def decide_cards_color(self) -> int:
         while True:
-            print(self.hand)
+            self.print_hand()
             train_color = input("Which train color do you wish to use to claim a route: ")
             if train_color in self.game_instance.config.TRAIN_COLORS:
                 return self.game_instance.config.TRAIN_COLORS.index(train_color)
@@ -56,7 +56,7 @@ class HumanPlayer(BasePlayer):
         while True:
             print("Choose an action:")
             for i, card in enumerate(face_up_cards):
-                print(f"[{i + 1}] Choose revealed card: {card}")
+                print(f"[{i + 1}] Choose revealed card: {self.game_instance.train_card_manager.get_card_name(card)}")
             print("[6] Draw a card from the deck")
             self.print_state_instructions()
             chosen_train_card = input("Enter the index of the train card you want to take: ")
@@ -82,8 +82,8 @@ class HumanPlayer(BasePlayer):
 
     def print_hand(self):
         print(f'{self} hand')
-        for k, v in self.hand.items():
-            print(f'{k}: {v}')
+        for card, num in enumerate(self.hand):
+            print(f'{self.game_instance.train_card_manager.get_card_name(card)}: {num}')
 
     def print_tickets(self):
         print(f'{self} tickets')
@@ -0,0 +1,97 @@
+import multiprocessing
+import time
+from typing import List, Optional, Tuple, TYPE_CHECKING
+
+from neat.nn import FeedForwardNetwork
+
+from game_logic.game_logger import logger
+from game_logic.mcts_search import MCTSSearch, Move, get_legal_moves, get_move_plan, get_search_workers, \
+    new_search_key
+from game_logic.players.planned_player import PlannedPlayer
+from network.adapters.base_adapter import BaseAdapter
+
+if TYPE_CHECKING:
+    from game_logic.game import Game
+
+
+class MCTSPlayer(PlannedPlayer):
+    """Chooses each turn with a Monte Carlo tree search over whole turns, played out by random players.
+
+    The budget of a decision is iterations rollouts or time_limit seconds, whichever runs out first (0 turns
+    either off). With several workers, see WORKERS_NUM, the rollouts run in worker processes that each grow their
+    own tree and their root statistics are merged. Trees are kept between turns: the next search starts from the
+    subtree of the move that was played.
+    """
+    ITERATIONS = 200
+    TIME_LIMIT = 0.0
+    # Search processes started on the first search, raise it or workers_num to search in parallel
+    WORKERS_NUM = 1
+
+    def __init__(self, color_index: int, game_instance: 'Game', adapter: BaseAdapter,
+                 network: FeedForwardNetwork = None) -> None:
+        super().__init__(color_index, game_instance, adapter, network)
+        self.iterations = self.ITERATIONS
+        self.time_limit = self.TIME_LIMIT
+        self.workers_num = self.WORKERS_NUM
+
+        self.search: Optional[MCTSSearch] = None
+        self.search_key = new_search_key()
+        self.last_move: Optional[Move] = None
+
+        self.decisions_num = 0
+        self.rollouts_num = 0
+        self.search_time = 0.0
+
+    @property
+    def rollouts_per_sec(self) -> float:
+        return self.rollouts_num / self.search_time if self.search_time else 0.0
+
+    def choose_tickets(self, min_keep: int, tickets: List[tuple]) -> Tuple[List[int], List[int]]:
+        """Keeps the min_keep tickets closest to completion, the ones worth less first on a tie."""
+        ticket_hints = self.game_instance.ticket_hints
+        ranked = sorted(range(len(tickets)),
+                        key=lambda index: (ticket_hints.remaining_trains(self.player_id, tickets[index]),
+                                           self.get_ticket_value(tickets[index])))
+        keep_num = min(min_keep, len(tickets))
+        return ranked[:keep_num], ranked[keep_num:]
+
+    def decide_action(self) -> int:
+        self.plan = get_move_plan(self.game_instance, self.player_id, self.choose_move())
+        return super().decide_action()
+
+    def choose_move(self) -> Move:
+        moves = get_legal_moves(self.game_instance, self.player_id)
+        if len(moves) == 1:
+            move = moves[0]
+        else:
+            start = time.perf_counter()
+            stats, rollouts = self.run_search()
+            duration = time.perf_counter() - start
+            self.decisions_num += 1
+            self.rollouts_num += rollouts
+            self.search_time += duration
+            logger.info('%s searched %s rollouts in %.3fs (%.0f rollouts/sec)', self, rollouts, duration,
+                        rollouts / duration if duration else 0.0)
+
+            visited = [move for move in moves if move in stats]
+            if visited:
+                move = max(visited, key=lambda legal_move: stats[legal_move][0])
+            else:
+                move = self.rng.choice(moves)
+        self.last_move = move
+        return move
+
+    def run_search(self):
+        snapshot = self.game_instance.snapshot()
+        seed = self.rng.getrandbits(32)
+        # Worker processes of a process pool are daemons, which cannot start processes of their own
+        if self.workers_num > 1 and not multiprocessing.current_process().daemon:
+            workers = get_search_workers(self.workers_num)
+            return workers.search(self.search_key, snapshot, self.player_id, self.last_move, self.iterations,
+                                  self.time_limit, seed)
+
+        if self.search is None:
+            self.search = MCTSSearch(self.game_instance.version, self.game_instance.players_num)
+        else:
+            self.search.advance(self.last_move)
+        return self.search.run(snapshot, self.player_id, self.iterations, self.time_limit, seed)
@@ -0,0 +1,38 @@
+from typing import Any, Dict
+
+from game_logic.players.random_player import RandomPlayer
+
+
+class PlannedPlayer(RandomPlayer):
+    """Makes the decisions given in plan for its next turn, and plays like a RandomPlayer for the rest.
+
+    A plan maps decision names to decisions: 'action', 'route', 'cards_color' and 'wild_cards' to ids,
+    'train_cards' to a list of TrainCardDecision ids. It is taken when the turn starts, so decisions the turn
+    does not need are dropped with it.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.plan: Dict[str, Any] = {}
+        self.turn_plan: Dict[str, Any] = {}
+
+    def decide_action(self) -> int:
+        self.turn_plan, self.plan = self.plan, {}
+        action = self.turn_plan.pop('action', None)
+        return super().decide_action() if action is None else action
+
+    def decide_route(self) -> int:
+        route = self.turn_plan.pop('route', None)
+        return super().decide_route() if route is None else route
+
+    def decide_cards_color(self) -> int:
+        cards_color = self.turn_plan.pop('cards_color', None)
+        return super().decide_cards_color() if cards_color is None else cards_color
+
+    def decide_wild_cards(self) -> int:
+        wild_cards = self.turn_plan.pop('wild_cards', None)
+        return super().decide_wild_cards() if wild_cards is None else wild_cards
+
+    def decide_train_card(self) -> int:
+        train_cards = self.turn_plan.get('train_cards')
+        return train_cards.pop(0) if train_cards else super().decide_train_card()
@@ -1,33 +1,47 @@
-import random
 from typing import Tuple, List
 
-from game_logic.enums.decisions.actions import ActionDecision
 from game_logic.enums.decisions.train_cards import TrainCardDecision
 from game_logic.players.base_player import BasePlayer
 
 
 class RandomPlayer(BasePlayer):
+    """Picks uniformly among the legal moves, falling back to any move when nothing is legal."""
+
     def choose_tickets(self, min_keep: int, tickets: List[tuple]) -> Tuple[List[int], List[int]]:
         tickets_num = len(tickets)
         ticket_ids = list(range(tickets_num))
-        random.shuffle(ticket_ids)
+        self.rng.shuffle(ticket_ids)
         min_keep = min(min_keep, tickets_num)
-        keep_num = random.randint(min_keep, tickets_num)
+        keep_num = self.rng.randint(min_keep, tickets_num)
         keep_ids = ticket_ids[:keep_num]
         discard_ids = ticket_ids[keep_num:]
         return keep_ids, discard_ids
 
     def decide_action(self) -> int:
-        return random.randrange(0, len(list(ActionDecision)))
+        return self.rng.choice(self.game_instance.legal_moves.legal_actions(self.player_id))
 
     def decide_wild_cards(self) -> int:
-        return random.randint(0, self.game_instance.config.WILD_CARDS_NUM)
+        min_wild, max_wild = self.game_instance.legal_moves.wild_cards_range(self.player_id, self.chosen_link_id,
+                                                                             self.chosen_cards_color)
+        if min_wild > max_wild:
+            return self.rng.randint(0, self.game_instance.config.WILD_CARDS_NUM)
+        return self.rng.randint(min_wild, max_wild)
 
     def decide_cards_color(self) -> int:
-        return random.randrange(0, len(self.game_instance.config.TRAIN_COLORS))
+        colors = self.game_instance.legal_moves.color_options(self.player_id, self.chosen_link_id)
+        if not colors:
+            return self.rng.randrange(0, len(self.game_instance.config.TRAIN_COLORS))
+        return self.rng.choice(colors)
 
     def decide_train_card(self) -> int:
-        return random.randrange(0, len(list(TrainCardDecision)))
+        mask = self.game_instance.legal_moves.train_card_mask(first_card=self.drawn_cards_num == 0)
+        train_cards = [train_card for train_card, legal in enumerate(mask) if legal]
+        if not train_cards:
+            return self.rng.randrange(0, len(list(TrainCardDecision)))
+        return self.rng.choice(train_cards)
 
     def decide_route(self) -> int:
-        return random.randrange(0, self.game_instance.board.get_route_links_num())
+        links = self.game_instance.legal_moves.legal_links(self.player_id)
+        if not links:
+            return self.rng.randrange(0, self.game_instance.board.get_route_links_num())
+        return self.rng.choice(links)
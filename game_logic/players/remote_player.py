@@ -0,0 +1,10 @@
+from game_logic.decision_request import DecisionRequest
+from game_logic.players.base_player import BasePlayer
+
+
+class RemotePlayer(BasePlayer):
+    """A seat played by a client of the GameServer. The server answers its requests with the client's moves, so
+    it cannot play through Game.play."""
+
+    def make_decision(self, request: DecisionRequest) -> int:
+        raise RuntimeError(f'{self} is played remotely, its decisions come from the game server')
@@ -0,0 +1,43 @@
+from typing import Iterator, List, Tuple, TYPE_CHECKING
+
+from game_logic.players.base_player import BasePlayer
+from network.adapters.base_adapter import BaseAdapter
+
+if TYPE_CHECKING:
+    from game_logic.game import Game
+
+
+class ReplayPlayer(BasePlayer):
+    """Makes the decisions of a recorded game, read from an iterator shared by all players of the game."""
+
+    def __init__(self, color_index: int, game_instance: 'Game', adapter: BaseAdapter,
+                 decisions: Iterator[int]) -> None:
+        super().__init__(color_index, game_instance, adapter)
+        self.decisions = decisions
+
+    def next_decision(self) -> int:
+        try:
+            return next(self.decisions)
+        except StopIteration:
+            raise ValueError('The move log ended before the game did') from None
+
+    def choose_tickets(self, min_keep: int, tickets: List[tuple]) -> Tuple[List[int], List[int]]:
+        kept_mask = self.next_decision()
+        kept = [index for index in range(len(tickets)) if kept_mask >> index & 1]
+        discarded = [index for index in range(len(tickets)) if not kept_mask >> index & 1]
+        return kept, discarded
+
+    def decide_action(self) -> int:
+        return self.next_decision()
+
+    def decide_route(self) -> int:
+        return self.next_decision()
+
+    def decide_cards_color(self) -> int:
+        return self.next_decision()
+
+    def decide_wild_cards(self) -> int:
+        return self.next_decision()
+
+    def decide_train_card(self) -> int:
+        return self.next_decision()
@@ -0,0 +1,135 @@
+import functools
+import inspect
+import time
+from typing import Callable, Dict, Iterable, List, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from game_logic.game import Game
+
+# phase -> (objects of the game, names of their methods to time)
+_TARGETS: Tuple[Tuple[str, Callable[['Game'], Iterable[object]], Tuple[str, ...]], ...] = (
+    ('game', lambda game: [game], ('setup', 'play_move', 'finish')),
+    ('decision', lambda game: game.players, ('decide_action', 'decide_route', 'decide_cards_color',
+                                             'decide_wild_cards', 'decide_train_card', 'choose_tickets')),
+    ('turn', lambda game: game.players, ('play_turn',)),
+    ('claim_route', lambda game: game.players, ('claim_route_steps', 'check_completed_tickets')),
+    ('train_cards', lambda game: game.players, ('draw_train_cards_steps', 'add_cards_to_hand',
+                                                'remove_cards_from_hand')),
+    ('tickets', lambda game: game.players, ('draw_tickets_steps', 'add_ticket')),
+    ('board', lambda game: [game.board], ('validate_route', 'get_route_data', 'get_route_owners', 'claim_route')),
+    ('train_cards', lambda game: [game.train_card_manager], ('pick_face_up_card', 'pick_draw_pile_card',
+                                                             'fill_face_up', 'fill_draw_pile',
+                                                             'add_to_discard_pile')),
+    ('tickets', lambda game: [game.ticket_deck], ('insert', 'remove')),
+    ('legal_moves', lambda game: [game.legal_moves], ('update_hand', 'update_route', 'update_trains',
+                                                      'action_mask', 'train_card_mask', 'legal_links')),
+    ('adapter', lambda game: [game.adapter], ('set_face_up_card', 'set_draw_pile_num', 'set_discard_pile_num',
+                                              'set_ticket_pile_num', 'set_trains_num', 'set_route_owner',
+                                              'set_wild_cards_num', 'set_color_cards_num', 'set_ticket_owner',
+                                              'set_ticket_completed', 'get_state_array')),
+)
+
+
+class Profiler:
+    """Opt-in timers around the hot methods of games.
+
+    attach(game) shadows the methods listed in _TARGETS with timed wrappers on that game's own objects, so
+    games without a profiler run the plain methods and pay nothing. Each timer counts calls, inclusive time
+    and self time (without the time of the timed methods it called). The turn generators are timed while they
+    run, not while they wait for an answer. Timers of several games, or of several processes through merge,
+    add up.
+    """
+
+    def __init__(self) -> None:
+        # timer name -> [phase, calls, total seconds, self seconds]
+        self.timers: Dict[str, list] = {}
+        self._stack: List[float] = []
+
+    def attach(self, game: 'Game') -> None:
+        for phase, get_objects, method_names in _TARGETS:
+            for obj in get_objects(game):
+                for method_name in method_names:
+                    method = getattr(obj, method_name, None)
+                    if method is not None:
+                        name = f'{type(obj).__name__}.{method_name}'
+                        setattr(obj, method_name, self._wrap(method, name, phase))
+
+    def _wrap(self, method: Callable, name: str, phase: str) -> Callable:
+        timer = self.timers.setdefault(name, [phase, 0, 0.0, 0.0])
+        stack = self._stack
+        perf_counter = time.perf_counter
+
+        if inspect.isgeneratorfunction(method):
+            @functools.wraps(method)
+            def timed_steps(*args, **kwargs):
+                steps = method(*args, **kwargs)
+                answer = None
+                elapsed = children = 0.0
+                while True:
+                    stack.append(0.0)
+                    start = perf_counter()
+                    try:
+                        request = steps.send(answer)
+                    except StopIteration as stop:
+                        result = stop.value
+                        break
+                    finally:
+                        resume_elapsed = perf_counter() - start
+                        elapsed += resume_elapsed
+                        children += stack.pop()
+                        if stack:
+                            stack[-1] += resume_elapsed
+                    answer = yield request
+                timer[1] += 1
+                timer[2] += elapsed
+                timer[3] += elapsed - children
+                return result
+
+            return timed_steps
+
+        @functools.wraps(method)
+        def timed(*args, **kwargs):
+            stack.append(0.0)
+            start = perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                elapsed = perf_counter() - start
+                children = stack.pop()
+                timer[1] += 1
+                timer[2] += elapsed
+                timer[3] += elapsed - children
+                if stack:
+                    stack[-1] += elapsed
+
+        return timed
+
+    def merge(self, timers: Dict[str, list]) -> None:
+        for name, (phase, calls, total, self_time) in timers.items():
+            timer = self.timers.setdefault(name, [phase, 0, 0.0, 0.0])
+            timer[1] += calls
+            timer[2] += total
+            timer[3] += self_time
+
+    def get_phase_times(self) -> Dict[str, float]:
+        """Self time per phase, the phases add up to the whole instrumented time."""
+        phases: Dict[str, float] = {}
+        for phase, _, _, self_time in self.timers.values():
+            phases[phase] = phases.get(phase, 0.0) + self_time
+        return phases
+
+    def report(self) -> str:
+        total = sum(timer[3] for timer in self.timers.values()) or 1.0
+        lines = [f'{"phase":<12} {"timer":<40} {"calls":>10} {"total ms":>10} {"self ms":>10} {"self %":>7} '
+                 f'{"us/call":>8}']
+        for name, (phase, calls, total_time, self_time) in sorted(self.timers.items(),
+                                                                 key=lambda item: -item[1][3]):
+            if not calls:
+                continue
+            lines.append(f'{phase:<12} {name:<40} {calls:>10} {total_time * 1000:>10.1f} {self_time * 1000:>10.1f} '
+                         f'{self_time / total * 100:>6.1f}% {total_time / calls * 1e6:>8.1f}')
+        lines.append('')
+        lines.append(f'{"phase":<12} {"self ms":>10} {"self %":>7}')
+        for phase, self_time in sorted(self.get_phase_times().items(), key=lambda item: -item[1]):
+            lines.append(f'{phase:<12} {self_time * 1000:>10.1f} {self_time / total * 100:>6.1f}%')
+        return '\n'.join(lines)
@@ -0,0 +1,45 @@
+from typing import Iterator, List, Tuple
+
+from game_logic.enums.game_states import GameState
+from game_logic.game import Game
+from game_logic.move_log import MoveLog
+from game_logic.players.replay_player import ReplayPlayer
+from network.adapters.base_adapter import BaseAdapter
+
+
+class ReplayPlayerFactory:
+    """Replaces every player of a recorded game with a ReplayPlayer.
+
+    The players of the log never run: no networks are loaded, no searches run and the cheap BaseAdapter is
+    used, which is what makes a replay faster than the live game.
+    """
+
+    def __init__(self, decisions: Iterator[int]) -> None:
+        self.decisions = decisions
+
+    def create_players(self, player_types: List[str], game_instance: Game,
+                       networks) -> Tuple[List[ReplayPlayer], BaseAdapter]:
+        adapter = BaseAdapter()
+        players = [ReplayPlayer(index, game_instance, adapter, self.decisions) for index in range(len(player_types))]
+        return players, adapter
+
+
+def replay_game(move_log: MoveLog, moves_num: int = None) -> Game:
+    """Re-runs a recorded game from its seed and decisions.
+
+    With moves_num the replay stops before that many moves have been played and the game is returned
+    unfinished, e.g. to inspect or snapshot the state that precedes a slow or buggy move.
+    """
+    game = Game(move_log.player_types, move_log.version, seed=move_log.seed,
+                player_factory=ReplayPlayerFactory(iter(move_log.decisions)))
+    if moves_num is None:
+        game.play(move_log.max_moves)
+        return game
+
+    game.setup()
+    max_moves = move_log.max_moves
+    while game.game_state != GameState.FINISHED and game.total_moves < moves_num:
+        if max_moves and game.total_moves > max_moves:
+            break
+        game.play_move()
+    return game
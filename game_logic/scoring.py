@@ -0,0 +1,119 @@
+import functools
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+from game_logic.boards.longest_trail import LongestTrailEngine
+from game_logic.map_cache import get_map_data
+
+
+@dataclass(frozen=True)
+class ScoringTables:
+    """Map data of one version in the integer form end scoring works on. Shared by every game in the process."""
+    nodes_num: int
+    # link_id -> (city index, city index, length)
+    links: Tuple[Tuple[int, int, int], ...]
+    # ticket_id -> (city index, city index, value)
+    tickets: Tuple[Tuple[int, int, int], ...]
+
+
+@functools.lru_cache(maxsize=None)
+def get_scoring_tables(version: str) -> ScoringTables:
+    map_data = get_map_data(version)
+    city_index = map_data.city_index
+    return ScoringTables(
+        nodes_num=len(map_data.nodes),
+        links=tuple((city_index[city1], city_index[city2], length)
+                    for (city1, city2), length in zip(map_data.link_cities, map_data.link_lengths)),
+        tickets=tuple((city_index[city1], city_index[city2], value)
+                      for city1, city2, value in map_data.tickets or ()))
+
+
+@dataclass(frozen=True)
+class FinalScores:
+    """Per player results of a game, indexed by player id."""
+    scores: Tuple[int, ...]
+    tickets_completed: Tuple[int, ...]
+    longest_paths: Tuple[int, ...]
+    # Players awarded the longest path bonus
+    longest_path_players: Tuple[int, ...]
+    # Player ids from the winner down: score, then completed tickets, then the longest path bonus break ties
+    ranking: Tuple[int, ...]
+
+    @property
+    def winner(self) -> int:
+        return self.ranking[0]
+
+
+def score_game(tables: ScoringTables, link_owners: Sequence[int], tickets: Sequence[Sequence[int]],
+               scores: Sequence[int], longest_path_bonus: Optional[int]) -> FinalScores:
+    """Scores the end of a game for all players at once.
+
+    link_owners holds the player id of every link (-1 when free) and tickets the ticket ids of every player,
+    as in a GameSnapshot. scores are the route points so far. One union-find over (player, city) pairs, built
+    in a single walk over link_owners, answers every ticket and splits each network into the components the
+    longest trail is searched in. Without a longest_path_bonus the trails are not searched.
+    """
+    players_num = len(scores)
+    nodes_num = tables.nodes_num
+    parent = list(range(players_num * nodes_num))
+
+    def find(node: int) -> int:
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    player_edges: List[List[Tuple[int, int, int]]] = [[] for _ in range(players_num)]
+    links = tables.links
+    for link_id, owner in enumerate(link_owners):
+        if owner < 0:
+            continue
+        edge = links[link_id]
+        player_edges[owner].append(edge)
+        offset = owner * nodes_num
+        root1, root2 = find(offset + edge[0]), find(offset + edge[1])
+        if root1 != root2:
+            parent[root1] = root2
+
+    final_scores = list(scores)
+    tickets_completed = [0] * players_num
+    for player_id, ticket_ids in enumerate(tickets):
+        offset = player_id * nodes_num
+        for ticket_id in ticket_ids:
+            city1, city2, value = tables.tickets[ticket_id]
+            if find(offset + city1) == find(offset + city2):
+                final_scores[player_id] += value
+                tickets_completed[player_id] += 1
+            else:
+                final_scores[player_id] -= value
+
+    longest_paths = [0] * players_num
+    longest_path_players = ()
+    if longest_path_bonus is not None:
+        for player_id, edges in enumerate(player_edges):
+            components = {}
+            for edge in edges:
+                components.setdefault(find(player_id * nodes_num + edge[0]), []).append(edge)
+            # A trail is at most as long as its component, so once one is found the shorter components are skipped
+            longest = 0
+            for total, component in sorted(((sum(edge[2] for edge in component), component)
+                                            for component in components.values()),
+                                           key=lambda item: item[0], reverse=True):
+                if total <= longest:
+                    break
+                longest = max(longest, LongestTrailEngine.component_longest_trail(component))
+            longest_paths[player_id] = longest
+        best = max(longest_paths)
+        longest_path_players = tuple(player_id for player_id, value in enumerate(longest_paths) if value == best)
+        for player_id in longest_path_players:
+            final_scores[player_id] += longest_path_bonus
+
+    has_bonus = [player_id in longest_path_players for player_id in range(players_num)]
+    ranking = sorted(range(players_num),
+                     key=lambda player_id: (final_scores[player_id], tickets_completed[player_id], has_bonus[player_id]),
+                     reverse=True)
+    return FinalScores(scores=tuple(final_scores),
+                       tickets_completed=tuple(tickets_completed),
+                       longest_paths=tuple(longest_paths),
+                       longest_path_players=longest_path_players,
+                       ranking=tuple(ranking))
@@ -0,0 +1,187 @@
+import os
+import struct
+import sys
+from array import array
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, TYPE_CHECKING
+
+from game_logic.enums.player_types import PlayerType
+from game_logic.game_stats import GameStats
+
+if TYPE_CHECKING:
+    from game_logic.game import Game
+
+MAGIC = b'TTRTLM'
+FORMAT_VERSION = 1
+_FILE_HEADER = struct.Struct('<6sHH')
+_COLUMN_HEADER = struct.Struct('<Bc')
+_ROW_GROUP_HEADER = struct.Struct('<I')
+_CHUNK_HEADER = struct.Struct('<I')
+
+# One row per player of every game. 'q' columns are int64, 'd' columns float64.
+GAME_TELEMETRY_SCHEMA: Tuple[Tuple[str, str], ...] = (
+    ('game', 'q'), ('seed', 'q'), ('players_num', 'q'), ('player_id', 'q'), ('player_type', 'q'),
+    ('score', 'q'), ('winner', 'q'), ('longest_path', 'q'), ('total_moves', 'q'),
+    *((name, 'q') for name in GameStats.COUNTERS),
+    *((f'{phase}_time', 'd') for phase in GameStats.PHASES),
+)
+PLAYER_TYPE_CODES = {player_type.value: code for code, player_type in enumerate(PlayerType)}
+
+
+def get_game_rows(game: 'Game', game_index: int) -> List[Tuple]:
+    """The GAME_TELEMETRY_SCHEMA rows of a finished game."""
+    stats = game.stats
+    timings = [stats.timings[phase] for phase in GameStats.PHASES]
+    rows = []
+    for player in game.players:
+        player_id = player.player_id
+        rows.append((game_index, game.seed, game.players_num, player_id,
+                     PLAYER_TYPE_CODES.get(game.player_types[player_id], -1), player.score,
+                     int(player is game.winner), int(player.longest_path), game.total_moves,
+                     *(stats.counters[name][player_id] for name in GameStats.COUNTERS), *timings))
+    return rows
+
+
+def _read_schema(file) -> Tuple[Tuple[str, str], ...]:
+    magic, format_version, columns_num = _FILE_HEADER.unpack(file.read(_FILE_HEADER.size))
+    if magic != MAGIC:
+        raise ValueError('Not a telemetry file')
+    if format_version != FORMAT_VERSION:
+        raise ValueError(f'Unsupported telemetry format version {format_version}')
+    schema = []
+    for _ in range(columns_num):
+        name_size, typecode = _COLUMN_HEADER.unpack(file.read(_COLUMN_HEADER.size))
+        schema.append((file.read(name_size).decode('utf-8'), typecode.decode('ascii')))
+    return tuple(schema)
+
+
+def _find_complete_end(file, schema: Sequence[Tuple[str, str]]) -> int:
+    """Offset just past the last complete row group, file positioned after the schema."""
+    file_size = os.fstat(file.fileno()).st_size
+    end = file.tell()
+    while True:
+        header = file.read(_ROW_GROUP_HEADER.size)
+        if len(header) < _ROW_GROUP_HEADER.size:
+            return end
+        rows_num, = _ROW_GROUP_HEADER.unpack(header)
+        for _, typecode in schema:
+            chunk_header = file.read(_CHUNK_HEADER.size)
+            if len(chunk_header) < _CHUNK_HEADER.size:
+                return end
+            size, = _CHUNK_HEADER.unpack(chunk_header)
+            if size != rows_num * array(typecode).itemsize or file.tell() + size > file_size:
+                return end
+            file.seek(size, os.SEEK_CUR)
+        end = file.tell()
+
+
+class TelemetryWriter:
+    """Appends rows to a columnar binary file, buffering them into row groups.
+
+    The file is a header with the schema (column names and array typecodes) followed by row groups. A row
+    group is its row count and, per column, the byte size and the little endian values of the column, so a
+    reader can skip the columns it does not need. Opening an existing file appends to it if the schema
+    matches, after cutting off a row group left incomplete by a crash. The reader ignores such a group too.
+    """
+
+    def __init__(self, file_path: str, schema: Sequence[Tuple[str, str]] = GAME_TELEMETRY_SCHEMA,
+                 row_group_size: int = 65536) -> None:
+        self.schema = tuple(schema)
+        self.row_group_size = row_group_size
+        self.rows_num = 0
+        self._columns = [array(typecode) for _, typecode in self.schema]
+
+        if os.path.exists(file_path) and os.path.getsize(file_path):
+            with open(file_path, 'rb+') as file:
+                schema_found = _read_schema(file)
+                if schema_found != self.schema:
+                    raise ValueError(f'{file_path} was written with another schema')
+                file.truncate(_find_complete_end(file, self.schema))
+            self._file = open(file_path, 'ab')
+        else:
+            self._file = open(file_path, 'wb')
+            self._file.write(_FILE_HEADER.pack(MAGIC, FORMAT_VERSION, len(self.schema)))
+            for name, typecode in self.schema:
+                encoded = name.encode('utf-8')
+                self._file.write(_COLUMN_HEADER.pack(len(encoded), typecode.encode('ascii')) + encoded)
+
+    def write(self, row: Sequence) -> None:
+        for column, value in zip(self._columns, row):
+            column.append(value)
+        self.rows_num += 1
+        if self.rows_num >= self.row_group_size:
+            self.flush()
+
+    def write_rows(self, rows: Sequence[Sequence]) -> None:
+        for row in rows:
+            self.write(row)
+
+    def flush(self) -> None:
+        if not self.rows_num:
+            return
+        chunks = [_ROW_GROUP_HEADER.pack(self.rows_num)]
+        for column in self._columns:
+            if sys.byteorder == 'big':
+                column.byteswap()
+            data = column.tobytes()
+            chunks.append(_CHUNK_HEADER.pack(len(data)))
+            chunks.append(data)
+        self._file.write(b''.join(chunks))
+        self._file.flush()
+        self._columns = [array(typecode) for _, typecode in self.schema]
+        self.rows_num = 0
+
+    def close(self) -> None:
+        self.flush()
+        self._file.close()
+
+    def __enter__(self) -> 'TelemetryWriter':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class TelemetryReader:
+    """Reads the files of TelemetryWriter, one row group or whole columns at a time."""
+
+    def __init__(self, file_path: str) -> None:
+        self.file_path = file_path
+        with open(file_path, 'rb') as file:
+            self.schema = _read_schema(file)
+            self._data_start = file.tell()
+
+    def iter_row_groups(self, columns: Optional[Sequence[str]] = None) -> Iterator[Dict[str, array]]:
+        wanted = set(columns) if columns is not None else None
+        with open(self.file_path, 'rb') as file:
+            file.seek(self._data_start)
+            while True:
+                header = file.read(_ROW_GROUP_HEADER.size)
+                if len(header) < _ROW_GROUP_HEADER.size:
+                    return
+                row_group = {}
+                for name, typecode in self.schema:
+                    chunk_header = file.read(_CHUNK_HEADER.size)
+                    if len(chunk_header) < _CHUNK_HEADER.size:
+                        return
+                    size, = _CHUNK_HEADER.unpack(chunk_header)
+                    if wanted is not None and name not in wanted:
+                        file.seek(size, os.SEEK_CUR)
+                        continue
+                    data = file.read(size)
+                    if len(data) < size:
+                        return
+                    values = array(typecode)
+                    values.frombytes(data)
+                    if sys.byteorder == 'big':
+                        values.byteswap()
+                    row_group[name] = values
+                yield row_group
+
+    def read(self, columns: Optional[Sequence[str]] = None) -> Dict[str, array]:
+        """Whole columns, e.g. for numpy.asarray or pandas.DataFrame."""
+        names = [name for name, _ in self.schema if columns is None or name in columns]
+        result = {name: array(typecode) for name, typecode in self.schema if name in names}
+        for row_group in self.iter_row_groups(names):
+            for name in names:
+                result[name].extend(row_group[name])
+        return result
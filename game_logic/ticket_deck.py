@@ -1,9 +1,10 @@
-import random
+import collections
+import errno
 
-from typing import TYPE_CHECKING
+from typing import Tuple, TYPE_CHECKING
 
 from game_logic.game_logger import logger
-from game_logic.utils import load_tickets
+from game_logic.map_cache import get_map_data
 
 
 if TYPE_CHECKING:
@@ -13,16 +14,27 @@ if TYPE_CHECKING:
 class TicketDeck:
     def __init__(self, game_instance: 'Game') -> None:
         self.game_instance = game_instance
-        self._ticket_deck = load_tickets(self.game_instance.version)
-        self.tickets = list(self._ticket_deck)
+        map_data = get_map_data(self.game_instance.version)
+        if map_data.tickets is None:
+            raise FileNotFoundError(errno.ENOENT, 'No tickets for this version', map_data.tickets_path)
+        self.tickets = map_data.tickets
+        self._ticket_ids = map_data.ticket_index
+        self._ticket_deck = collections.deque(self.tickets)
         self.tickets_num = len(self._ticket_deck)
-        random.shuffle(self._ticket_deck)
+        self.game_instance.rng.shuffle(self._ticket_deck)
 
     def get_tickets_num(self):
         return self.tickets_num
 
     def get_ticket_id(self, ticket):
-        return self.tickets.index(ticket)
+        return self._ticket_ids[ticket]
+
+    def get_ticket_ids(self) -> Tuple[int, ...]:
+        return tuple(self._ticket_ids[ticket] for ticket in self._ticket_deck)
+
+    def restore(self, ticket_ids) -> None:
+        self._ticket_deck = collections.deque(self.tickets[ticket_id] for ticket_id in ticket_ids)
+        self.set_ticket_pile_num_adapter()
 
     def insert(self, ticket: tuple) -> None:
         self._ticket_deck.append(ticket)
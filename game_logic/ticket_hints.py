@@ -0,0 +1,124 @@
+import heapq
+import math
+from typing import Dict, List, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from game_logic.game import Game
+
+
+class TicketHints:
+    """Answers how many trains a player still has to lay to complete a ticket.
+
+    A player's links cost nothing, links the LegalMoveGenerator availability rules leave open cost their
+    length and every other link is blocked. Each ticket is an A* search over MapData.node_links guided by
+    GameBoard.distances: a path from a city is at least as long as the empty board distance, and at most
+    the player's own trains of it are free, so the distance less the player's claimed length never
+    overestimates.
+
+    Answers are cached per player with the links of the path found, and GameBoard.claim_log tells which
+    claims happened since. An opponent's claim can only block links, so it drops only the answers whose path
+    used a link of that route. The player's own claim makes the answers through it cheaper by its length,
+    which keeps them shortest, and drops the others. A blocked ticket stays blocked until a restore.
+    """
+
+    def __init__(self, game_instance: 'Game') -> None:
+        self.game_instance = game_instance
+        self.board = game_instance.board
+        self.city_index = self.board.map_data.city_index
+        self.node_links = self.board.map_data.node_links
+        self.player_colors = [player.color for player in game_instance.players]
+
+        # player_id -> (city index, city index) -> [remaining trains, link ids of the path]
+        self._cache: List[Dict[Tuple[int, int], list]] = [{} for _ in game_instance.players]
+        # Length of the links every player owns, the slack of the distance bound
+        self._owned_lengths = [0] * game_instance.players_num
+        # Position in board.claim_log up to which the cache of every player is up to date
+        self._synced_claims = [0] * game_instance.players_num
+        self._board_restores = [self.board.restores] * game_instance.players_num
+        # Target node -> empty board distance of every node to it
+        self._distance_rows: Dict[int, List[float]] = {}
+
+    def remaining_trains(self, player_id: int, ticket: Tuple[str, str, int]) -> float:
+        """0 for a completed ticket, inf when the opponents have cut every path."""
+        city1, city2, _ = ticket
+        node1, node2 = self.city_index[city1], self.city_index[city2]
+        key = (node1, node2) if node1 <= node2 else (node2, node1)
+        self._sync(player_id)
+        answer = self._cache[player_id].get(key)
+        if answer is None:
+            answer = self._cache[player_id][key] = self._search(player_id, *key)
+        return answer[0]
+
+    def get_player_hints(self, player_id: int) -> Dict[Tuple[str, str, int], float]:
+        """Remaining trains of every ticket the player holds."""
+        return {ticket: self.remaining_trains(player_id, ticket)
+                for ticket in self.game_instance.players[player_id].tickets}
+
+    def _sync(self, player_id: int) -> None:
+        board = self.board
+        cache = self._cache[player_id]
+        color = self.player_colors[player_id]
+        if self._board_restores[player_id] != board.restores:
+            self._board_restores[player_id] = board.restores
+            self._synced_claims[player_id] = 0
+            self._owned_lengths[player_id] = sum(length for length, owner in zip(board.link_lengths, board.link_owners)
+                                                 if owner is color)
+            cache.clear()
+
+        claim_log = board.claim_log
+        for link_id in claim_log[self._synced_claims[player_id]:]:
+            if board.link_owners[link_id] is color:
+                length = board.link_lengths[link_id]
+                self._owned_lengths[player_id] += length
+                for key, answer in list(cache.items()):
+                    if link_id in answer[1]:
+                        answer[0] -= length
+                    elif answer[0] != math.inf:
+                        del cache[key]
+            else:
+                route_links = board.route_links[board.link_route_ids[link_id]]
+                for key, answer in list(cache.items()):
+                    if any(route_link in answer[1] for route_link in route_links):
+                        del cache[key]
+        self._synced_claims[player_id] = len(claim_log)
+
+    def _get_distance_row(self, target: int) -> List[float]:
+        row = self._distance_rows.get(target)
+        if row is None:
+            row = self._distance_rows[target] = self.board.distances[target].tolist()
+        return row
+
+    def _search(self, player_id: int, source: int, target: int) -> list:
+        color = self.player_colors[player_id]
+        link_owners = self.board.link_owners
+        available_mask = self.game_instance.legal_moves.available_masks[player_id]
+        node_links = self.node_links
+        bounds = self._get_distance_row(target)
+        owned_length = self._owned_lengths[player_id]
+
+        # The bound is admissible but not consistent, as own links cost nothing, so nodes may be reopened
+        costs = {source: 0}
+        parents: Dict[int, Tuple[int, int]] = {}
+        queue = [(max(0.0, bounds[source] - owned_length), 0, source)]
+        while queue:
+            _, cost, node = heapq.heappop(queue)
+            if node == target:
+                path_links = set()
+                while node != source:
+                    node, link_id = parents[node]
+                    path_links.add(link_id)
+                return [cost, path_links]
+            if cost > costs[node]:
+                continue
+            for neighbor, link_id, length in node_links[node]:
+                if link_owners[link_id] is color:
+                    new_cost = cost
+                elif available_mask[link_id]:
+                    new_cost = cost + length
+                else:
+                    continue
+                if new_cost < costs.get(neighbor, math.inf):
+                    costs[neighbor] = new_cost
+                    parents[neighbor] = (node, link_id)
+                    heapq.heappush(queue, (new_cost + max(0.0, bounds[neighbor] - owned_length), new_cost, neighbor))
+        return [math.inf, set()]
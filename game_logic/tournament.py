@@ -0,0 +1,275 @@
+import functools
+import hashlib
+import itertools
+import json
+import multiprocessing
+import os
+import random
+from dataclasses import dataclass, field
+from multiprocessing.pool import Pool
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from neat.nn.feed_forward import FeedForwardNetwork
+
+from game_logic.enums.player_types import PlayerType
+from game_logic.game import Game
+from game_logic.game_logger import configure_logging
+from game_logic.map_cache import get_map_data
+from network.manager import load_network
+
+# Players that need someone at the table to make their decisions
+INTERACTIVE_PLAYER_TYPES = (PlayerType.HUMAN.value, PlayerType.REMOTE.value)
+FORMATS = ('round-robin', 'swiss')
+
+
+@dataclass(frozen=True)
+class Entrant:
+    """A player config of the pool: a player type and, for AI players, the checkpoint its network is loaded from."""
+    name: str
+    player_type: str
+    network_path: Optional[str] = None
+
+    def __post_init__(self) -> None:
+        player_type = PlayerType(self.player_type).value
+        if player_type in INTERACTIVE_PLAYER_TYPES:
+            raise ValueError(f'{player_type} players cannot take part in a tournament')
+        if self.network_path and player_type != PlayerType.AI.value:
+            raise ValueError(f'Only AI players load a network, {self.name} is {player_type}')
+
+    @classmethod
+    def parse(cls, spec: str) -> 'Entrant':
+        """Reads '[name=]type[:checkpoint]', e.g. 'Random', 'MCTS' or 'gen50=AI:network/models/gen50.pkl'."""
+        name, _, config = spec.rpartition('=')
+        player_type, _, network_path = config.partition(':')
+        return cls(name or config, player_type, network_path or None)
+
+    @functools.cached_property
+    def config_hash(self) -> str:
+        """Identifies what plays rather than its name: a retrained checkpoint at the same path is a new config."""
+        network_hash = None
+        if self.network_path:
+            with open(self.network_path, 'rb') as file:
+                network_hash = hashlib.sha1(file.read()).hexdigest()
+        return hashlib.sha1(json.dumps([self.player_type, network_hash]).encode()).hexdigest()[:16]
+
+
+@dataclass
+class Standing:
+    name: str
+    rating: float
+    games: int = 0
+    wins: int = 0
+    points: int = 0
+    byes: int = 0
+    # Games played in every seat, balanced by the schedule
+    seat_games: List[int] = field(default_factory=list)
+
+    @property
+    def win_rate(self) -> float:
+        return self.wins / self.games if self.games else 0.0
+
+    @property
+    def average_score(self) -> float:
+        return self.points / self.games if self.games else 0.0
+
+
+@dataclass(frozen=True)
+class TableGame:
+    """One game of the schedule: entrants in seat order and the seed of the deal."""
+    seats: Tuple[Entrant, ...]
+    seed: int
+    version: str
+    max_moves: int
+
+    @property
+    def key(self) -> str:
+        """(config hash, seed) of the game, a cached result is reused when both match."""
+        config = json.dumps([self.version, self.max_moves, [entrant.config_hash for entrant in self.seats]])
+        return f'{hashlib.sha1(config.encode()).hexdigest()[:16]}:{self.seed}'
+
+
+class ResultCache:
+    """Results of played games, one JSON line per game appended to path, looked up by TableGame.key."""
+
+    def __init__(self, path: Optional[str]) -> None:
+        self.path = path
+        self.results: Dict[str, Dict[str, Any]] = {}
+        if path and os.path.exists(path):
+            with open(path, encoding='utf-8') as file:
+                for line in file:
+                    if line.strip():
+                        result = json.loads(line)
+                        self.results[result['key']] = result
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        return self.results.get(key)
+
+    def add(self, result: Dict[str, Any]) -> None:
+        self.results[result['key']] = result
+        if self.path:
+            with open(self.path, 'a', encoding='utf-8') as file:
+                file.write(json.dumps(result) + '\n')
+
+
+def update_elo(ratings: Sequence[float], scores: Sequence[int], ranking: Sequence[int],
+               k_factor: float) -> List[float]:
+    """Elo ratings of the players of one game after it, indexed by seat.
+
+    Every pair of players counts as a match won by the better ranked player, or drawn when their scores are
+    equal, and each player's change is scaled by 1 / (players - 1) so a game moves a rating as much as a
+    one on one game would, whatever the table size.
+    """
+    players_num = len(ratings)
+    places = {player_id: place for place, player_id in enumerate(ranking)}
+    new_ratings = list(ratings)
+    for player_id in range(players_num):
+        actual = expected = 0.0
+        for opponent_id in range(players_num):
+            if opponent_id == player_id:
+                continue
+            expected += 1 / (1 + 10 ** ((ratings[opponent_id] - ratings[player_id]) / 400))
+            if scores[player_id] == scores[opponent_id]:
+                actual += 0.5
+            elif places[player_id] < places[opponent_id]:
+                actual += 1
+        new_ratings[player_id] += k_factor / (players_num - 1) * (actual - expected)
+    return new_ratings
+
+
+@functools.lru_cache(maxsize=None)
+def _get_network(network_path: str) -> FeedForwardNetwork:
+    return load_network(network_path)
+
+
+def _init_worker(version: str) -> None:
+    configure_logging(quiet=True)
+    get_map_data(version)
+
+
+def _play_table_game(table_game: TableGame) -> Dict[str, Any]:
+    seats = table_game.seats
+    networks = None
+    if any(entrant.network_path for entrant in seats):
+        networks = [_get_network(entrant.network_path) if entrant.network_path else None for entrant in seats]
+    game = Game([entrant.player_type for entrant in seats], table_game.version, networks=networks,
+                seed=table_game.seed)
+    scores = game.play(table_game.max_moves)
+    return {'key': table_game.key,
+            'seed': table_game.seed,
+            'players': [entrant.name for entrant in seats],
+            'scores': scores,
+            'ranking': list(game.final_results.ranking),
+            'total_moves': game.total_moves}
+
+
+class Tournament:
+    """Rates a pool of entrants by playing them against each other at tables of table_size players.
+
+    round-robin meets every group of table_size entrants each round. swiss groups the entrants of similar
+    rating each round, the entrants left over sit the round out, those with the fewest byes first. Each
+    table plays one game per rotation of its seats with the same seed, so every entrant plays every seat
+    of the same deal and the first player's edge cancels out.
+
+    The games of a round run on a process pool and are rated in schedule order with update_elo, so a run is
+    reproducible whatever the number of workers. Seeds depend on base_seed, the round and the entrants of
+    a table only, which keeps the games of a run in the cache when entrants are added to the pool.
+    """
+
+    def __init__(self, entrants: Sequence[Entrant], version: str = 'USA', table_size: int = 2,
+                 rounds_num: int = 1, tournament_format: str = 'round-robin', workers_num: int = 0,
+                 base_seed: int = 0, max_moves: int = 0, cache_path: str = None, k_factor: float = 32,
+                 initial_rating: float = 1500) -> None:
+        if not Game.MIN_PLAYERS <= table_size <= Game.MAX_PLAYERS:
+            raise ValueError(f'Tables seat {Game.MIN_PLAYERS}-{Game.MAX_PLAYERS} players.')
+        if len(entrants) < table_size:
+            raise ValueError(f'{len(entrants)} entrants cannot fill a table of {table_size}.')
+        if len({entrant.name for entrant in entrants}) != len(entrants):
+            raise ValueError('Entrant names must be unique, name them like name=AI:checkpoint.')
+        if tournament_format not in FORMATS:
+            raise ValueError(f'Unknown format {tournament_format}. Choose from: {", ".join(FORMATS)}')
+        self.entrants = list(entrants)
+        self.version = version
+        self.table_size = table_size
+        self.rounds_num = rounds_num
+        self.tournament_format = tournament_format
+        self.workers_num = workers_num or multiprocessing.cpu_count()
+        self.base_seed = base_seed
+        self.max_moves = max_moves
+        self.cache = ResultCache(cache_path)
+        self.k_factor = k_factor
+        self.standings = {entrant.name: Standing(entrant.name, initial_rating, seat_games=[0] * table_size)
+                          for entrant in self.entrants}
+        self.games_num = 0
+        self.cached_games_num = 0
+
+    def get_seed(self, round_index: int, table: Iterable[Entrant]) -> int:
+        names = ','.join(sorted(entrant.config_hash for entrant in table))
+        digest = hashlib.sha1(f'{self.base_seed}:{round_index}:{names}'.encode()).digest()
+        return int.from_bytes(digest[:8], 'little') >> 1
+
+    def get_tables(self, round_index: int) -> List[Tuple[Entrant, ...]]:
+        if self.tournament_format == 'round-robin':
+            return list(itertools.combinations(self.entrants, self.table_size))
+
+        rng = random.Random(self.get_seed(round_index, ()))
+        # Ties in rating, as in the first round, are broken at random
+        order = sorted(self.entrants, key=lambda entrant: (-self.standings[entrant.name].rating, rng.random()))
+        byes_num = len(order) % self.table_size
+        if byes_num:
+            byes = sorted(order, key=lambda entrant: (self.standings[entrant.name].byes,
+                                                      self.standings[entrant.name].rating))[:byes_num]
+            for entrant in byes:
+                self.standings[entrant.name].byes += 1
+            order = [entrant for entrant in order if entrant not in byes]
+        return [tuple(order[start:start + self.table_size]) for start in range(0, len(order), self.table_size)]
+
+    def schedule_round(self, round_index: int) -> List[TableGame]:
+        games = []
+        for table in self.get_tables(round_index):
+            seed = self.get_seed(round_index, table)
+            for rotation in range(self.table_size):
+                seats = table[rotation:] + table[:rotation]
+                games.append(TableGame(seats, seed, self.version, self.max_moves))
+        return games
+
+    def run(self, pool: Pool = None) -> List[Standing]:
+        """Plays every round and returns the standings, best rated first."""
+        if pool is None:
+            with multiprocessing.Pool(self.workers_num, initializer=_init_worker, initargs=(self.version,)) as pool:
+                return self.run(pool)
+        for round_index in range(self.rounds_num):
+            self.play_round(round_index, pool)
+        return self.get_standings()
+
+    def play_round(self, round_index: int, pool: Pool) -> None:
+        games = self.schedule_round(round_index)
+        results: Dict[str, Dict[str, Any]] = {}
+        missing = []
+        for table_game in games:
+            result = self.cache.get(table_game.key)
+            if result is None:
+                missing.append(table_game)
+            else:
+                results[table_game.key] = result
+        self.cached_games_num += len(games) - len(missing)
+        chunksize = max(1, min(16, len(missing) // (self.workers_num * 4)))
+        for result in pool.imap_unordered(_play_table_game, missing, chunksize=chunksize):
+            self.cache.add(result)
+            results[result['key']] = result
+        for table_game in games:
+            self.add_result(table_game, results[table_game.key])
+
+    def add_result(self, table_game: TableGame, result: Dict[str, Any]) -> None:
+        standings = [self.standings[entrant.name] for entrant in table_game.seats]
+        ratings = update_elo([standing.rating for standing in standings], result['scores'], result['ranking'],
+                             self.k_factor)
+        for seat, (standing, rating, score) in enumerate(zip(standings, ratings, result['scores'])):
+            standing.rating = rating
+            standing.games += 1
+            standing.points += score
+            standing.seat_games[seat] += 1
+        standings[result['ranking'][0]].wins += 1
+        self.games_num += 1
+
+    def get_standings(self) -> List[Standing]:
+        return sorted(self.standings.values(), key=lambda standing: standing.rating, reverse=True)
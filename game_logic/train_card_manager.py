@@ -1,4 +1,4 @@
-import random
+import logging
 from typing import List, Optional, TYPE_CHECKING
 
 from game_logic.game_logger import logger
@@ -8,48 +8,69 @@ if TYPE_CHECKING:
 
 
 class TrainCardManager:
-    WILD_CARD = 'wild'
+    """Keeps the train cards as ints: a color is its TRAIN_COLORS index, followed by the wild card.
+
+    The draw pile is a shuffled list of card ids, the discard pile a count per card id.
+    """
 
     def __init__(self, game_instance: 'Game') -> None:
         self.game_instance = game_instance
+        self.config = self.game_instance.config
+        self.wild_card = self.config.WILD_CARD_ID
+        self.empty_card = self.config.EMPTY_CARD_ID
 
         self._draw_pile = self._create_draw_pile()
         self.set_draw_pile_num_adapter()
 
-        self._discard_pile = []
+        self._discard_pile = [0] * self.config.CARD_TYPES_NUM
+        self._discard_pile_num = 0
         self.set_discard_pile_num_adapter()
 
-        self._face_up_cards = [None] * 5
+        self._face_up_cards = [self.empty_card] * self.config.FACE_UP_CARDS_NUM
         self.fill_face_up()
 
-    def _create_draw_pile(self) -> List[str]:
-        deck = [x for x in self.game_instance.config.TRAIN_COLORS for _ in range(self.game_instance.config.TRAIN_CARDS_NUM)]
-        deck += [self.WILD_CARD for _ in range(self.game_instance.config.WILD_CARDS_NUM)]
-        random.shuffle(deck)
+    def _create_draw_pile(self) -> List[int]:
+        deck = [color_id for color_id in range(len(self.config.TRAIN_COLORS))
+                for _ in range(self.config.TRAIN_CARDS_NUM)]
+        deck += [self.wild_card] * self.config.WILD_CARDS_NUM
+        self.game_instance.rng.shuffle(deck)
         return deck
 
-    def get_face_up_cards(self) -> List[Optional[str]]:
+    def get_card_name(self, card: int) -> Optional[str]:
+        if card == self.wild_card:
+            return 'wild'
+        if card == self.empty_card:
+            return None
+        return self.config.TRAIN_COLORS[card]
+
+    def get_face_up_cards(self) -> List[int]:
         return self._face_up_cards
 
-    def get_discard_pile(self) -> List[str]:
+    def get_draw_pile(self) -> List[int]:
+        return self._draw_pile
+
+    def get_discard_pile(self) -> List[int]:
         return self._discard_pile
 
+    def has_cards_to_draw(self) -> bool:
+        return len(self._draw_pile) != 0 or self._discard_pile_num != 0
+
     def get_face_up_cards_num(self) -> int:
-        return sum(1 for card in self._face_up_cards if card is not None)
+        return len(self._face_up_cards) - self._face_up_cards.count(self.empty_card)
 
-    def pick_face_up_card(self, card_id: int) -> Optional[str]:
-        if card_id < self.get_face_up_cards_num():
+    def pick_face_up_card(self, card_id: int) -> Optional[int]:
+        if 0 <= card_id < len(self._face_up_cards):
             card = self._face_up_cards[card_id]
-            logger.debug(f'pick_face_up: {card}')
-            if card is None:
+            logger.debug('pick_face_up: %s', card)
+            if card == self.empty_card:
                 return
-            self._face_up_cards[card_id] = None
-            self.set_face_up_card_adapter(card_id, None)
+            self._face_up_cards[card_id] = self.empty_card
+            self.set_face_up_card_adapter(card_id, self.empty_card)
 
             self.fill_face_up()
             return card
 
-    def pick_draw_pile_card(self) -> str:
+    def pick_draw_pile_card(self) -> Optional[int]:
         if len(self._draw_pile) == 0:
             self.fill_draw_pile()
 
@@ -59,67 +80,80 @@ class TrainCardManager:
             return card
 
     def fill_face_up(self) -> None:
-        logger.debug('fill_face_up')
-        logger.debug(f'before {self._face_up_cards}')
-        self.get_state()
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            logger.debug('fill_face_up')
+            logger.debug('before %s', self._face_up_cards)
+            self.get_state()
         tries = 0
-        while self.get_face_up_cards_num() < self.game_instance.config.FACE_UP_CARDS_NUM:
-            closest_none_id = self._face_up_cards.index(None)
+        while self.get_face_up_cards_num() < self.config.FACE_UP_CARDS_NUM:
+            closest_empty_id = self._face_up_cards.index(self.empty_card)
             card = self.pick_draw_pile_card()
             if card is None:
-                logger.debug(f'Draw pile is empty!')
+                logger.debug('Draw pile is empty!')
                 break
             else:
-                # logger.debug(f'{card} picked from draw pile')
-                self._face_up_cards[closest_none_id] = card
-                self.set_face_up_card_adapter(closest_none_id, card)
+                self._face_up_cards[closest_empty_id] = card
+                self.set_face_up_card_adapter(closest_empty_id, card)
 
-            if self._face_up_cards.count(self.WILD_CARD) >= self.game_instance.config.MAX_WILD_CARDS and tries < 5:
+            if self._face_up_cards.count(self.wild_card) >= self.config.MAX_WILD_CARDS and tries < 5:
                 logger.debug('Too many wild cards on the table. Discarding face up cards...')
-                cards = [card for card in self._face_up_cards if card is not None]
-                self.add_to_discard_pile(cards)
-                self._face_up_cards = [None] * 5
+                for card_id, card in enumerate(self._face_up_cards):
+                    if card != self.empty_card:
+                        self.add_to_discard_pile(card, 1)
+                        self._face_up_cards[card_id] = self.empty_card
                 tries += 1
-        logger.debug(f'after {self._face_up_cards}')
-        self.get_state()
+        if debug:
+            logger.debug('after %s', self._face_up_cards)
+            self.get_state()
 
     def fill_draw_pile(self) -> None:
-        logger.debug('fill_draw_pile')
-        self.get_state()
-        if len(self._discard_pile) != 0:
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            logger.debug('fill_draw_pile')
+            self.get_state()
+        if self._discard_pile_num != 0:
             self.fill_from_discard_pile()
         else:
             logger.debug('Discard pile is empty!')
-        self.get_state()
+        if debug:
+            self.get_state()
 
     def fill_from_discard_pile(self):
-        self._draw_pile = self._discard_pile
-        random.shuffle(self._draw_pile)
+        self._draw_pile = [card for card, num in enumerate(self._discard_pile) for _ in range(num)]
+        self.game_instance.rng.shuffle(self._draw_pile)
 
-        self._discard_pile = []
+        self._discard_pile = [0] * self.config.CARD_TYPES_NUM
+        self._discard_pile_num = 0
         self.set_discard_pile_num_adapter()
 
-    def add_to_discard_pile(self, cards: List[str]) -> None:
-        if cards:
-            logger.debug(f'add_to_discard: {cards}')
-        for card in cards:
-            self._discard_pile.append(card)
+    def add_to_discard_pile(self, card: int, num: int) -> None:
+        if not num:
+            return
+        logger.debug('add_to_discard: %s x%s', card, num)
+        self._discard_pile[card] += num
+        self._discard_pile_num += num
         self.set_discard_pile_num_adapter()
 
+    def restore(self, draw_pile, discard_pile, face_up_cards) -> None:
+        self._draw_pile = list(draw_pile)
+        self._discard_pile = list(discard_pile)
+        self._discard_pile_num = sum(discard_pile)
+        self._face_up_cards = list(face_up_cards)
+        self.set_draw_pile_num_adapter()
+        self.set_discard_pile_num_adapter()
+        for card_id, card in enumerate(self._face_up_cards):
+            self.set_face_up_card_adapter(card_id, card)
+
     def get_state(self) -> None:
-        logger.debug(f'face_up: {len(self._face_up_cards)} draw: {len(self._draw_pile)} discard: {len(self._discard_pile)}')
+        logger.debug('face_up: %s draw: %s discard: %s',
+                     self.get_face_up_cards_num(), len(self._draw_pile), self._discard_pile_num)
 
     def set_draw_pile_num_adapter(self):
         self.game_instance.adapter.set_draw_pile_num(len(self._draw_pile))
 
     def set_discard_pile_num_adapter(self):
-        self.game_instance.adapter.set_discard_pile_num(len(self._discard_pile))
+        self.game_instance.adapter.set_discard_pile_num(self._discard_pile_num)
 
     def set_face_up_card_adapter(self, card_id, card):
-        if card == self.WILD_CARD:
-            color_id = len(self.game_instance.config.TRAIN_COLORS)
-        elif card is None:
-            color_id = len(self.game_instance.config.TRAIN_COLORS) + 1
-        else:
-            color_id = self.game_instance.config.TRAIN_COLORS.index(card)
-        self.game_instance.adapter.set_face_up_card(card_id, color_id)
+        self.game_instance.adapter.set_face_up_card(card_id, card)
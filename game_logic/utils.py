@@ -1,36 +1,46 @@
 import collections
+import functools
 import os
-from typing import List
+from typing import Tuple
 
 current_dir = os.path.dirname(__file__)
 
 
-def load_cities(version: str) -> List[str]:
+@functools.lru_cache(maxsize=None)
+def load_cities(version: str) -> Tuple[str, ...]:
     file_path = os.path.join(current_dir, 'data', version, 'cities.txt')
     cities = []
     with open(file_path, 'r', encoding='utf-8') as file:
         for line in file:
             city = line.strip()
             cities.append(city)
-    return cities
+    return tuple(cities)
 
 
-def load_routes(version: str) -> List[List[str]]:
+@functools.lru_cache(maxsize=None)
+def load_routes(version: str) -> Tuple[Tuple[str, ...], ...]:
     file_path = os.path.join(current_dir, 'data', version, 'routes.txt')
     routes = []
     with open(file_path, 'r', encoding='utf-8') as file:
         for line in file:
             sline = line.strip()
-            route = sline.split(', ')
+            route = tuple(sline.split(', '))
             routes.append(route)
-    return routes
+    return tuple(routes)
 
 
-def load_tickets(version: str) -> collections.deque:
+@functools.lru_cache(maxsize=None)
+def _read_tickets(version: str) -> Tuple[Tuple[str, str, int], ...]:
     file_path = os.path.join(current_dir, 'data', version, 'tickets.txt')
-    tickets = collections.deque()
+    tickets = []
     with open(file_path, 'r', encoding='utf-8') as file:
         for line in file:
             parts = line.strip().split(', ')
             tickets.append((parts[0], parts[1], int(parts[2])))
-    return tickets
+    return tuple(tickets)
+
+
+def load_tickets(version: str) -> collections.deque:
+    # The deck is mutated by TicketDeck, so every caller gets its own copy of the cached tickets
+    return collections.deque(_read_tickets(version))
+
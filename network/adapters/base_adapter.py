@@ -2,6 +2,9 @@ class BaseAdapter:
     def __init__(self):
         self.state_array = []
 
+    def reset(self):
+        pass
+
     def set_face_up_card(self, card_pos, color_id):
         pass
 
@@ -23,7 +26,7 @@ class BaseAdapter:
     def set_wild_cards_num(self, player_id, value):
         pass
 
-    def set_color_cards_num(self, player_id, color, value):
+    def set_color_cards_num(self, player_id, color_id, value):
         pass
 
     def set_ticket_owner(self, player_id, ticket_id):
@@ -0,0 +1,137 @@
+from typing import Dict, Tuple, TYPE_CHECKING
+
+import numpy as np
+
+from game_logic.enums.player_colors import PlayerColor
+from network.adapters.base_adapter import BaseAdapter
+
+if TYPE_CHECKING:
+    from game_logic.game import Game
+
+
+class NetworkAdapter(BaseAdapter):
+    """Keeps the network input of every player in one preallocated float32 array, updated in place.
+
+    Row p is the state seen by player p. Per-player features are ordered by seat relative to p (p first),
+    so the same network can play any seat. Private features (hand, tickets) are only written to the
+    owner's row.
+
+    state may be given to keep the array in a buffer of the caller, e.g. one row of a VectorEnv, it must have
+    the shape (players_num, features_num) and dtype float32.
+    """
+    MAX_PLAYERS = len(PlayerColor)
+
+    def __init__(self, game_instance: 'Game', state: np.ndarray = None) -> None:
+        super().__init__()
+        config = game_instance.config
+        self.players_num = game_instance.players_num
+        self.ticket_deck = game_instance.ticket_deck
+        self.feature_slices = self.get_feature_slices(config, game_instance.board.get_route_links_num(),
+                                                      game_instance.ticket_deck.get_tickets_num())
+        self.features_num = max(feature.stop for feature in self.feature_slices.values())
+
+        if state is None:
+            state = np.zeros((self.players_num, self.features_num), dtype=np.float32)
+        elif state.shape != (self.players_num, self.features_num) or state.dtype != np.float32:
+            raise ValueError(f'The state buffer must be float32 of shape {(self.players_num, self.features_num)}, '
+                             f'got {state.dtype} of shape {state.shape}')
+        self.state = state
+        self.state_array = self.state
+
+        self._rows = np.arange(self.players_num)
+        # _relative_seats[player] -> seat of player as seen from each row
+        self._relative_seats = np.array([[(player - viewer) % self.players_num for viewer in self._rows]
+                                         for player in self._rows])
+        self._offsets = {name: feature.start for name, feature in self.feature_slices.items()}
+
+        self._face_up_width = config.CARD_TYPES_NUM + 1
+        self._wild_card_id = config.WILD_CARD_ID
+        self._hands = np.zeros((self.players_num, config.CARD_TYPES_NUM), dtype=np.int32)
+        self._tickets_nums = np.zeros(self.players_num, dtype=np.int32)
+
+        self._cards_num = len(config.TRAIN_COLORS) * config.TRAIN_CARDS_NUM + config.WILD_CARDS_NUM
+        self._tickets_num = max(1, game_instance.ticket_deck.get_tickets_num())
+        self._trains_num = config.TRAIN_FIGURES_NUM
+
+        self._face_up_cards_num = config.FACE_UP_CARDS_NUM
+        self._empty_card_id = config.EMPTY_CARD_ID
+        self.reset()
+
+    def reset(self):
+        self.state[:] = 0
+        self._hands[:] = 0
+        self._tickets_nums[:] = 0
+        for card_pos in range(self._face_up_cards_num):
+            self.set_face_up_card(card_pos, self._empty_card_id)
+
+    @classmethod
+    def get_feature_slices(cls, config, links_num: int, tickets_num: int) -> Dict[str, slice]:
+        sizes = (('face_up_cards', config.FACE_UP_CARDS_NUM * (config.CARD_TYPES_NUM + 1)),
+                 ('draw_pile_num', 1),
+                 ('discard_pile_num', 1),
+                 ('ticket_pile_num', 1),
+                 ('trains_num', cls.MAX_PLAYERS),
+                 ('hand_sizes', cls.MAX_PLAYERS),
+                 ('tickets_nums', cls.MAX_PLAYERS),
+                 ('route_owners', links_num * cls.MAX_PLAYERS),
+                 ('hand', config.CARD_TYPES_NUM),
+                 ('tickets', tickets_num * 2))
+        slices = {}
+        start = 0
+        for name, size in sizes:
+            slices[name] = slice(start, start + size)
+            start += size
+        return slices
+
+    @classmethod
+    def get_features_num(cls, config, links_num: int, tickets_num: int) -> int:
+        return max(feature.stop for feature in cls.get_feature_slices(config, links_num, tickets_num).values())
+
+    def _set_seat_feature(self, name: str, player_id: int, value: float) -> None:
+        self.state[self._rows, self._offsets[name] + self._relative_seats[player_id]] = value
+
+    def set_face_up_card(self, card_pos, color_id):
+        start = self._offsets['face_up_cards'] + card_pos * self._face_up_width
+        self.state[:, start:start + self._face_up_width] = 0
+        self.state[:, start + color_id] = 1
+
+    def set_draw_pile_num(self, value):
+        self.state[:, self._offsets['draw_pile_num']] = value / self._cards_num
+
+    def set_discard_pile_num(self, value):
+        self.state[:, self._offsets['discard_pile_num']] = value / self._cards_num
+
+    def set_ticket_pile_num(self, value):
+        self.state[:, self._offsets['ticket_pile_num']] = value / self._tickets_num
+
+    def set_trains_num(self, player_id, value):
+        self._set_seat_feature('trains_num', player_id, value / self._trains_num)
+
+    def set_route_owner(self, player_id, route_id):
+        self.state[self._rows, self._offsets['route_owners'] + route_id * self.MAX_PLAYERS
+                   + self._relative_seats[player_id]] = 1
+
+    def set_wild_cards_num(self, player_id, value):
+        self._set_hand_card(player_id, self._wild_card_id, value)
+
+    def set_color_cards_num(self, player_id, color_id, value):
+        self._set_hand_card(player_id, color_id, value)
+
+    def _set_hand_card(self, player_id: int, card: int, value: int) -> None:
+        self._hands[player_id, card] = value
+        self.state[player_id, self._offsets['hand'] + card] = value / self._cards_num
+        self._set_seat_feature('hand_sizes', player_id, self._hands[player_id].sum() / self._cards_num)
+
+    def set_ticket_owner(self, player_id, ticket_id):
+        self.state[player_id, self._offsets['tickets'] + 2 * self._get_ticket_id(ticket_id)] = 1
+        self._tickets_nums[player_id] += 1
+        self._set_seat_feature('tickets_nums', player_id, self._tickets_nums[player_id] / self._tickets_num)
+
+    def set_ticket_completed(self, player_id, ticket_id):
+        self.state[player_id, self._offsets['tickets'] + 2 * self._get_ticket_id(ticket_id) + 1] = 1
+
+    def _get_ticket_id(self, ticket: int | Tuple[str, str, int]) -> int:
+        return ticket if isinstance(ticket, int) else self.ticket_deck.get_ticket_id(ticket)
+
+    def get_state_array(self, player_id):
+        return self.state[player_id]
@@ -0,0 +1,167 @@
+import multiprocessing
+import os
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Dict, Optional, Tuple, TYPE_CHECKING
+
+import numpy as np
+
+from network.adapters.network_adapter import NetworkAdapter
+
+if TYPE_CHECKING:
+    from game_logic.game import Game
+
+# name -> (shape, dtype) of the arrays of a SharedArrays block
+ArraySpecs = Dict[str, Tuple[Tuple[int, ...], np.dtype]]
+
+# Arrays start on cache line boundaries, so processes writing neighbouring arrays don't share lines
+ALIGNMENT = 64
+
+
+def get_aligned_size(shape: Tuple[int, ...], dtype: np.dtype) -> int:
+    return -(-int(np.prod(shape)) * np.dtype(dtype).itemsize // ALIGNMENT) * ALIGNMENT
+
+
+class SharedArrays:
+    """NumPy arrays laid out one after the other in one SharedMemory block.
+
+    The process that creates the block owns it and unlinks it in close, copies inherited by forked workers
+    don't. Other processes attach by name with the same specs, usually through pickling, which only sends the
+    name and the specs. Every array is a view of the block, so writes are seen by every process without copies.
+    """
+
+    def __init__(self, specs: ArraySpecs, name: str = None) -> None:
+        self.specs = {name_: (tuple(shape), np.dtype(dtype)) for name_, (shape, dtype) in specs.items()}
+        size = max(1, sum(get_aligned_size(shape, dtype) for shape, dtype in self.specs.values()))
+        create = name is None
+        self.owner_pid = os.getpid() if create else None
+        self.block: Optional[SharedMemory] = SharedMemory(name, create=create, size=size if create else 0)
+        self.arrays: Dict[str, np.ndarray] = {}
+        offset = 0
+        for array_name, (shape, dtype) in self.specs.items():
+            self.arrays[array_name] = np.ndarray(shape, dtype, buffer=self.block.buf, offset=offset)
+            offset += get_aligned_size(shape, dtype)
+
+    @property
+    def name(self) -> str:
+        return self.block.name
+
+    def __getitem__(self, array_name: str) -> np.ndarray:
+        return self.arrays[array_name]
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {'specs': self.specs, 'name': self.name}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(state['specs'], state['name'])
+
+    def close(self) -> None:
+        """Releases the block, views of the arrays taken by the caller must be gone by then."""
+        if self.block is None:
+            return
+        self.arrays = {}
+        self.block.close()
+        if self.owner_pid == os.getpid():
+            self.block.unlink()
+        self.block = None
+
+    def __enter__(self) -> 'SharedArrays':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class SharedStateBuffer(SharedArrays):
+    """NetworkAdapter states of many games in shared memory, laid out as [games x players x features].
+
+    A rollout worker gives each of its games an adapter over its row with get_adapter, the adapters update
+    their rows in place as the games run, and any process attached to the buffer reads them without copies.
+    """
+
+    def __init__(self, games_num: int, players_num: int, features_num: int, name: str = None) -> None:
+        self.games_num = games_num
+        self.players_num = players_num
+        self.features_num = features_num
+        super().__init__({'states': ((games_num, players_num, features_num), np.float32)}, name)
+        self.states = self.arrays['states']
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {'shape': (self.games_num, self.players_num, self.features_num), 'name': self.name}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(*state['shape'], state['name'])
+
+    def get_adapter(self, game_instance: 'Game', game_index: int) -> NetworkAdapter:
+        return NetworkAdapter(game_instance, self.states[game_index])
+
+    def close(self) -> None:
+        self.states = None
+        super().close()
+
+
+class SlotRing:
+    """A single producer, single consumer ring of state slots in shared memory.
+
+    Each slot holds one [games x players x features] array, e.g. the states of a worker's games at one step,
+    and a step number. The producer fills a free slot in place and publishes it, the consumer reads published
+    slots in order from the same memory and releases them for reuse. Two semaphores count the free and the
+    published slots, so both sides block only when the ring is full or empty. Use one ring per producer.
+
+        # producer                                     # consumer
+        slot = ring.acquire_write()                    slot = ring.acquire_read()
+        ring.states[slot] = env.states                 learn(ring.states[slot], ring.steps[slot])
+        ring.steps[slot] = step                        ring.release(slot)
+        ring.publish(slot)
+
+    A ring is handed to the other process as an argument of multiprocessing.Process, like its semaphores.
+    """
+
+    def __init__(self, slots_num: int, games_num: int, players_num: int, features_num: int,
+                 context: Any = multiprocessing) -> None:
+        self.slots_num = slots_num
+        self.shared = SharedArrays({'states': ((slots_num, games_num, players_num, features_num), np.float32),
+                                    'steps': ((slots_num,), np.int64)})
+        self.free_slots = context.Semaphore(slots_num)
+        self.published_slots = context.Semaphore(0)
+        self._attach()
+
+    def _attach(self) -> None:
+        self.states = self.shared['states']
+        self.steps = self.shared['steps']
+        # Next slot of each side, a side only moves its own
+        self.write_index = 0
+        self.read_index = 0
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {'slots_num': self.slots_num, 'shared': self.shared, 'free_slots': self.free_slots,
+                'published_slots': self.published_slots}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._attach()
+
+    def acquire_write(self, timeout: float = None) -> Optional[int]:
+        """Next slot to fill, None when no slot was released within timeout."""
+        if not self.free_slots.acquire(timeout=timeout):
+            return None
+        slot = self.write_index
+        self.write_index = (slot + 1) % self.slots_num
+        return slot
+
+    def publish(self, slot: int) -> None:
+        self.published_slots.release()
+
+    def acquire_read(self, timeout: float = None) -> Optional[int]:
+        """Oldest published slot, None when none was published within timeout."""
+        if not self.published_slots.acquire(timeout=timeout):
+            return None
+        slot = self.read_index
+        self.read_index = (slot + 1) % self.slots_num
+        return slot
+
+    def release(self, slot: int) -> None:
+        self.free_slots.release()
+
+    def close(self) -> None:
+        self.states = self.steps = None
+        self.shared.close()
@@ -0,0 +1,63 @@
+import threading
+from typing import Dict, List, Tuple
+
+import numpy as np
+from neat.nn import FeedForwardNetwork
+
+from network.compiled_network import CompiledNetwork
+
+
+class InferenceBatcher:
+    """Gathers the decision states of games running in lockstep and evaluates them as one batch.
+
+    Every game runs in its own thread and blocks in evaluate() until each running game has a pending
+    state (or has finished). The thread that completes the batch evaluates it: one matrix product chain
+    per distinct network, after which the results are scattered back to the waiting games.
+    """
+
+    def __init__(self, games_num: int) -> None:
+        self._running_games = games_num
+        self._condition = threading.Condition()
+        self._pending: List[Tuple[FeedForwardNetwork, np.ndarray, list]] = []
+        self._compiled: Dict[int, Tuple[FeedForwardNetwork, CompiledNetwork]] = {}
+        self.batches_num = 0
+        self.decisions_num = 0
+
+    def compile(self, network: FeedForwardNetwork) -> CompiledNetwork:
+        # Keep a reference to the network so its id cannot be reused while it is cached
+        entry = self._compiled.get(id(network))
+        if entry is None:
+            entry = self._compiled[id(network)] = (network, CompiledNetwork(network))
+        return entry[1]
+
+    def evaluate(self, network: FeedForwardNetwork, state: np.ndarray) -> np.ndarray:
+        result = []
+        with self._condition:
+            self._pending.append((network, state, result))
+            if len(self._pending) >= self._running_games:
+                self._flush()
+            else:
+                while not result:
+                    self._condition.wait()
+        return result[0]
+
+    def game_finished(self) -> None:
+        with self._condition:
+            self._running_games -= 1
+            if self._pending and len(self._pending) >= self._running_games:
+                self._flush()
+
+    def _flush(self) -> None:
+        groups: Dict[int, List[Tuple[FeedForwardNetwork, np.ndarray, list]]] = {}
+        for request in self._pending:
+            groups.setdefault(id(request[0]), []).append(request)
+        self._pending = []
+
+        for requests in groups.values():
+            outputs = self.compile(requests[0][0]).activate_batch(np.stack([state for _, state, _ in requests]))
+            for (_, _, result), output in zip(requests, outputs):
+                result.append(output)
+
+        self.batches_num += 1
+        self.decisions_num += sum(len(requests) for requests in groups.values())
+        self._condition.notify_all()
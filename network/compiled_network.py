@@ -0,0 +1,112 @@
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+from neat import activations, aggregations
+from neat.nn.feed_forward import FeedForwardNetwork
+
+
+def _clip(z: np.ndarray, bound: float) -> np.ndarray:
+    return np.clip(z, -bound, bound)
+
+
+def _inv(z: np.ndarray) -> np.ndarray:
+    with np.errstate(divide='ignore'):
+        result = 1.0 / z
+    result[~np.isfinite(result)] = 0.0
+    return result
+
+
+# Vectorised equivalents of the neat activation functions
+ACTIVATIONS: Dict[Callable, Callable[[np.ndarray], np.ndarray]] = {
+    activations.sigmoid_activation: lambda z: 1.0 / (1.0 + np.exp(-_clip(5.0 * z, 60.0))),
+    activations.tanh_activation: lambda z: np.tanh(_clip(2.5 * z, 60.0)),
+    activations.sin_activation: lambda z: np.sin(_clip(5.0 * z, 60.0)),
+    activations.gauss_activation: lambda z: np.exp(-5.0 * _clip(z, 3.4) ** 2),
+    activations.relu_activation: lambda z: np.maximum(z, 0.0),
+    activations.softplus_activation: lambda z: 0.2 * np.log1p(np.exp(_clip(5.0 * z, 60.0))),
+    activations.identity_activation: lambda z: z,
+    activations.clamped_activation: lambda z: _clip(z, 1.0),
+    activations.inv_activation: _inv,
+    activations.log_activation: lambda z: np.log(np.maximum(z, 1e-7)),
+    activations.exp_activation: lambda z: np.exp(_clip(z, 60.0)),
+    activations.abs_activation: np.abs,
+    activations.hat_activation: lambda z: np.maximum(0.0, 1.0 - np.abs(z)),
+    activations.square_activation: np.square,
+    activations.cube_activation: lambda z: z ** 3,
+}
+
+# Aggregations that are a (scaled) weighted sum, so they can be computed with a matrix product
+LINEAR_AGGREGATIONS = {aggregations.sum_aggregation: False, aggregations.mean_aggregation: True}
+
+
+class CompiledNetwork:
+    """A neat FeedForwardNetwork compiled into per-layer weight matrices, evaluated on a batch of inputs.
+
+    Layers are the runs of node evaluations that do not depend on each other, so each layer is one
+    matrix product over the columns it reads from.
+    """
+
+    def __init__(self, network: FeedForwardNetwork) -> None:
+        self.inputs_num = len(network.input_nodes)
+        columns = {node: index for index, node in enumerate(network.input_nodes)}
+        for node, *_ in network.node_evals:
+            columns[node] = len(columns)
+        self.columns_num = len(columns)
+
+        self.layers: List[Tuple] = []
+        layer = []
+        layer_nodes = set()
+        for node_eval in network.node_evals:
+            if any(source in layer_nodes for source, _ in node_eval[5]):
+                self._add_layer(layer, columns)
+                layer = []
+                layer_nodes = set()
+            layer.append(node_eval)
+            layer_nodes.add(node_eval[0])
+        if layer:
+            self._add_layer(layer, columns)
+
+        # Output nodes that are never evaluated stay at 0, like in FeedForwardNetwork
+        self.output_columns = np.array([columns.get(node, -1) for node in network.output_nodes])
+
+    def _add_layer(self, node_evals: list, columns: Dict[int, int]) -> None:
+        sources = sorted({columns[source] for node_eval in node_evals for source, _ in node_eval[5]})
+        source_rows = {column: row for row, column in enumerate(sources)}
+        weights = np.zeros((len(sources), len(node_evals)))
+        biases = np.empty(len(node_evals))
+        responses = np.empty(len(node_evals))
+        activation_groups = {}
+
+        for index, (node, act_func, agg_func, bias, response, links) in enumerate(node_evals):
+            if agg_func not in LINEAR_AGGREGATIONS:
+                raise ValueError(f'Aggregation {agg_func.__name__} of node {node} cannot be compiled')
+            if act_func not in ACTIVATIONS:
+                raise ValueError(f'Activation {act_func.__name__} of node {node} cannot be compiled')
+            scale = 1.0 / len(links) if LINEAR_AGGREGATIONS[agg_func] and links else 1.0
+            for source, weight in links:
+                weights[source_rows[columns[source]], index] += weight * scale
+            biases[index] = bias
+            responses[index] = response
+            activation_groups.setdefault(act_func, []).append(index)
+
+        targets = np.array([columns[node_eval[0]] for node_eval in node_evals])
+        groups = [(ACTIVATIONS[act_func], np.array(indexes)) for act_func, indexes in activation_groups.items()]
+        self.layers.append((np.array(sources, dtype=np.intp), weights, biases, responses, targets, groups))
+
+    def activate_batch(self, inputs: np.ndarray) -> np.ndarray:
+        """Evaluates a (batch, inputs) array and returns a (batch, outputs) array."""
+        inputs = np.asarray(inputs, dtype=np.float64)
+        if inputs.ndim != 2 or inputs.shape[1] != self.inputs_num:
+            raise RuntimeError(f'Expected an array of shape (batch, {self.inputs_num}), got {inputs.shape}')
+
+        values = np.zeros((inputs.shape[0], self.columns_num + 1))
+        values[:, :self.inputs_num] = inputs
+        for sources, weights, biases, responses, targets, groups in self.layers:
+            z = biases + responses * (values[:, sources] @ weights)
+            for activation, indexes in groups:
+                values[:, targets[indexes]] = activation(z[:, indexes])
+        # Column -1 is the always-zero padding column
+        return values[:, self.output_columns]
+
+    def activate(self, inputs) -> np.ndarray:
+        return self.activate_batch(np.asarray(inputs)[np.newaxis])[0]
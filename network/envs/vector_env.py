@@ -0,0 +1,297 @@
+import multiprocessing
+import random
+import traceback
+from multiprocessing.connection import Connection
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from neat.nn.feed_forward import FeedForwardNetwork
+
+from game_logic.config_factory import ConfigFactory
+from game_logic.decision_request import DecisionRequest
+from game_logic.enums.decisions.actions import ActionDecision
+from game_logic.enums.decisions.decision_types import DecisionType
+from game_logic.enums.decisions.train_cards import TrainCardDecision
+from game_logic.enums.player_types import PlayerType
+from game_logic.game import Game
+from game_logic.map_cache import get_map_data
+from game_logic.player_factory import PlayerFactory
+from network.adapters.base_adapter import BaseAdapter
+from network.adapters.network_adapter import NetworkAdapter
+from network.adapters.shared_state import SharedArrays
+
+# Index of every decision type in VectorEnv.decision_types
+DECISION_TYPES = list(DecisionType)
+DECISION_TYPE_INDEX = {decision_type: index for index, decision_type in enumerate(DECISION_TYPES)}
+
+
+class EnvPlayerFactory(PlayerFactory):
+    """Creates the players of one game of a VectorEnv, whose NetworkAdapter writes into the env's state array."""
+
+    def __init__(self, state: np.ndarray) -> None:
+        self.state = state
+
+    def determine_adapter(self, player_types: List[str], game_instance: Game) -> BaseAdapter:
+        return NetworkAdapter(game_instance, self.state)
+
+
+class VectorEnv:
+    """Plays envs_num games in lockstep for a learner that sits in one seat of every game.
+
+    The learner's seat is a Remote player, the other seats are bots answered inside step, so every step
+    answers one decision of the learner in each game: an action, a route, a color, a wild cards count, a train
+    card or the kept tickets as a bitmask, see DecisionRequest. Answers are ints in range(actions_num) and
+    action_masks tells which ones are legal, decision_types which decision each game waits for.
+
+    The results are NumPy arrays with one row per game, kept in arrays that step overwrites in place:
+        observations  (envs_num, features_num) float32, the NetworkAdapter state of the learner's seat
+        rewards       (envs_num,) float32, 1 when the learner won the game that just ended, -1 when it lost
+        dones         (envs_num,) bool
+    A finished game is reset with the next seed of its env straight away, so its row already holds the first
+    decision of the new game and the info of step carries the final scores and observation of the old one.
+
+    arrays may be given to keep the arrays in buffers of the caller, see get_array_specs.
+    """
+
+    def __init__(self, envs_num: int, version: str = 'USA', opponents: Sequence[str] = ('Random',),
+                 seat: int = 0, seed: int = 0, max_moves: int = 0, networks: List[FeedForwardNetwork] = None,
+                 arrays: Dict[str, np.ndarray] = None, first_env: int = 0) -> None:
+        self.envs_num = envs_num
+        self.version = version
+        self.seat = seat
+        self.max_moves = max_moves
+        self.player_types = list(opponents)
+        self.player_types.insert(seat, PlayerType.REMOTE.value)
+        self.players_num = len(self.player_types)
+        self.features_num, self.actions_num = self.get_sizes(version, self.players_num)
+
+        specs = self.get_array_specs(envs_num, self.players_num, self.features_num, self.actions_num)
+        if arrays is None:
+            arrays = {name: np.zeros(shape, dtype) for name, (shape, dtype) in specs.items()}
+        self.arrays = arrays
+        self.states = arrays['states']
+        self.observations = self.states[:, seat]
+        self.masks = arrays['masks']
+        self.decision_types = arrays['decision_types']
+        self.rewards = arrays['rewards']
+        self.dones = arrays['dones']
+
+        # Seeds of env first_env + index, they don't depend on how the envs are split between processes
+        self.seed_rngs = [random.Random(seed * 1_000_003 + first_env + index) for index in range(envs_num)]
+        self.games = [Game(self.player_types, version, networks=networks, seed=self.next_seed(index),
+                           player_factory=EnvPlayerFactory(self.states[index])) for index in range(envs_num)]
+        self.requests: List[Optional[DecisionRequest]] = [None] * envs_num
+        # The games of __init__ have not been played, the first reset starts them as they are
+        self.started = False
+        self.episodes_num = 0
+        self.steps_num = 0
+
+    @staticmethod
+    def get_sizes(version: str, players_num: int) -> Tuple[int, int]:
+        """features_num of the observations and actions_num, the most answers any decision can have."""
+        config = ConfigFactory.get_config(version)
+        map_data = get_map_data(version)
+        features_num = NetworkAdapter.get_features_num(config, map_data.links_num, len(map_data.tickets or ()))
+        actions_num = max(len(ActionDecision), map_data.links_num, len(config.TRAIN_COLORS),
+                          config.WILD_CARDS_NUM + 1, len(TrainCardDecision),
+                          1 << max(config.TICKETS_DEALT_NUM, config.INITIAL_TICKETS_DEALT_NUM))
+        return features_num, actions_num
+
+    @staticmethod
+    def get_array_specs(envs_num: int, players_num: int, features_num: int,
+                        actions_num: int) -> Dict[str, Tuple[Tuple[int, ...], np.dtype]]:
+        """name -> (shape, dtype) of the arrays a VectorEnv keeps its results in."""
+        return {'states': ((envs_num, players_num, features_num), np.dtype(np.float32)),
+                'masks': ((envs_num, actions_num), np.dtype(bool)),
+                'decision_types': ((envs_num,), np.dtype(np.int8)),
+                'rewards': ((envs_num,), np.dtype(np.float32)),
+                'dones': ((envs_num,), np.dtype(bool))}
+
+    def next_seed(self, index: int) -> int:
+        return self.seed_rngs[index].getrandbits(63)
+
+    def reset(self) -> np.ndarray:
+        for index, game in enumerate(self.games):
+            if self.started:
+                game.new_game(self.next_seed(index))
+            self._start(index)
+        self.started = True
+        self.rewards[:] = 0
+        self.dones[:] = False
+        return self.observations
+
+    def step(self, actions: Sequence[int]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, List[Dict[str, Any]]]:
+        """Answers the pending decision of every game. infos holds a dict for every game that ended."""
+        infos = []
+        self.rewards[:] = 0
+        self.dones[:] = False
+        for index, game in enumerate(self.games):
+            request = self._advance(index, game.step(int(actions[index])))
+            if request is None:
+                self.rewards[index] = 1 if game.winner.player_id == self.seat else -1
+                self.dones[index] = True
+                infos.append({'env': index, 'scores': game.final_scores, 'winner': game.winner.player_id,
+                              'total_moves': game.total_moves, 'seed': game.seed,
+                              'final_observation': self.observations[index].copy()})
+                self.episodes_num += 1
+                game.new_game(self.next_seed(index))
+                self._start(index)
+        self.steps_num += self.envs_num
+        return self.observations, self.rewards, self.dones, infos
+
+    def action_masks(self) -> np.ndarray:
+        """(envs_num, actions_num) bool, the legal answers to the pending decision of every game."""
+        return self.masks
+
+    def close(self) -> None:
+        self.games = []
+
+    def _start(self, index: int) -> None:
+        request = self._advance(index, self.games[index].resume(self.max_moves))
+        if request is None:
+            raise RuntimeError(f'The game {self.games[index].seed} ended before the learner had a decision')
+
+    def _advance(self, index: int, request: Optional[DecisionRequest]) -> Optional[DecisionRequest]:
+        """Lets the bots answer until the learner has a decision, then fills in its mask."""
+        game = self.games[index]
+        players = game.players
+        while request is not None and request.player_id != self.seat:
+            request = game.step(players[request.player_id].make_decision(request))
+        self.requests[index] = request
+        if request is not None:
+            mask = self.masks[index]
+            mask[:] = False
+            mask[game.legal_actions()] = True
+            self.decision_types[index] = DECISION_TYPE_INDEX[request.decision_type]
+        return request
+
+
+def run_shard(connection: Connection, shared: SharedArrays, first_env: int, last_env: int,
+              env_kwargs: Dict[str, Any]) -> None:
+    """Worker of a SubprocVectorEnv: steps envs first_env..last_env - 1 in the shared arrays on command."""
+    try:
+        serve_shard(connection, shared.arrays, first_env, last_env, env_kwargs)
+    except Exception:
+        connection.send(traceback.format_exc())
+    finally:
+        shared.close()
+        connection.close()
+
+
+def serve_shard(connection: Connection, arrays: Dict[str, np.ndarray], first_env: int, last_env: int,
+                env_kwargs: Dict[str, Any]) -> None:
+    # The views of the block must be gone when run_shard closes it, so they only live in this frame
+    arrays = {name: array[first_env:last_env] for name, array in arrays.items()}
+    actions = arrays.pop('actions')
+    env = VectorEnv(last_env - first_env, arrays=arrays, first_env=first_env, **env_kwargs)
+    connection.send([])
+    while True:
+        command = connection.recv()
+        if command == 'step':
+            _, _, _, infos = env.step(actions)
+            for info in infos:
+                info['env'] += first_env
+            connection.send(infos)
+        elif command == 'reset':
+            env.reset()
+            connection.send([])
+        else:
+            break
+
+
+class SubprocVectorEnv:
+    """A VectorEnv split into shards_num worker processes, with the same interface and results.
+
+    Every array, the actions included, lives in one shared memory block the workers write into in place, so
+    only the commands and the infos of finished games go through the pipes. The workers step their shards in
+    parallel, which pays off once a shard's step outweighs a round trip through the pipes.
+    """
+
+    def __init__(self, envs_num: int, shards_num: int = None, version: str = 'USA',
+                 opponents: Sequence[str] = ('Random',), seat: int = 0, **env_kwargs) -> None:
+        shards_num = min(envs_num, shards_num or multiprocessing.cpu_count())
+        self.envs_num = envs_num
+        self.players_num = len(opponents) + 1
+        self.features_num, self.actions_num = VectorEnv.get_sizes(version, self.players_num)
+        specs = VectorEnv.get_array_specs(envs_num, self.players_num, self.features_num, self.actions_num)
+        specs['actions'] = ((envs_num,), np.dtype(np.int64))
+
+        self.shared = SharedArrays(specs)
+        self.arrays = self.shared.arrays
+        self.observations = self.arrays['states'][:, seat]
+        self.masks = self.arrays['masks']
+        self.decision_types = self.arrays['decision_types']
+        self.rewards = self.arrays['rewards']
+        self.dones = self.arrays['dones']
+        self.actions = self.arrays['actions']
+
+        env_kwargs.update(version=version, opponents=list(opponents), seat=seat)
+        bounds = [envs_num * shard // shards_num for shard in range(shards_num + 1)]
+        self.connections: List[Connection] = []
+        self.processes: List[multiprocessing.Process] = []
+        for first_env, last_env in zip(bounds, bounds[1:]):
+            connection, worker_connection = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=run_shard, daemon=True,
+                                              args=(worker_connection, self.shared, first_env, last_env, env_kwargs))
+            process.start()
+            worker_connection.close()
+            self.connections.append(connection)
+            self.processes.append(process)
+        self.episodes_num = 0
+        self.steps_num = 0
+        # Every worker reports once its games are created
+        self._receive()
+
+    def _command(self, command: str) -> List[Dict[str, Any]]:
+        for connection in self.connections:
+            connection.send(command)
+        return self._receive()
+
+    def _receive(self) -> List[Dict[str, Any]]:
+        infos = []
+        for connection in self.connections:
+            result = connection.recv()
+            if isinstance(result, str):
+                self.close()
+                raise RuntimeError(f'A shard of the SubprocVectorEnv failed:\n{result}')
+            infos.extend(result)
+        return infos
+
+    def reset(self) -> np.ndarray:
+        self._command('reset')
+        return self.observations
+
+    def step(self, actions: Sequence[int]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, List[Dict[str, Any]]]:
+        self.actions[:] = actions
+        infos = self._command('step')
+        self.episodes_num += len(infos)
+        self.steps_num += self.envs_num
+        return self.observations, self.rewards, self.dones, infos
+
+    def action_masks(self) -> np.ndarray:
+        return self.masks
+
+    def close(self) -> None:
+        if self.arrays is None:
+            return
+        for connection in self.connections:
+            try:
+                connection.send('close')
+            except (BrokenPipeError, OSError):
+                pass
+        for process in self.processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        for connection in self.connections:
+            connection.close()
+        # The arrays are views of the block, it cannot be closed while they exist
+        self.arrays = self.observations = self.masks = self.decision_types = None
+        self.rewards = self.dones = self.actions = None
+        self.shared.close()
+
+    def __enter__(self) -> 'SubprocVectorEnv':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,25 @@
+import os
+import pickle
+
+import neat
+from neat.nn.feed_forward import FeedForwardNetwork
+
+current_dir = os.path.dirname(__file__)
+MODELS_DIR = os.path.join(current_dir, 'models')
+DEFAULT_NETWORK_PATH = os.path.join(MODELS_DIR, 'best_genome.pkl')
+
+
+def save_genome(genome: neat.DefaultGenome, config: neat.Config, file_path: str = DEFAULT_NETWORK_PATH) -> None:
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    with open(file_path, 'wb') as file:
+        pickle.dump((genome, config), file)
+
+
+def load_genome(file_path: str = DEFAULT_NETWORK_PATH) -> tuple:
+    with open(file_path, 'rb') as file:
+        return pickle.load(file)
+
+
+def load_network(file_path: str = DEFAULT_NETWORK_PATH) -> FeedForwardNetwork:
+    genome, config = load_genome(file_path)
+    return FeedForwardNetwork.create(genome, config)
@@ -0,0 +1,183 @@
+import multiprocessing
+import os
+import random
+import time
+from typing import Dict, List, Optional, Tuple
+
+import neat
+from neat.nn.feed_forward import FeedForwardNetwork
+
+from game_logic.config_factory import ConfigFactory
+from game_logic.enums.player_types import PlayerType
+from game_logic.game import Game
+from game_logic.game_logger import configure_logging
+from game_logic.map_cache import get_map_data
+from game_logic.players.ai_player import AIPlayer
+from network.adapters.network_adapter import NetworkAdapter
+from network.compiled_network import CompiledNetwork
+from network.manager import MODELS_DIR, DEFAULT_NETWORK_PATH, save_genome
+
+current_dir = os.path.dirname(__file__)
+DEFAULT_CONFIG_PATH = os.path.join(current_dir, 'config-feedforward.txt')
+CHECKPOINTS_DIR = os.path.join(MODELS_DIR, 'checkpoints')
+
+
+def create_config(version: str, config_path: str = DEFAULT_CONFIG_PATH) -> neat.Config:
+    """Loads the NEAT config and sizes the genome inputs and outputs for the given game version."""
+    config = neat.Config(neat.DefaultGenome, neat.DefaultReproduction, neat.DefaultSpeciesSet,
+                         neat.DefaultStagnation, config_path)
+    game_config = ConfigFactory.get_config(version)
+    map_data = get_map_data(version)
+    tickets_num = len(map_data.tickets) if map_data.tickets is not None else 0
+
+    genome_config = config.genome_config
+    genome_config.num_inputs = NetworkAdapter.get_features_num(game_config, map_data.links_num, tickets_num)
+    genome_config.num_outputs = AIPlayer.get_outputs_num(game_config, map_data.links_num)
+    genome_config.input_keys = [-index - 1 for index in range(genome_config.num_inputs)]
+    genome_config.output_keys = list(range(genome_config.num_outputs))
+    return config
+
+
+# Set once per worker process, so tasks only carry the genomes
+_worker_config: Optional[neat.Config] = None
+# Networks built by this worker, by genome key. Genomes are never mutated in place (elites keep their key
+# unchanged), so a network can be reused for every game of its genome, across generations too.
+_worker_networks: Dict[int, object] = {}
+NETWORK_CACHE_SIZE = 1024
+
+
+def _init_worker(version: str, config: neat.Config) -> None:
+    global _worker_config
+    _worker_config = config
+    configure_logging(quiet=True)
+    get_map_data(version)
+
+
+def _get_network(genome_id: int, genome: neat.DefaultGenome):
+    network = _worker_networks.get(genome_id)
+    if network is None:
+        network = FeedForwardNetwork.create(genome, _worker_config)
+        try:
+            network = CompiledNetwork(network)
+        except ValueError:
+            pass
+        if len(_worker_networks) >= NETWORK_CACHE_SIZE:
+            del _worker_networks[next(iter(_worker_networks))]
+        _worker_networks[genome_id] = network
+    return network
+
+
+def _play_table(task: Tuple[int, List[Tuple[int, neat.DefaultGenome]], str, int, int]) -> List[Tuple[int, int]]:
+    """Plays one game between the given genomes, Random players fill the empty seats."""
+    seed, seats, version, players_num, max_moves = task
+    player_types = [PlayerType.AI.value] * len(seats) + [PlayerType.RANDOM.value] * (players_num - len(seats))
+    networks = [_get_network(genome_id, genome) for genome_id, genome in seats]
+    networks += [None] * (players_num - len(seats))
+    game = Game(player_types, version, networks, seed=seed)
+    scores = game.play(max_moves)
+    return [(genome_id, scores[seat]) for seat, (genome_id, _) in enumerate(seats)]
+
+
+class TimingReporter(neat.reporting.BaseReporter):
+    """Reports how long each generation spends evaluating genomes and reproducing."""
+
+    def __init__(self) -> None:
+        # Set by the fitness function
+        self.games = 0
+        # Timings of this run only, checkpoints don't pickle the reporters, so a resumed run starts afresh
+        self.history: List[Dict[str, float]] = []
+        self.generation = None
+        self.generation_start = 0.0
+        self.evaluation_end = 0.0
+
+    def start_generation(self, generation):
+        self.generation = generation
+        self.generation_start = time.perf_counter()
+
+    def post_evaluate(self, config, population, species, best_genome):
+        self.evaluation_end = time.perf_counter()
+
+    def end_generation(self, config, population, species_set):
+        end = time.perf_counter()
+        evaluation = self.evaluation_end - self.generation_start
+        timing = {'generation': self.generation,
+                  'evaluation': evaluation,
+                  'reproduction': end - self.evaluation_end,
+                  'games': self.games,
+                  'games_per_sec': self.games / evaluation if evaluation else 0.0}
+        self.history.append(timing)
+        print(f"Generation {timing['generation']}: evaluation {timing['evaluation']:.2f}s "
+              f"({timing['games']} games, {timing['games_per_sec']:.1f} games/sec), "
+              f"reproduction {timing['reproduction']:.2f}s")
+
+
+class Trainer:
+    """Evolves AI players with NEAT, playing the fitness tournaments across a process pool.
+
+    Every generation each genome takes a seat at games_per_genome tables of players_num seats, and its fitness
+    is its mean score. The pool lives for the whole run, so the workers keep their map caches warm.
+    """
+
+    def __init__(self, version: str, config_path: str = DEFAULT_CONFIG_PATH, players_num: int = 2,
+                 games_per_genome: int = 4, workers_num: int = 0, max_moves: int = 1000,
+                 checkpoint_interval: int = 0, checkpoint_prefix: str = None) -> None:
+        if not Game.MIN_PLAYERS <= players_num <= Game.MAX_PLAYERS:
+            raise ValueError(f'This game is designed for {Game.MIN_PLAYERS}-{Game.MAX_PLAYERS} players.')
+        if games_per_genome < 1:
+            raise ValueError('Every genome has to play at least one game.')
+        self.version = version
+        self.config_path = config_path
+        self.players_num = players_num
+        self.games_per_genome = games_per_genome
+        self.workers_num = workers_num or multiprocessing.cpu_count()
+        self.max_moves = max_moves
+        self.checkpoint_interval = checkpoint_interval
+        self.checkpoint_prefix = checkpoint_prefix or os.path.join(CHECKPOINTS_DIR, f'{version}-')
+
+        self.pool = None
+        self.timing_reporter = TimingReporter()
+
+    def tables(self, genomes: List[Tuple[int, neat.DefaultGenome]]) -> List[List[Tuple[int, neat.DefaultGenome]]]:
+        """Seats every genome at games_per_genome tables, in a different random order each round."""
+        tables = []
+        for _ in range(self.games_per_genome):
+            order = list(genomes)
+            random.shuffle(order)
+            tables.extend(order[start:start + self.players_num] for start in range(0, len(order), self.players_num))
+        return tables
+
+    def evaluate(self, genomes: List[Tuple[int, neat.DefaultGenome]], config: neat.Config) -> None:
+        # Seeds come from the global generator, which neat checkpoints, so a resumed run plays the same games
+        tasks = [(random.getrandbits(32), table, self.version, self.players_num, self.max_moves)
+                 for table in self.tables(genomes)]
+        chunksize = max(1, len(tasks) // (self.workers_num * 4))
+        scores: Dict[int, List[int]] = {genome_id: [] for genome_id, _ in genomes}
+        for results in self.pool.imap_unordered(_play_table, tasks, chunksize=chunksize):
+            for genome_id, score in results:
+                scores[genome_id].append(score)
+        for genome_id, genome in genomes:
+            genome.fitness = sum(scores[genome_id]) / len(scores[genome_id])
+        self.timing_reporter.games = len(tasks)
+
+    def create_population(self, resume_path: str = None, seed: int = 0) -> neat.Population:
+        if resume_path:
+            population = neat.Checkpointer.restore_checkpoint(resume_path)
+        else:
+            random.seed(seed)
+            population = neat.Population(create_config(self.version, self.config_path))
+        population.add_reporter(neat.StdOutReporter(True))
+        population.add_reporter(self.timing_reporter)
+        if self.checkpoint_interval:
+            os.makedirs(os.path.dirname(self.checkpoint_prefix) or '.', exist_ok=True)
+            population.add_reporter(neat.Checkpointer(self.checkpoint_interval, filename_prefix=self.checkpoint_prefix))
+        return population
+
+    def run(self, generations: int, resume_path: str = None, seed: int = 0,
+            output_path: str = DEFAULT_NETWORK_PATH) -> neat.DefaultGenome:
+        population = self.create_population(resume_path, seed)
+        with multiprocessing.Pool(self.workers_num, initializer=_init_worker,
+                                  initargs=(self.version, population.config)) as self.pool:
+            best_genome = population.run(self.evaluate, generations)
+        self.pool = None
+        save_genome(best_genome, population.config, output_path)
+        return best_genome
@@ -0,0 +1,15 @@
+import argparse
+import os
+
+from game_logic.map_compiler import compile_map
+from game_logic.utils import current_dir
+
+if __name__ == "__main__":
+    versions = sorted(os.listdir(os.path.join(current_dir, 'data')))
+    parser = argparse.ArgumentParser(description='Compile map text data into binary files loaded at startup.')
+    parser.add_argument('versions', nargs='*', default=versions, help=f'defaults to all: {", ".join(versions)}')
+    args = parser.parse_args()
+
+    for version in args.versions:
+        file_path = compile_map(version)
+        print(f'{version}: {file_path} ({os.path.getsize(file_path)} bytes)')
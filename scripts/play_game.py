@@ -1,7 +1,7 @@
 from game_logic.game import Game
 
 if __name__ == "__main__":
-    # Provide a list of 2-5 players. Choices: Human, AI, Random
+    # Provide a list of 2-5 players. Choices: Human, AI, Random, MCTS
     players = ['Random', 'Random']
 
     # Choose version of the game. Choices: USA, Europe, Nordic
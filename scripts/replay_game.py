@@ -0,0 +1,22 @@
+import argparse
+import time
+
+from game_logic.game_logger import configure_logging
+from game_logic.move_log import MoveLog
+from game_logic.replay import replay_game
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Re-run a game from its move log.')
+    parser.add_argument('move_log', help='a .ttrlog file, e.g. saved by run_batch.py --record-dir')
+    parser.add_argument('--moves', type=int, default=None, help='stop before this many moves are played')
+    parser.add_argument('--verbose', action='store_true', help='log the game as it is replayed')
+    args = parser.parse_args()
+
+    configure_logging(quiet=not args.verbose)
+    move_log = MoveLog.load(args.move_log)
+    start = time.perf_counter()
+    game = replay_game(move_log, args.moves)
+    elapsed = time.perf_counter() - start
+    print(f'{move_log.version} {" ".join(move_log.player_types)}, seed {move_log.seed}: '
+          f'{game.total_moves} moves replayed in {elapsed * 1000:.1f}ms')
+    print('scores:', [player.score for player in game.players])
@@ -0,0 +1,27 @@
+import argparse
+
+from game_logic.batch_runner import BatchRunner
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Play many headless games in parallel.')
+    # Provide a list of 2-5 players. Choices: AI, Random, MCTS
+    parser.add_argument('--players', nargs='+', default=['Random', 'Random'])
+    # Choose version of the game. Choices: USA, Europe, Nordic
+    parser.add_argument('--version', default='USA')
+    parser.add_argument('--games', type=int, default=1000)
+    parser.add_argument('--workers', type=int, default=0, help='defaults to the number of CPUs')
+    parser.add_argument('--seed', type=int, default=0, help='game i is seeded with seed + i')
+    parser.add_argument('--max-moves', type=int, default=0)
+    parser.add_argument('--output', default='results.jsonl')
+    parser.add_argument('--record-dir', default=None, help='save a move log of every game there')
+    parser.add_argument('--telemetry', default=None, help='append per player stats of every game to this file')
+    parser.add_argument('--profile', action='store_true', help='time the hot paths and print a breakdown')
+    args = parser.parse_args()
+
+    runner = BatchRunner(args.players, args.version, args.games, args.workers, args.seed, args.max_moves,
+                         args.record_dir, args.telemetry, args.profile)
+    summary = runner.run(args.output)
+    print(f'{summary.games_num} games in {summary.elapsed:.2f}s: {summary.games_per_sec:.1f} games/sec, '
+          f'{summary.total_moves / summary.elapsed:.0f} moves/sec')
+    if summary.profiler is not None:
+        print(summary.profiler.report())
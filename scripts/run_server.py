@@ -0,0 +1,23 @@
+import argparse
+import asyncio
+import logging
+
+from game_logic.game_logger import configure_logging
+from game_logic.game_server import GameServer
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Host games for remote players, see GameServer for the protocol.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix', default=None, help='listen on this Unix socket instead of TCP')
+    parser.add_argument('--executor-workers', type=int, default=None,
+                        help='threads for AI and MCTS decisions, defaults to the executor default')
+    parser.add_argument('--log', action='store_true', help='write the errors of the games to game.log')
+    args = parser.parse_args()
+
+    configure_logging(logging.ERROR, quiet=not args.log, console=False)
+    server = GameServer(args.executor_workers)
+    try:
+        asyncio.run(server.serve(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
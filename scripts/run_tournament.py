@@ -0,0 +1,29 @@
+import argparse
+
+from game_logic.tournament import Entrant, FORMATS, Tournament
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Rate a pool of players against each other.')
+    # Entrants as [name=]type[:checkpoint], e.g. Random MCTS gen50=AI:network/models/gen50.pkl
+    parser.add_argument('--players', nargs='+', default=['Random', 'MCTS'])
+    # Choose version of the game. Choices: USA, Europe, Nordic
+    parser.add_argument('--version', default='USA')
+    parser.add_argument('--format', default='round-robin', choices=FORMATS)
+    parser.add_argument('--table-size', type=int, default=2, help='players per game, 2-5')
+    parser.add_argument('--rounds', type=int, default=10)
+    parser.add_argument('--workers', type=int, default=0, help='defaults to the number of CPUs')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--max-moves', type=int, default=0)
+    parser.add_argument('--k-factor', type=float, default=32)
+    parser.add_argument('--cache', default='tournament.jsonl', help='results of played games, reused by re-runs')
+    args = parser.parse_args()
+
+    tournament = Tournament([Entrant.parse(spec) for spec in args.players], args.version, args.table_size,
+                            args.rounds, args.format, args.workers, args.seed, args.max_moves, args.cache,
+                            args.k_factor)
+    standings = tournament.run()
+    print(f'{tournament.games_num} games, {tournament.cached_games_num} from the cache')
+    print(f'{"player":<24} {"rating":>7} {"games":>6} {"win rate":>9} {"avg score":>10}  games per seat')
+    for standing in standings:
+        print(f'{standing.name:<24} {standing.rating:>7.1f} {standing.games:>6} {standing.win_rate:>9.1%} '
+              f'{standing.average_score:>10.1f}  {standing.seat_games}')
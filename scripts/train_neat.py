@@ -0,0 +1,26 @@
+import argparse
+
+from network.manager import DEFAULT_NETWORK_PATH
+from network.trainer import DEFAULT_CONFIG_PATH, Trainer
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Evolve AI players with NEAT.')
+    # Choose version of the game. Choices: USA, Europe, Nordic
+    parser.add_argument('--version', default='USA')
+    parser.add_argument('--config', default=DEFAULT_CONFIG_PATH, help='NEAT config file')
+    parser.add_argument('--generations', type=int, default=100)
+    parser.add_argument('--players', type=int, default=2, help='seats per game')
+    parser.add_argument('--games-per-genome', type=int, default=4)
+    parser.add_argument('--workers', type=int, default=0, help='defaults to the number of CPUs')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--max-moves', type=int, default=1000)
+    parser.add_argument('--checkpoint-interval', type=int, default=5, help='0 disables checkpoints')
+    parser.add_argument('--checkpoint-prefix', default=None)
+    parser.add_argument('--resume', default=None, help='checkpoint file to continue from')
+    parser.add_argument('--output', default=DEFAULT_NETWORK_PATH)
+    args = parser.parse_args()
+
+    trainer = Trainer(args.version, args.config, args.players, args.games_per_genome, args.workers,
+                      args.max_moves, args.checkpoint_interval, args.checkpoint_prefix)
+    best_genome = trainer.run(args.generations, args.resume, args.seed, args.output)
+    print(f'Best fitness {best_genome.fitness:.1f}, saved to {args.output}')
@@ -0,0 +1,21 @@
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def get_level(env_level: str) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, '-c', 'from game_logic.game_logger import logger; print(logger.level)'],
+                          cwd=ROOT, env={**os.environ, 'TTR_LOG_LEVEL': env_level}, capture_output=True, text=True)
+
+
+def test_env_level_is_applied():
+    assert get_level('info').stdout.strip() == '20'
+
+
+def test_unknown_env_level_falls_back_to_debug():
+    result = get_level('verbose')
+    assert result.returncode == 0
+    assert result.stdout.strip() == '10'
+    assert 'TTR_LOG_LEVEL' in result.stderr
@@ -0,0 +1,52 @@
+from collections import Counter
+
+from game_logic.game import Game
+from game_logic.game_logger import configure_logging
+
+
+def get_cards(snapshot):
+    cards = Counter(snapshot.draw_pile)
+    for hand in snapshot.hands:
+        cards.update({card: cards_num for card, cards_num in enumerate(hand)})
+    return cards
+
+
+def get_ticket_ids(snapshot):
+    return sorted([*snapshot.ticket_deck, *(ticket_id for tickets in snapshot.tickets for ticket_id, _ in tickets)])
+
+
+def test_determinize_deals_only_what_the_player_cannot_see():
+    configure_logging(quiet=True)
+    game = Game(['Random'] * 3, 'USA', seed=4)
+    game.play(40)
+    snapshot = game.snapshot()
+
+    dealt_hands = set()
+    for seed in range(20):
+        determinized = snapshot.determinize(seed, player_id=1)
+        assert determinized.hands[1] == snapshot.hands[1]
+        assert determinized.tickets[1] == snapshot.tickets[1]
+        for opponent_id in (0, 2):
+            assert sum(determinized.hands[opponent_id]) == sum(snapshot.hands[opponent_id])
+            assert len(determinized.tickets[opponent_id]) == len(snapshot.tickets[opponent_id])
+        assert get_cards(determinized) == get_cards(snapshot)
+        assert get_ticket_ids(determinized) == get_ticket_ids(snapshot)
+        assert (determinized.face_up_cards, determinized.discard_pile, determinized.link_owners) == \
+               (snapshot.face_up_cards, snapshot.discard_pile, snapshot.link_owners)
+        dealt_hands.add(determinized.hands[0])
+
+        game.restore(determinized)
+        for player in game.players:
+            assert all(completed == player.player_board.is_ticket_completed(ticket)
+                       for ticket, completed in player.tickets.items())
+    assert len(dealt_hands) > 1
+
+
+def test_determinize_without_player_keeps_the_hands():
+    configure_logging(quiet=True)
+    game = Game(['Random'] * 2, 'USA', seed=5)
+    game.play(20)
+    snapshot = game.snapshot()
+    determinized = snapshot.determinize(0)
+    assert (determinized.hands, determinized.tickets) == (snapshot.hands, snapshot.tickets)
+    assert sorted(determinized.draw_pile) == sorted(snapshot.draw_pile)
@@ -0,0 +1,34 @@
+import pytest
+
+from game_logic.enums.decisions.decision_types import DecisionType
+from game_logic.game import Game
+from game_logic.game_logger import configure_logging
+
+
+def test_step_rejects_keeping_too_few_tickets():
+    configure_logging(quiet=True)
+    game = Game(['Random', 'Random'], 'USA', seed=1)
+    request = game.reset(seed=1)
+    assert request.decision_type is DecisionType.TICKETS and request.min_keep == 2
+
+    for kept_mask in (0b000, 0b001, 0b100):
+        with pytest.raises(ValueError):
+            game.step(kept_mask)
+    assert game.pending_request is request
+
+    request = game.step(0b011)
+    assert len(game.players[0].tickets) == 2
+    assert request.player_id == 1
+
+
+def test_step_plays_a_game_to_the_end():
+    configure_logging(quiet=True)
+    game = Game(['Random', 'Random'], 'USA', seed=2)
+    request = game.reset(seed=2)
+    while request is not None:
+        request = game.step(game.players[request.player_id].make_decision(request))
+    assert game.is_terminal()
+    assert game.final_scores == [player.score for player in game.players]
+    assert game.stats.timings['turns'] > 0
+    with pytest.raises(RuntimeError):
+        game.step(0)
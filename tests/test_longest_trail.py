@@ -0,0 +1,64 @@
+import random
+
+from game_logic.boards.longest_trail import LongestTrailEngine
+from game_logic.boards.player_board import PlayerBoard
+
+
+def brute_force_longest_trail(edges) -> int:
+    """Tries every trail from every node."""
+    def extend(node, used):
+        best = 0
+        for index, (city1, city2, length) in enumerate(edges):
+            if index in used or node not in (city1, city2):
+                continue
+            best = max(best, length + extend(city2 if node == city1 else city1, used | {index}))
+        return best
+
+    nodes = {city for city1, city2, _ in edges for city in (city1, city2)}
+    return max((extend(node, frozenset()) for node in nodes), default=0)
+
+
+def test_trail_revisits_a_city():
+    # Two triangles sharing X, and a tail from X: E-X, X-A-B-X, X-C-D-X passes X three times
+    edges = [('A', 'B', 1), ('B', 'X', 2), ('X', 'A', 3), ('X', 'C', 4), ('C', 'D', 5), ('D', 'X', 6),
+             ('X', 'E', 7)]
+    assert LongestTrailEngine().calculate(edges) == 28
+
+
+def test_euler_circuit_uses_every_edge():
+    edges = [('A', 'B', 1), ('B', 'C', 2), ('C', 'D', 3), ('D', 'A', 4)]
+    assert LongestTrailEngine().calculate(edges) == 10
+
+
+def test_branches_cannot_all_be_used():
+    # A star: a trail takes two of its arms
+    edges = [('X', 'A', 1), ('X', 'B', 2), ('X', 'C', 3)]
+    assert LongestTrailEngine().calculate(edges) == 5
+
+
+def test_disconnected_components_are_not_added_up():
+    edges = [('A', 'B', 3), ('B', 'C', 4), ('D', 'E', 6)]
+    assert LongestTrailEngine().calculate(edges) == 7
+    assert LongestTrailEngine().calculate([]) == 0
+
+
+def test_random_graphs_match_brute_force():
+    rng = random.Random(0)
+    engine = LongestTrailEngine()
+    for _ in range(100):
+        nodes = range(rng.randint(2, 7))
+        edges = []
+        for _ in range(rng.randint(1, 7)):
+            city1, city2 = rng.sample(nodes, 2)
+            edges.append((city1, city2, rng.randint(1, 6)))
+        assert engine.calculate(edges) == brute_force_longest_trail(edges)
+
+
+def test_player_board_recomputes_after_a_claim():
+    board = PlayerBoard(None)
+    board.add_edge('A', 'B', 3, 'grey')
+    assert board.calculate_longest_path() == 3
+    board.add_edge('B', 'C', 4, 'grey')
+    assert board.calculate_longest_path() == 7
+    board.invalidate()
+    assert board.calculate_longest_path() == 7
@@ -0,0 +1,35 @@
+import pytest
+
+from game_logic import map_compiler
+from game_logic.map_compiler import compile_map, load_compiled_map, load_text_map
+
+
+@pytest.fixture
+def compiled_path(tmp_path, monkeypatch):
+    path = str(tmp_path / 'map.bin')
+    monkeypatch.setattr(map_compiler, 'get_compiled_path', lambda version: path)
+    return path
+
+
+def test_compiled_map_matches_the_text_files(compiled_path):
+    compile_map('USA')
+    assert load_compiled_map('USA') == load_text_map('USA')
+
+
+@pytest.mark.parametrize('size', [0, map_compiler._HEADER.size - 1, map_compiler._HEADER.size,
+                                  map_compiler._HEADER.size + 10, -4])
+def test_broken_files_are_ignored(compiled_path, size):
+    compile_map('USA')
+    with open(compiled_path, 'rb') as file:
+        content = file.read()
+    with open(compiled_path, 'wb') as file:
+        file.write(content[:size])
+    assert load_compiled_map('USA') is None
+
+
+def test_undecodable_names_are_ignored(compiled_path):
+    compile_map('USA')
+    with open(compiled_path, 'r+b') as file:
+        file.seek(map_compiler._HEADER.size)
+        file.write(b'\xff\xfe')
+    assert load_compiled_map('USA') is None
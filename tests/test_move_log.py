@@ -0,0 +1,40 @@
+import pytest
+
+from game_logic.game import Game
+from game_logic.game_logger import configure_logging
+from game_logic.move_log import MoveLog
+from game_logic.replay import replay_game
+
+
+def test_encoding_round_trip(tmp_path):
+    move_log = MoveLog(2 ** 62 + 5, 'USA', ['Random', 'MCTS'], max_moves=300,
+                       decisions=[0, 1, 127, 128, 300, -1, -64, -65, 2 ** 40])
+    decoded = MoveLog.from_bytes(move_log.to_bytes())
+    assert (decoded.seed, decoded.version, decoded.player_types, decoded.max_moves) == \
+           (move_log.seed, 'USA', ['Random', 'MCTS'], 300)
+    assert list(decoded.decisions) == list(move_log.decisions)
+
+    path = str(tmp_path / 'game.ttrlog')
+    move_log.save(path)
+    assert list(MoveLog.load(path).decisions) == list(move_log.decisions)
+
+
+def test_rejects_other_files():
+    with pytest.raises(ValueError):
+        MoveLog.from_bytes(b'NOTLOG\x01\x00')
+
+
+@pytest.mark.parametrize('players_num', [2, 3, 5])
+def test_replay_reproduces_the_game(players_num):
+    configure_logging(quiet=True)
+    for seed in range(3):
+        game = Game(['Random'] * players_num, 'USA', seed=seed)
+        move_log = MoveLog.record(game)
+        scores = game.play(3000)
+
+        replayed = replay_game(MoveLog.from_bytes(move_log.to_bytes()))
+        assert [player.score for player in replayed.players] == scores
+        assert replayed.snapshot() == game.snapshot()
+
+        half = replay_game(move_log, moves_num=game.total_moves // 2)
+        assert half.total_moves == game.total_moves // 2
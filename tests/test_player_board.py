@@ -0,0 +1,64 @@
+import random
+
+import networkx as nx
+
+from game_logic.boards.player_board import PlayerBoard
+
+
+def test_ticket_completed_by_the_claim_that_joins_its_cities():
+    board = PlayerBoard(None)
+    ticket = ('A', 'D', 8)
+    assert board.add_ticket(ticket) is False
+    assert board.add_edge('A', 'B', 1, 'grey') == []
+    assert board.add_edge('C', 'D', 1, 'grey') == []
+    assert not board.is_ticket_completed(ticket)
+    # Joins the component of A with the one of D
+    assert board.add_edge('B', 'C', 1, 'grey') == [ticket]
+    assert board.is_ticket_completed(ticket)
+    # Already reported, a later claim does not complete it again
+    assert board.add_edge('D', 'E', 1, 'grey') == []
+
+
+def test_ticket_added_after_its_cities_are_joined():
+    board = PlayerBoard(None)
+    board.add_edge('A', 'B', 1, 'grey')
+    board.add_edge('B', 'C', 1, 'grey')
+    assert board.add_ticket(('C', 'A', 5)) is True
+    assert board.add_ticket(('A', 'Z', 5)) is False
+    assert not board.is_ticket_completed(('Y', 'Z', 5))
+
+
+def test_one_claim_completes_several_tickets():
+    board = PlayerBoard(None)
+    tickets = [('A', 'C', 1), ('B', 'D', 2), ('A', 'E', 3)]
+    for ticket in tickets:
+        board.add_ticket(ticket)
+    board.add_edge('A', 'B', 1, 'grey')
+    board.add_edge('C', 'D', 1, 'grey')
+    assert sorted(board.add_edge('B', 'C', 1, 'grey')) == sorted(tickets[:2])
+    assert not board.is_ticket_completed(tickets[2])
+
+
+def test_random_claims_match_networkx():
+    rng = random.Random(0)
+    cities = [f'city{index}' for index in range(12)]
+    for _ in range(50):
+        board = PlayerBoard(None)
+        graph = nx.Graph()
+        tickets = [(*rng.sample(cities, 2), 1) for _ in range(6)]
+        completed = set()
+        for ticket in tickets[:3]:
+            if board.add_ticket(ticket):
+                completed.add(ticket)
+        for step in range(10):
+            city1, city2 = rng.sample(cities, 2)
+            graph.add_edge(city1, city2)
+            completed.update(board.add_edge(city1, city2, 1, 'grey'))
+            if step == 5:
+                for ticket in tickets[3:]:
+                    if board.add_ticket(ticket):
+                        completed.add(ticket)
+        for ticket in tickets:
+            connected = ticket[0] in graph and ticket[1] in graph and nx.has_path(graph, ticket[0], ticket[1])
+            assert board.is_ticket_completed(ticket) == connected
+            assert (ticket in completed) == connected
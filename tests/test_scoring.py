@@ -0,0 +1,66 @@
+import networkx as nx
+import pytest
+
+from game_logic.enums.game_states import GameState
+from game_logic.game import Game
+from game_logic.game_logger import configure_logging
+
+
+def play_to_end(player_types, seed) -> Game:
+    """A game played until its last move, before finish scores it."""
+    configure_logging(quiet=True)
+    game = Game(player_types, 'USA', seed=seed)
+    game.setup()
+    while game.game_state != GameState.FINISHED:
+        game.play_move()
+    return game
+
+
+def reference_scores(game: Game):
+    """End scoring the way Game did it before score_game: a graph per player and PlayerBoard's longest path."""
+    scores = [player.score for player in game.players]
+    tickets_completed = []
+    for player in game.players:
+        graph = nx.Graph()
+        for link_id, owner in enumerate(game.board.link_owners):
+            if owner is player.color:
+                graph.add_edge(*game.board.link_cities[link_id])
+        completed = 0
+        for city1, city2, value in player.tickets:
+            if city1 in graph and city2 in graph and nx.has_path(graph, city1, city2):
+                scores[player.player_id] += value
+                completed += 1
+            else:
+                scores[player.player_id] -= value
+        tickets_completed.append(completed)
+
+    longest_paths = [player.player_board.calculate_longest_path() for player in game.players]
+    best = max(longest_paths)
+    bonus_players = [player_id for player_id, value in enumerate(longest_paths) if value == best]
+    for player_id in bonus_players:
+        scores[player_id] += game.config.LONGEST_ROUTE_BONUS
+
+    ranking = sorted(range(game.players_num),
+                     key=lambda player_id: (scores[player_id], tickets_completed[player_id],
+                                            player_id in bonus_players),
+                     reverse=True)
+    return scores, tickets_completed, longest_paths, bonus_players, ranking
+
+
+@pytest.mark.parametrize('players_num', [2, 3, 5])
+def test_score_game_matches_reference(players_num):
+    for seed in range(10):
+        game = play_to_end(['Random'] * players_num, seed)
+        scores, tickets_completed, longest_paths, bonus_players, ranking = reference_scores(game)
+
+        final_scores = game.score_game()
+        assert list(final_scores.scores) == scores
+        assert list(final_scores.tickets_completed) == tickets_completed
+        assert list(final_scores.longest_paths) == longest_paths
+        assert list(final_scores.longest_path_players) == bonus_players
+        assert list(final_scores.ranking) == ranking
+
+        assert game.finish() == scores
+        assert game.winner.player_id == ranking[0]
+        assert [player.longest_path for player in game.players] == \
+               [player_id in bonus_players for player_id in range(players_num)]
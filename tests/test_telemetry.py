@@ -0,0 +1,42 @@
+import os
+
+from game_logic.telemetry import TelemetryReader, TelemetryWriter
+
+SCHEMA = (('a', 'q'), ('b', 'd'))
+
+
+def write_rows(path, rows):
+    with TelemetryWriter(path, SCHEMA) as writer:
+        writer.write_rows(rows)
+
+
+def test_append_keeps_earlier_row_groups(tmp_path):
+    path = str(tmp_path / 'telemetry.bin')
+    write_rows(path, [(1, 1.0), (2, 2.0)])
+    write_rows(path, [(3, 3.0)])
+    assert list(TelemetryReader(path).read()['a']) == [1, 2, 3]
+
+
+def test_append_after_truncated_row_group(tmp_path):
+    path = str(tmp_path / 'telemetry.bin')
+    write_rows(path, [(1, 1.0), (2, 2.0)])
+    write_rows(path, [(3, 3.0)])
+    # A crash in the middle of writing the second row group
+    with open(path, 'rb+') as file:
+        file.truncate(os.path.getsize(path) - 3)
+    write_rows(path, [(4, 4.0), (5, 5.0)])
+
+    columns = TelemetryReader(path).read()
+    assert list(columns['a']) == [1, 2, 4, 5]
+    assert list(columns['b']) == [1.0, 2.0, 4.0, 5.0]
+
+
+def test_append_after_truncated_row_group_header(tmp_path):
+    path = str(tmp_path / 'telemetry.bin')
+    write_rows(path, [(1, 1.0)])
+    size = os.path.getsize(path)
+    write_rows(path, [(2, 2.0)])
+    with open(path, 'rb+') as file:
+        file.truncate(size + 2)
+    write_rows(path, [(3, 3.0)])
+    assert list(TelemetryReader(path).read()['a']) == [1, 3]
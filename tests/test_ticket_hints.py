@@ -0,0 +1,61 @@
+import math
+
+import networkx as nx
+import pytest
+
+from game_logic.enums.game_states import GameState
+from game_logic.game import Game
+from game_logic.game_logger import configure_logging
+
+
+def reference_remaining_trains(game: Game, player_id: int, ticket) -> float:
+    """Dijkstra over a networkx graph of the links the player owns (free) or may still claim (their length)."""
+    map_data = game.board.map_data
+    color = game.players[player_id].color
+    available_mask = game.legal_moves.available_masks[player_id]
+    graph = nx.Graph()
+    graph.add_nodes_from(map_data.nodes)
+    for link_id, ((city1, city2), length) in enumerate(zip(map_data.link_cities, map_data.link_lengths)):
+        if game.board.link_owners[link_id] is color:
+            weight = 0
+        elif available_mask[link_id]:
+            weight = length
+        else:
+            continue
+        if not graph.has_edge(city1, city2) or graph[city1][city2]['weight'] > weight:
+            graph.add_edge(city1, city2, weight=weight)
+    try:
+        return nx.dijkstra_path_length(graph, ticket[0], ticket[1])
+    except nx.NetworkXNoPath:
+        return math.inf
+
+
+def test_empty_board_distances():
+    configure_logging(quiet=True)
+    game = Game(['Random', 'Random'], 'USA', seed=0)
+    map_data = game.board.map_data
+    graph = nx.Graph()
+    for (city1, city2), length in zip(map_data.link_cities, map_data.link_lengths):
+        if not graph.has_edge(city1, city2) or graph[city1][city2]['weight'] > length:
+            graph.add_edge(city1, city2, weight=length)
+    lengths = dict(nx.all_pairs_dijkstra_path_length(graph))
+    for city1 in map_data.cities:
+        for city2 in map_data.cities:
+            assert game.board.get_distance(city1, city2) == lengths[city1].get(city2, math.inf)
+
+
+@pytest.mark.parametrize('players_num', [2, 4])
+def test_remaining_trains_during_games(players_num):
+    configure_logging(quiet=True)
+    for seed in range(3):
+        game = Game(['Random'] * players_num, 'USA', seed=seed)
+        game.setup()
+        tickets = game.board.map_data.tickets[::4]
+        while game.game_state != GameState.FINISHED:
+            game.play_move()
+            if game.total_moves % 7:
+                continue
+            for player_id in range(players_num):
+                for ticket in tickets:
+                    assert (game.ticket_hints.remaining_trains(player_id, ticket)
+                            == reference_remaining_trains(game, player_id, ticket))
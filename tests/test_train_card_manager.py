@@ -0,0 +1,26 @@
+import random
+from types import SimpleNamespace
+
+from game_logic.config_factory import ConfigFactory
+from game_logic.train_card_manager import TrainCardManager
+from network.adapters.base_adapter import BaseAdapter
+
+
+def make_manager(seed: int = 0) -> TrainCardManager:
+    game = SimpleNamespace(config=ConfigFactory.get_config('USA'), rng=random.Random(seed), adapter=BaseAdapter())
+    return TrainCardManager(game)
+
+
+def test_pick_behind_an_empty_slot():
+    manager = make_manager()
+    manager.get_draw_pile().clear()
+    assert manager.pick_face_up_card(0) is not None
+    face_up_cards = manager.get_face_up_cards()
+    assert face_up_cards[0] == manager.empty_card
+
+    # Every non-empty slot is legal in LegalMoveGenerator.train_card_mask, the last one included
+    last_card = face_up_cards[-1]
+    assert manager.pick_face_up_card(len(face_up_cards) - 1) == last_card
+    assert manager.pick_face_up_card(0) is None
+    assert manager.pick_face_up_card(len(face_up_cards)) is None
+    assert manager.pick_face_up_card(-1) is None